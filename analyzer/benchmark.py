@@ -0,0 +1,260 @@
+import csv
+import json
+import time
+from collections import deque
+from itertools import product
+from statistics import median
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from analyzer import statistic
+from maze.environment import Situation
+from maze.generator import generate
+from solvers.cache import SOLVERS
+
+DEFAULT_SIZES = (16, 32, 64)
+DEFAULT_NUM_PATHS = (1, 4, 16)
+
+# Поля записи: описание лабиринта, решатель и поля его статистики
+FIELDS = [
+    "maze",
+    "size",
+    "num_paths",
+    "seed",
+    "solver",
+    "solved",
+    *statistic.FIELDS[1:],
+    "relative_time",
+]
+
+
+def build_corpus(
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    num_paths: Iterable[int] = DEFAULT_NUM_PATHS,
+    seeds: Iterable[int] = (0,),
+) -> List[dict]:
+    """
+    Генерирует воспроизводимый набор лабиринтов для замеров.
+
+    :param sizes: размеры (ширина и высота) лабиринтов
+    :param num_paths: значения параметра num_paths генератора
+    :param seeds: зёрна генератора случайных чисел
+    :return: список словарей с описанием и матрицей каждого лабиринта
+    """
+    corpus = []
+
+    for size, paths, seed in product(sizes, num_paths, seeds):
+        corpus.append(
+            {
+                "maze": f"{size}x{size}-p{paths}-s{seed}",
+                "size": size,
+                "num_paths": paths,
+                "seed": seed,
+                "array": generate(size, size, paths, seed=seed),
+            }
+        )
+
+    return corpus
+
+
+def call_solver(name: str, maze: np.ndarray):
+    """
+    Запускает решатель name от левого верхнего угла к правому нижнему.
+
+    :param name: имя решателя (ключ SOLVERS)
+    :param maze: матрица, представляющая лабиринт
+    :return: результат решателя
+    """
+    start = np.array([0, 0])
+    goal = maze.shape - np.asarray([1, 1])
+    kwargs = {}
+
+    if name == "bidirectional_search":
+        kwargs["goal_state"] = Situation(maze, goal, goal)
+
+    return SOLVERS[name](Situation(maze, start, goal), **kwargs)
+
+
+def workload(size: int = 5000) -> int:
+    """
+    Эталонная нагрузка интерпретатора, не зависящая от кода проекта: обход
+    в ширину графа на словаре и очереди, как в решателях.
+
+    :param size: число вершин графа
+    :return: число достигнутых вершин
+    """
+    parent = {0: 0}
+    queue = deque([0])
+
+    while queue:
+        vertex = queue.popleft()
+        for neighbour in ((vertex + 1) % size, (vertex * 3 + 1) % size):
+            if neighbour not in parent:
+                parent[neighbour] = vertex
+                queue.append(neighbour)
+
+    return len(parent)
+
+
+def measure(name: str, maze: np.ndarray, repeat: int = 5) -> dict:
+    """
+    Замеряет один решатель на одном лабиринте (см. analyzer.statistic.measure).
+
+    Скорость общей машины меняется за секунды в разы, поэтому перед каждым
+    запуском решателя замеряется эталонная нагрузка workload. Кроме медианы
+    времени в запись попадает relative_time - медиана отношений времени
+    решателя к времени нагрузки, почти не зависящая от скорости машины.
+
+    :param name: имя решателя (ключ SOLVERS)
+    :param maze: матрица, представляющая лабиринт
+    :param repeat: число замеров времени
+    :return: словарь с метриками решателя; у нерешённого лабиринта они пусты
+    """
+    record = dict.fromkeys(FIELDS[FIELDS.index("solver") :])
+    record["solver"] = name
+    record["solved"] = False
+
+    wall_times, cpu_times, relative_times = [], [], []
+
+    for run in range(repeat):
+        started = time.perf_counter()
+        workload()
+        reference = time.perf_counter() - started
+
+        # Пик памяти измеряется один раз, после последнего замера времени
+        result = statistic.measure(
+            call_solver, name, maze, trace_memory=run == repeat - 1
+        )
+        if result is None:
+            return record
+
+        wall_times.append(result[1].wall_time)
+        cpu_times.append(result[1].cpu_time)
+        relative_times.append(result[1].wall_time / reference)
+
+    result[1].wall_time = median(wall_times)
+    result[1].cpu_time = median(cpu_times)
+
+    record["solved"] = True
+    record.update(result[1].to_dict())
+    record["relative_time"] = median(relative_times)
+
+    return record
+
+
+def run_benchmark(
+    corpus: List[dict], solvers: Iterable[str] = tuple(SOLVERS), repeat: int = 5
+) -> List[dict]:
+    """
+    Запускает все решатели на всех лабиринтах набора.
+
+    :param corpus: набор лабиринтов из build_corpus
+    :param solvers: имена решателей
+    :param repeat: число замеров времени для каждой пары
+    :return: список записей с метриками
+    """
+    records = []
+
+    for item in corpus:
+        for name in solvers:
+            record = {key: item[key] for key in ("maze", "size", "num_paths", "seed")}
+            record.update(measure(name, item["array"], repeat))
+            records.append(record)
+
+    return records
+
+
+def save_results(records: List[dict], filename: str):
+    """
+    Сохраняет результаты в JSON или CSV (по расширению filename).
+
+    :param records: список записей с метриками
+    :param filename: имя файла (.json или .csv)
+    """
+    statistic.save_records(records, filename, FIELDS)
+
+
+def load_results(filename: str) -> List[dict]:
+    """
+    Загружает результаты, сохранённые save_results.
+
+    :param filename: имя файла (.json или .csv)
+    :return: список записей с метриками
+    """
+    if not filename.endswith(".csv"):
+        with open(filename) as file:
+            return json.load(file)
+
+    with open(filename, newline="") as file:
+        records = list(csv.DictReader(file))
+
+    # Значения CSV читаются строками: восстанавливаем числа
+    for record in records:
+        for key, value in record.items():
+            if value == "":
+                record[key] = None
+            elif value in ("True", "False"):
+                record[key] = value == "True"
+            elif key not in ("maze", "solver"):
+                record[key] = float(value)
+
+    return records
+
+
+def compare(
+    records: List[dict],
+    baseline: List[dict],
+    tolerance: float = 0.2,
+    min_time: float = 5e-3,
+) -> List[str]:
+    """
+    Сравнивает результаты с эталонными и находит регрессии.
+
+    Регрессией считается рост времени, пика памяти или числа порождённых
+    вершин больше чем на долю tolerance, а также потеря решения. Время
+    (медиана нескольких запусков) эталона пересчитывается на текущую скорость
+    машины по relative_time и должно к тому же вырасти больше чем на min_time
+    секунд: разброс коротких замеров превышает любую долю.
+
+    :param records: текущие результаты
+    :param baseline: эталонные результаты
+    :param tolerance: допустимый относительный рост метрик
+    :param min_time: наименьший рост времени, с, не считающийся шумом
+    :return: список описаний регрессий
+    """
+    reference: Dict[tuple, dict] = {
+        (record["maze"], record["solver"]): record for record in baseline
+    }
+    regressions = []
+
+    for record in records:
+        base = reference.get((record["maze"], record["solver"]))
+        if base is None:
+            continue
+
+        label = f"{record['solver']} on {record['maze']}"
+
+        if base["solved"] and not record["solved"]:
+            regressions.append(f"{label}: no longer solved")
+            continue
+
+        # Во сколько раз машина медленнее, чем при замере эталона
+        speed = 1.0
+        if base.get("relative_time") and record.get("relative_time"):
+            speed = (record["wall_time"] / record["relative_time"]) / (
+                base["wall_time"] / base["relative_time"]
+            )
+
+        for key in ("wall_time", "peak_memory", "all_generated"):
+            old, new = base.get(key), record.get(key)
+            if old is None or new is None:
+                continue
+            if key == "wall_time":
+                old *= speed
+            if key == "wall_time" and new - old <= min_time:
+                continue
+            if new > old * (1 + tolerance):
+                regressions.append(f"{label}: {key} {old:.6g} -> {new:.6g}")
+
+    return regressions
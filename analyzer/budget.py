@@ -0,0 +1,144 @@
+import os
+import time
+import tracemalloc
+from typing import Optional
+
+# Через сколько раскрытий проверяются время и память
+CHECK_EVERY = 256
+
+# Множители единиц памяти в записи бюджета
+MEMORY_UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def used_memory() -> int:
+    """
+    Возвращает объём памяти процесса в байтах: выделенную память, если
+    работает tracemalloc, иначе резидентную (из /proc/self/statm).
+    """
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+class Budget:
+    def __init__(
+        self,
+        max_expansions: Optional[int] = None,
+        max_time: Optional[float] = None,
+        max_memory: Optional[int] = None,
+        check_every: int = CHECK_EVERY,
+    ):
+        """
+        Создаёт бюджет поиска.
+
+        Решатели, получившие бюджет, учитывают в нём раскрытия и, исчерпав
+        его, останавливаются и возвращают лучший частичный результат: путь
+        до ближайшей к цели достигнутой клетки со статистикой, отмеченной
+        как усечённая. Без бюджета они не тратят на учёт ничего, кроме
+        проверки на None.
+
+        Время и память проверяются раз в check_every раскрытий, поэтому
+        бюджет может быть превышен на время стольких раскрытий.
+
+        :param max_expansions: наибольшее число раскрытий
+        :type max_expansions: int
+        :param max_time: наибольшее время поиска, с
+        :type max_time: float
+        :param max_memory: наибольший прирост памяти за время поиска, байт
+                           (выделенной, если работает tracemalloc, иначе
+                           резидентной; без /proc учитывается выделенная,
+                           и tracemalloc запускается при первом поиске)
+        :type max_memory: int
+        :param check_every: число раскрытий между проверками времени и памяти
+        :type check_every: int
+        """
+        self.max_expansions = max_expansions
+        self.max_time = max_time
+        self.max_memory = max_memory
+        self.check_every = check_every
+
+        self.expansions = 0  # Раскрытия текущего поиска
+        self.exhausted = False  # Исчерпан ли бюджет текущего поиска
+        self.deadline: Optional[float] = None
+        self.baseline = 0  # Память в начале поиска
+        self.next_check = check_every
+
+    @classmethod
+    def parse(cls, text: str) -> "Budget":
+        """
+        Разбирает бюджет из записи вида expansions=100000,time=0.5,memory=64M.
+
+        :param text: пары ключ=значение через запятую; ключи expansions, time
+                     (секунды) и memory (байты, допустимы суффиксы K, M, G)
+        :type text: string
+        :return: бюджет
+        :rtype: Budget
+        :raises ValueError: если запись не разобрана
+        """
+        limits = {}
+
+        for item in text.split(","):
+            key, _, value = item.partition("=")
+            key, value = key.strip(), value.strip().upper()
+
+            if key == "expansions":
+                limits["max_expansions"] = int(value)
+            elif key == "time":
+                limits["max_time"] = float(value)
+            elif key == "memory":
+                scale = MEMORY_UNITS.get(value[-1:], 1)
+                limits["max_memory"] = int(float(value.rstrip("KMG")) * scale)
+            else:
+                raise ValueError("Unknown budget limit: " + key)
+
+        return cls(**limits)
+
+    def start(self):
+        """Начинает учёт нового поиска."""
+        self.expansions = 0
+        self.exhausted = False
+        self.next_check = self.check_every
+
+        if self.max_time is not None:
+            self.deadline = time.perf_counter() + self.max_time
+
+        if self.max_memory is not None:
+            try:
+                self.baseline = used_memory()
+            except OSError:
+                tracemalloc.start()
+                self.baseline = used_memory()
+
+    def spend(self, count: int = 1) -> bool:
+        """
+        Учитывает count раскрытий.
+
+        :param count: число раскрытий
+        :type count: int
+        :return: True, если бюджет исчерпан и поиск нужно остановить
+        :rtype: bool
+        """
+        self.expansions += count
+
+        if self.max_expansions is not None and self.expansions > self.max_expansions:
+            self.exhausted = True
+        elif self.expansions >= self.next_check:
+            self.next_check = self.expansions + self.check_every
+
+            if self.max_time is not None and time.perf_counter() > self.deadline:
+                self.exhausted = True
+            elif (
+                self.max_memory is not None
+                and used_memory() - self.baseline > self.max_memory
+            ):
+                self.exhausted = True
+
+        return self.exhausted
+
+    def __repr__(self) -> str:
+        return (
+            f"Budget(max_expansions={self.max_expansions}, "
+            f"max_time={self.max_time}, max_memory={self.max_memory})"
+        )
@@ -1,28 +1,101 @@
-from typing import List
-from prettytable import PrettyTable, ALL
+import copy
+import csv
+import gc
+import json
+import math
+import time
+import tracemalloc
+from statistics import median
+from typing import Callable, List, Optional
+
+# Поля статистики при экспорте в JSON и CSV
+FIELDS = [
+    "solver",
+    "depth",
+    "max_depth",
+    "all_generated",
+    "branching_factor",
+    "direction",
+    "max_frontier",
+    "max_visited",
+    "wall_time",
+    "cpu_time",
+    "expansions_per_sec",
+    "peak_memory",
+    "truncated",
+]
 
 class Statistic:
-    def __init__(self, depth: int, max_depth: int, all_generated: int):
+    def __init__(
+        self,
+        depth: int,
+        max_depth: int,
+        all_generated: int,
+        max_frontier: Optional[int] = None,
+        max_visited: Optional[int] = None,
+        truncated: bool = False,
+    ):
         self.depth = depth
         self.max_depth = max_depth
         self.all_generated = all_generated
+        self.max_frontier = max_frontier  # Наибольший размер фронта поиска
+        self.max_visited = max_visited  # Наибольшее число посещённых вершин
+
+        # Поиск остановлен исчерпанием бюджета: путь ведёт не к цели, а к
+        # ближайшей к ней достигнутой клетке
+        self.truncated = truncated
+
+        # Заполняются функцией measure, а не самим решателем
+        self.wall_time: Optional[float] = None  # Время выполнения, с
+        self.cpu_time: Optional[float] = None  # Процессорное время, с
+        self.peak_memory: Optional[int] = None  # Пик выделенной памяти, байт
 
     @property
     def branching_factor(self) -> float:
+        if not self.depth:
+            return float("nan")  # Пустой путь: не определено
         return self.all_generated / self.depth
     
     @property
     def direction(self) -> float:
+        if not self.depth:
+            return float("nan")
         return self.all_generated ** (1 / self.depth)
+
+    @property
+    def expansions_per_sec(self) -> Optional[float]:
+        if not self.wall_time:
+            return None
+        return self.all_generated / self.wall_time
+
+    def to_dict(self) -> dict:
+        """Значения статистики по полям FIELDS (кроме имени решателя)."""
+        return {field: getattr(self, field) for field in FIELDS[1:]}
     
     
     def __str__(self) -> str:
-        return f"""Statistic:
+        text = f"""Statistic:
         Depth: {self.depth}
         Max depth: {self.max_depth}
         All generated: {self.all_generated}
         Branching factor: {self.branching_factor:.2f}
         Direction: {self.direction:.2f}"""
+
+        # Необязательные метрики выводятся, только если они измерены
+        if self.max_frontier is not None:
+            text += f"\n        Max frontier: {self.max_frontier}"
+        if self.max_visited is not None:
+            text += f"\n        Max visited: {self.max_visited}"
+        if self.wall_time is not None:
+            text += f"\n        Wall time: {self.wall_time:.4f} s"
+            text += f"\n        CPU time: {self.cpu_time:.4f} s"
+            text += f"\n        Expansions/sec: {self.expansions_per_sec or 0:.0f}"
+        if self.peak_memory is not None:
+            text += f"\n        Peak memory: {self.peak_memory / 1024:.1f} KiB"
+        if self.truncated:
+            text += "\n        Truncated: yes (budget exhausted)"
+
+        return text
     
     @staticmethod
     def print_statistics(statistics: List["Statistic"], solver_names: List[str]):
@@ -32,6 +105,8 @@ class Statistic:
         :param statistics: Список объектов Statistic, содержащий статистику для каждого решателя.
         :param solver_names: Список имён решателей, соответствующий каждому объекту Statistic.
         """
+        from prettytable import PrettyTable, ALL
+
         table = PrettyTable(border=True,
                     hrules=ALL,
                     vertical_char="│",
@@ -46,9 +121,26 @@ class Statistic:
                     bottom_right_junction_char="┘",
                     bottom_left_junction_char="└",
                     start=0,
-                    end=7)
-        table.field_names = ["Solver", "Depth", "Max Depth", "All Generated", "Branching Factor", "Direction"]
-        
+                    end=len(statistics))
+        table.field_names = [
+            "Solver",
+            "Depth",
+            "Max Depth",
+            "All Generated",
+            "Branching Factor",
+            "Direction",
+            "Max Frontier",
+            "Max Visited",
+            "Wall Time, ms",
+            "Expansions/s",
+            "Peak Memory, KiB",
+            "Truncated",
+        ]
+
+        def optional(value, template="{}"):
+            """Форматирует необязательную метрику; неизмеренная - прочерк."""
+            return "-" if value is None else template.format(value)
+
         # Добавляем статистику по каждому решателю в таблицу
         for stat, name in zip(statistics, solver_names):
             table.add_row([
@@ -57,9 +149,129 @@ class Statistic:
                 stat.max_depth,
                 stat.all_generated,
                 f"{stat.branching_factor:.2f}",
-                f"{stat.direction:.2f}"
+                f"{stat.direction:.2f}",
+                optional(stat.max_frontier),
+                optional(stat.max_visited),
+                optional(stat.wall_time and stat.wall_time * 1000, "{:.2f}"),
+                optional(stat.expansions_per_sec, "{:.0f}"),
+                optional(stat.peak_memory and stat.peak_memory / 1024, "{:.1f}"),
+                "yes" if stat.truncated else "-",
             ])
         
         # Выводим таблицу
         print(table)
-    
+
+    @staticmethod
+    def save_statistics(
+        statistics: List["Statistic"], solver_names: List[str], filename: str
+    ):
+        """
+        Сохраняет статистику решателей в JSON или CSV (по расширению filename).
+
+        :param statistics: Список объектов Statistic
+        :param solver_names: Список имён решателей, соответствующий statistics
+        :param filename: имя файла (.json или .csv)
+        """
+        records = [
+            {"solver": name, **stat.to_dict()}
+            for stat, name in zip(statistics, solver_names)
+        ]
+        save_records(records, filename)
+
+
+def finite_values(record: dict) -> dict:
+    """
+    Заменяет нечисловые значения записи (nan, inf) на None.
+
+    Производные метрики пустого пути (старт совпадает с целью) не определены
+    и равны nan, а NaN не входит в JSON.
+
+    :param record: запись с метриками
+    :return: копия записи, в которой нечисловые значения заменены на None
+    """
+    return {
+        key: None if isinstance(value, float) and not math.isfinite(value) else value
+        for key, value in record.items()
+    }
+
+
+def save_records(records: List[dict], filename: str, fields: List[str] = FIELDS):
+    """
+    Сохраняет записи с метриками в JSON или CSV (по расширению filename).
+    Неопределённые метрики (nan) сохраняются как null или пустые ячейки.
+
+    :param records: список записей (словарей)
+    :param filename: имя файла (.json или .csv)
+    :param fields: столбцы CSV
+    """
+    records = [finite_values(record) for record in records]
+
+    if filename.endswith(".csv"):
+        with open(filename, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(records)
+    else:
+        with open(filename, "w") as file:
+            json.dump(records, file, indent=2, allow_nan=False)
+
+
+def measure(
+    solver: Callable, *args, trace_memory: bool = False, repeat: int = 1, **kwargs
+):
+    """
+    Запускает решатель и дополняет его статистику временем и памятью.
+
+    Время - медиана repeat запусков; на время запусков, как в timeit,
+    отключается сборщик циклического мусора. Пик памяти измеряется отдельным
+    запуском под tracemalloc, чтобы трассировка не искажала время; без
+    trace_memory он не измеряется. Повторные запуски не пишут события в
+    переданную трассу и получают копию бюджета, поэтому трасса и бюджет
+    относятся только к первому запуску, результат которого возвращается.
+
+    :param solver: решатель
+    :param args: аргументы решателя
+    :param trace_memory: измерять ли пик выделенной памяти
+    :param repeat: число замеров времени
+    :param kwargs: именованные аргументы решателя
+    :return: результат решателя (список действий и статистика) или None
+    """
+    rerun = dict(kwargs)
+    rerun.pop("trace", None)
+    if rerun.get("budget") is not None:
+        rerun["budget"] = copy.copy(rerun["budget"])
+
+    wall_times, cpu_times = [], []
+    result = None
+
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        for run in range(repeat):
+            started, cpu_started = time.perf_counter(), time.process_time()
+            outcome = solver(*args, **(rerun if run else kwargs))
+            wall_times.append(time.perf_counter() - started)
+            cpu_times.append(time.process_time() - cpu_started)
+
+            if not run:
+                result = outcome
+    finally:
+        if collecting:
+            gc.enable()
+
+    if result is None:
+        return None
+
+    statistic = result[1]
+    statistic.wall_time = median(wall_times)
+    statistic.cpu_time = median(cpu_times)
+
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            solver(*args, **rerun)
+            statistic.peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return result
@@ -0,0 +1,167 @@
+from array import array
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+# Виды событий поиска
+EXPAND = 0  # Вершина раскрыта
+GENERATE = 1  # Вершина порождена (добавлена во фронт)
+GOAL = 2  # Цель достигнута
+
+# Число событий, накапливаемых перед передачей потребителю
+BATCH_SIZE = 4096
+
+
+class SearchTrace:
+    def __init__(
+        self,
+        shape: Tuple[int, int],
+        consumer: Optional[Callable[[np.ndarray, np.ndarray], None]] = None,
+        batch: int = BATCH_SIZE,
+        record: bool = True,
+    ):
+        """
+        Создаёт приёмник событий поиска.
+
+        Решатели, получившие приёмник, сообщают о раскрытии и порождении
+        вершин и о достижении цели; без приёмника они не тратят на события
+        ничего, кроме проверки на None. События копятся в буфере и
+        передаются потребителю пакетами по batch штук.
+
+        :param shape: размеры лабиринта (h, w)
+        :type shape: Tuple[int, int]
+        :param consumer: функция, принимающая пакет событий: массив видов
+                         событий и массив координат клеток формы (N, 2)
+        :param batch: размер пакета
+        :type batch: int
+        :param record: сохранять ли все события для записи в файл
+        :type record: bool
+        """
+        self.shape = tuple(shape)
+        self.stride = self.shape[1] + 2  # Ширина строки сетки Grid с рамкой
+        self.consumer = consumer
+        self.batch = batch
+        self.record = record
+
+        self.buffer = array("q")  # Закодированные события: клетка * 4 + вид
+        self.chunks: List[np.ndarray] = []  # Записанные события без рамки
+        self.actions: Optional[List[int]] = None  # Найденный путь
+
+    def emit(self, kind: int, cell: int):
+        """
+        Сообщает о событии kind в клетке cell (индекс Grid).
+
+        :param kind: вид события (EXPAND, GENERATE, GOAL)
+        :type kind: int
+        :param cell: индекс клетки в сетке с рамкой
+        :type cell: int
+        """
+        buffer = self.buffer
+        buffer.append(cell << 2 | kind)
+
+        if len(buffer) >= self.batch:
+            self.flush()
+
+    def extend(self, kind: int, cells: np.ndarray):
+        """
+        Сообщает об одинаковых событиях во многих клетках сразу.
+
+        :param kind: вид события
+        :type kind: int
+        :param cells: индексы клеток в сетке с рамкой
+        :type cells: numpy 1D array
+        """
+        self.buffer.extend((np.asarray(cells, dtype=np.int64) << 2 | kind).tolist())
+
+        if len(self.buffer) >= self.batch:
+            self.flush()
+
+    def finish(self, actions: Optional[List[int]], goal: Optional[int] = None):
+        """
+        Завершает поиск: отмечает достижение цели, запоминает путь и
+        передаёт оставшиеся события.
+
+        :param actions: найденный путь или None, если решение не найдено
+        :type actions: List[int]
+        :param goal: индекс целевой клетки в сетке с рамкой
+        :type goal: int
+        """
+        if goal is not None:
+            self.emit(GOAL, goal)
+
+        self.actions = actions
+        self.flush()
+
+    def flush(self):
+        """Передаёт накопленные события потребителю и в запись."""
+        if not self.buffer:
+            return
+
+        codes = np.frombuffer(self.buffer, dtype=np.int64)
+        kinds = (codes & 3).astype(np.uint8)
+        rows, cols = np.divmod(codes >> 2, self.stride)
+        positions = np.column_stack((rows - 1, cols - 1))
+
+        self.buffer = array("q")
+
+        if self.record:
+            # Храним клетки в нумерации лабиринта без рамки
+            cells = positions[:, 0] * self.shape[1] + positions[:, 1]
+            self.chunks.append(cells << 2 | kinds)
+
+        if self.consumer is not None:
+            self.consumer(kinds, positions)
+
+    def events(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Возвращает все записанные события.
+
+        :return: массив видов событий и массив координат клеток формы (N, 2)
+        :rtype: Tuple[numpy 1D array, numpy 2D array]
+        """
+        self.flush()
+
+        codes = np.concatenate(self.chunks) if self.chunks else np.zeros(0, np.int64)
+        kinds = (codes & 3).astype(np.uint8)
+        return kinds, np.column_stack(np.divmod(codes >> 2, self.shape[1]))
+
+    def save(self, filename: str):
+        """
+        Сохраняет события и найденный путь в сжатый файл (формат .npz).
+
+        :type filename: string
+        :param filename: имя файла
+        """
+        self.flush()
+
+        codes = np.concatenate(self.chunks) if self.chunks else np.zeros(0, np.int64)
+        actions = np.array(self.actions or [], dtype=np.uint8)
+
+        # Самый компактный тип, вмещающий коды событий
+        dtype = np.min_scalar_type(int(codes.max()) if codes.size else 0)
+
+        np.savez_compressed(
+            filename,
+            shape=np.array(self.shape),
+            events=codes.astype(dtype),
+            actions=actions,
+            solved=self.actions is not None,
+        )
+
+    @classmethod
+    def load(cls, filename: str) -> "SearchTrace":
+        """
+        Загружает события, сохранённые методом save.
+
+        :type filename: string
+        :param filename: имя файла
+        :return: приёмник с записанными событиями
+        :rtype: SearchTrace
+        """
+        with np.load(filename) as data:
+            trace = cls(tuple(data["shape"].tolist()))
+            trace.chunks = [data["events"].astype(np.int64)]
+            if data["solved"]:
+                trace.actions = data["actions"].tolist()
+
+        return trace
@@ -0,0 +1,56 @@
+import getopt
+import sys
+
+from analyzer.benchmark import (
+    DEFAULT_NUM_PATHS,
+    DEFAULT_SIZES,
+    build_corpus,
+    compare,
+    load_results,
+    run_benchmark,
+    save_results,
+)
+from solvers.cache import SOLVERS
+
+
+def parse_list(value):
+    return [int(item) for item in value.split(",")]
+
+
+def main(argv):
+    try:
+        opts = dict(getopt.getopt(argv, "o:b:t:r:s:n:e:")[0])
+    except getopt.GetoptError:
+        print("Invalid arguments. Exiting...")
+        exit()
+
+    sizes = parse_list(opts["-s"]) if "-s" in opts else DEFAULT_SIZES
+    num_paths = parse_list(opts["-n"]) if "-n" in opts else DEFAULT_NUM_PATHS
+    seeds = parse_list(opts["-e"]) if "-e" in opts else [0]
+    repeat = int(opts.get("-r", 5))
+    tolerance = float(opts.get("-t", 0.2))
+    output = opts.get("-o", "benchmark.json")
+
+    print("Generating corpus...")
+    corpus = build_corpus(sizes, num_paths, seeds)
+
+    print(f"Running {len(SOLVERS)} solvers on {len(corpus)} mazes...")
+    records = run_benchmark(corpus, SOLVERS, repeat)
+
+    save_results(records, output)
+    print("Results saved to " + output)
+
+    if "-b" in opts:
+        regressions = compare(records, load_results(opts["-b"]), tolerance)
+
+        for regression in regressions:
+            print("Regression: " + regression)
+
+        if regressions:
+            exit(1)
+
+        print("No regressions against " + opts["-b"])
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
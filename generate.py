@@ -0,0 +1,38 @@
+import getopt
+import sys
+
+from maze.dataset import GENERATORS, generate_dataset, index_filename
+
+
+def main(argv):
+    try:
+        opts = dict(getopt.getopt(argv, "o:n:s:a:e:p:k:b:")[0])
+    except getopt.GetoptError:
+        print("Invalid arguments. Exiting...")
+        exit()
+
+    output = opts.get("-o", "dataset.npy")
+    count = int(opts.get("-n", 1000))
+    w, h = map(int, opts.get("-s", "31x31").split("x"))
+    algorithm = opts.get("-a", "kruskal")
+    seed = int(opts.get("-e", 0))
+    workers = int(opts.get("-p", 0)) or None
+
+    if algorithm not in GENERATORS or not output.endswith(".npy"):
+        print("Invalid arguments. Exiting...")
+        exit()
+
+    options = {}
+    if "-k" in opts:
+        options["num_paths"] = int(opts["-k"])
+    if "-b" in opts:
+        options["braid"] = float(opts["-b"])
+
+    print(f"Generating {count} mazes {w}x{h} ({algorithm}, seed {seed})...")
+    generate_dataset(output, count, w, h, algorithm, seed, workers, **options)
+
+    print("Dataset saved to " + output + ", index to " + index_filename(output))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -7,13 +7,35 @@
 
 from functools import partial
 import getopt
+import os
 import sys
-from time import sleep
-import keyboard
-from maze import load, Situation, make_move
+from maze import load, Situation
+from maze.components import load_components
+from maze.renderer import ReplayRenderer, export
+from analyzer.budget import Budget
+from analyzer.statistic import measure
+from analyzer.trace import SearchTrace
+from maze.hierarchy import Hierarchy, hierarchy_filename
+from maze.landmarks import Landmarks, landmarks_filename
 import numpy as np
 
-from solvers import bfs, dfs, dfs_with_cmp, ucs, bnb, bidirectional_search
+from solvers import (
+    bfs,
+    dfs,
+    dfs_with_cmp,
+    ucs,
+    bnb,
+    bidirectional_search,
+    csgraph_search,
+    wavefront,
+    junction_search,
+    astar,
+    jps,
+    hpa,
+    dstar_lite,
+    bidirectional_astar,
+    bitboard_bfs,
+)
 from utils import select_option
 
 
@@ -38,7 +60,7 @@ def main(argv):
     print_header()
 
     try:
-        opts = dict(getopt.getopt(argv, "f:s:")[0])
+        opts = dict(getopt.getopt(argv, "f:s:o:v:t:r:b:")[0])
     except getopt.GetoptError:
         print("Invalid arguments. Exiting...")
         exit()
@@ -48,13 +70,29 @@ def main(argv):
     else:
         file = input("Enter maze file name: ")
 
-    if not file.endswith(".npy"):
+    if not file.endswith((".npy", ".bits")):
         print("Invalid file. Exiting...")
         exit()
 
     print("Loading maze from " + file)
     maze = load(file)
 
+    landmarks = None
+    if os.path.exists(landmarks_filename(file)):
+        print("Loading landmarks from " + landmarks_filename(file))
+        try:
+            landmarks = Landmarks.load(landmarks_filename(file), maze)
+        except ValueError as error:
+            print(f"Ignoring landmarks: {error}")
+
+    hierarchy = None
+    if os.path.exists(hierarchy_filename(file)):
+        print("Loading cluster abstraction from " + hierarchy_filename(file))
+        try:
+            hierarchy = Hierarchy.load(hierarchy_filename(file), maze)
+        except ValueError as error:
+            print(f"Ignoring cluster abstraction: {error}")
+
     situation = Situation(maze, np.array([0, 0]), maze.shape - np.asarray([1, 1]))
 
     goal_situation = Situation(
@@ -67,7 +105,18 @@ def main(argv):
         "dfs_with_cmp": dfs_with_cmp,
         "ucs": ucs,
         "bnb": bnb,
-        "bidirectional_search": partial(bidirectional_search, goal_situation),
+        "bidirectional_search": partial(
+            bidirectional_search, goal_state=goal_situation
+        ),
+        "csgraph_search": csgraph_search,
+        "wavefront": wavefront,
+        "junction_search": junction_search,
+        "astar": partial(astar, landmarks=landmarks),
+        "jps": partial(jps, landmarks=landmarks),
+        "hpa": partial(hpa, hierarchy=hierarchy),
+        "dstar_lite": dstar_lite,
+        "bidirectional_astar": partial(bidirectional_astar, landmarks=landmarks),
+        "bitboard_bfs": bitboard_bfs,
     }
 
     solver_options = list(solvers.keys())
@@ -78,32 +127,100 @@ def main(argv):
         "Uniform Cost Search",
         "Branch and Bound",
         "Bidirectional search",
+        "Compiled shortest path (SciPy)",
+        "Wavefront BFS",
+        "Junction graph search",
+        "A* search",
+        "Jump Point Search",
+        "Hierarchical A* (HPA*)",
+        "D* Lite",
+        "Bidirectional A* (NBA*)",
+        "Bitboard BFS",
     ]
 
-    if "-s" in opts:
-        solver = opts["-s"]
-    else:
-        option = select_option(solver_names)
-        solver = solver_options[option]
-
-    if solver not in solvers:
-        print("Invalid solver. Exiting...")
-        exit()
+    # Скорость воспроизведения: действий в секунду; при высокой скорости
+    # в кадр попадает несколько действий, чтобы кадров было не больше 30 в секунду
+    speed = float(opts.get("-v", 10))
+    step = max(1, round(speed / 30))
 
-    print("Solver: " + solver)
+    renderer = None
+    if "-o" not in opts:
+        renderer = ReplayRenderer(maze, situation.position, situation.goal)
 
-    actions, statistic = solvers[solver](situation)
+    if "-r" in opts:
+        # Воспроизводим записанный поиск вместо решения
+        print("Loading search trace from " + opts["-r"])
+        trace = SearchTrace.load(opts["-r"])
+        actions = trace.actions
 
-    print(statistic)
+        if renderer is not None:
+            renderer.explore(trace)
+    else:
+        # Индекс компонент связности отсекает нерешаемый лабиринт без поиска
+        components = load_components(file, maze)
+        if not components.connected(situation.position, situation.goal):
+            print("No solution found: goal is not reachable from start. Exiting...")
+            exit()
+
+        if "-s" in opts:
+            solver = opts["-s"]
+        else:
+            option = select_option(solver_names)
+            solver = solver_options[option]
+
+        if solver not in solvers:
+            print("Invalid solver. Exiting...")
+            exit()
+
+        print("Solver: " + solver)
+
+        # С -t события поиска записываются в файл, а в интерактивном режиме
+        # ещё и показываются по ходу решения
+        kwargs = {}
+        if "-b" in opts:
+            # Бюджет поиска, например -b expansions=100000,time=0.5
+            try:
+                kwargs["budget"] = Budget.parse(opts["-b"])
+            except ValueError:
+                print("Invalid budget. Exiting...")
+                exit()
+
+        if "-t" in opts:
+            consumer = renderer.show_events if renderer is not None else None
+            kwargs["trace"] = SearchTrace(maze.shape, consumer)
+
+        result = measure(solvers[solver], situation, **kwargs)
+
+        if "-t" in opts:
+            print("Saving search trace to " + opts["-t"])
+            kwargs["trace"].save(opts["-t"])
+
+        actions = None
+        if result is not None:
+            actions, statistic = result
+            print(statistic)
 
     if actions is None:
         print("No solution found. Exiting...")
         exit()
 
-    for action in actions:
-        situation = make_move(situation, action)
-        situation.draw()
-        sleep(0.1)
+    if "-o" in opts:
+        # Запись без графического интерфейса: GIF, MP4 или кадры
+        print("Exporting replay to " + opts["-o"])
+        export(
+            maze,
+            situation.position,
+            situation.goal,
+            actions,
+            opts["-o"],
+            fps=speed / step,
+            step=step,
+        )
+        exit()
+
+    renderer.play(actions, speed, step)
+
+    import keyboard
 
     keyboard.read_event()
 
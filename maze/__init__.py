@@ -1,2 +1,7 @@
 from .environment import make_move, Situation
-from .generator import generate, load, save
+from .generator import generate, generate_eller, generate_kruskal, load, save
+from .bitboard import Bitboard
+from .components import Components
+from .grid import Grid
+from .packed import PackedMaze, load_packed, save_packed
+from .dataset import MazeDataset, generate_dataset
@@ -0,0 +1,241 @@
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from analyzer.budget import Budget
+
+from .grid import CHUNK_ROWS
+
+# Число клеток в одном машинном слове строки
+WORD_BITS = 64
+
+# Наибольшая ширина лабиринта, строки которого хранятся целыми числами Python
+NARROW_WIDTH = 1024
+
+
+class Bitboard:
+    def __init__(self, maze: np.ndarray):
+        """
+        Создаёт битовое представление лабиринта для поиска в ширину, в
+        котором одна операция над словом продвигает волну сразу по 64 клеткам.
+
+        Строка узкого лабиринта хранится целым числом Python (бит j -
+        столбец j), а фронт - словарём только занятых им строк, поэтому шаг
+        стоит пропорционально числу строк фронта. Широкий лабиринт хранится
+        построчно словами uint64 (бит j слова k - столбец 64 * k + j), и
+        шаг обрабатывает полосу строк фронта векторными операциями NumPy.
+
+        :param maze: матрица, представляющая лабиринт (0 - путь, 1 - стена)
+        :type maze: numpy 2D array
+        """
+        h, w = maze.shape
+        self.shape = maze.shape
+        self.narrow = w <= NARROW_WIDTH
+
+        # Ширина строки в битах, кратная слову
+        self.stride = -(-w // WORD_BITS) * WORD_BITS
+
+        # Матрица читается частями по строкам, как в Grid
+        rows = []
+        for row in range(0, h, CHUNK_ROWS):
+            chunk = np.asarray(maze[row : row + CHUNK_ROWS]) != 1
+            free = np.zeros((len(chunk), self.stride), dtype=bool)
+            free[:, :w] = chunk
+            packed = np.packbits(free, axis=1, bitorder="little")
+
+            if self.narrow:
+                rows += [int.from_bytes(bits.tobytes(), "little") for bits in packed]
+            else:
+                rows.append(packed.view("<u8"))
+
+        # Битовые строки проходимых клеток
+        self.free: Union[List[int], np.ndarray]
+        self.free = rows if self.narrow else np.concatenate(rows)
+
+    def _frontiers(
+        self, start: np.ndarray
+    ) -> Iterator[Tuple[Union[Dict[int, int], np.ndarray], int]]:
+        """
+        Распространяет волну от клетки start слоями.
+
+        :param start: координаты стартовой клетки
+        :type start: numpy 1D array
+        :return: слои волны: битовая карта слоя и номер её первой строки
+                 (у узкого лабиринта - словарь строка -> биты и 0)
+        """
+        h = self.shape[0]
+        row, col = int(start[0]), int(start[1])
+
+        if self.narrow:
+            remaining = self.free.copy()  # Непомеченные проходимые клетки
+            remaining[row] &= ~(1 << col)
+            frontier = {row: 1 << col}
+
+            while frontier:
+                yield frontier, 0
+
+                # Сдвигаем каждую строку слоя вбок и в соседние строки
+                spread: Dict[int, int] = {}
+                for row, bits in frontier.items():
+                    spread[row] = spread.get(row, 0) | bits << 1 | bits >> 1
+                    if row > 0:
+                        spread[row - 1] = spread.get(row - 1, 0) | bits
+                    if row + 1 < h:
+                        spread[row + 1] = spread.get(row + 1, 0) | bits
+
+                frontier = {}
+                for row, bits in spread.items():
+                    bits &= remaining[row]
+                    if bits:
+                        remaining[row] ^= bits
+                        frontier[row] = bits
+            return
+
+        frontier = np.zeros_like(self.free)
+        frontier[row, col // WORD_BITS] = np.uint64(1) << np.uint64(col % WORD_BITS)
+        remaining = self.free & ~frontier
+
+        # Строки [low, high) содержат весь текущий слой
+        low, high = row, row + 1
+
+        while True:
+            yield frontier[low:high], low
+
+            # Слой может вырасти только на строку вверх и вниз
+            low, high = max(low - 1, 0), min(high + 1, h)
+            layer = frontier[low:high]
+
+            # Сдвиги внутри слов и переносы крайних битов в соседние слова
+            spread = layer << 1 | layer >> 1
+            spread[:, 1:] |= layer[:, :-1] >> 63
+            spread[:, :-1] |= layer[:, 1:] << 63
+            spread[1:] |= layer[:-1]
+            spread[:-1] |= layer[1:]
+
+            spread &= remaining[low:high]
+            remaining[low:high] ^= spread
+            frontier[low:high] = spread
+
+            words = np.flatnonzero(spread)
+            if not words.size:
+                return  # Волна исчерпала компоненту связности
+
+            # Сужаем полосу до строк первого и последнего непустых слов
+            width = spread.shape[1]
+            low, high = low + int(words[0]) // width, low + int(words[-1]) // width + 1
+
+    def _cells(self, frontier: np.ndarray, low: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Переводит битовую карту слоя широкого лабиринта в координаты клеток.
+
+        :param frontier: слова строк слоя
+        :param low: номер первой строки карты
+        :return: номера строк и столбцов клеток слоя
+        :rtype: Tuple[numpy 1D array, numpy 1D array]
+        """
+        # Одномерный поиск ненулевых слов быстрее двумерного np.nonzero
+        flat = frontier.ravel()
+        index = np.flatnonzero(flat)
+        rows, words = np.divmod(index, frontier.shape[1])
+
+        bits = np.unpackbits(
+            flat[index].astype("<u8").view(np.uint8).reshape(-1, 8),
+            axis=1,
+            bitorder="little",
+        )
+        index, bit = np.nonzero(bits)
+        return rows[index] + low, words[index] * WORD_BITS + bit
+
+    def _contains(
+        self,
+        frontier: Union[Dict[int, int], np.ndarray],
+        low: int,
+        position: np.ndarray,
+    ) -> bool:
+        """Проверяет, входит ли клетка position в слой."""
+        row, col = int(position[0]), int(position[1])
+
+        if self.narrow:
+            return bool(frontier.get(row, 0) >> col & 1)
+
+        if not low <= row < low + len(frontier):
+            return False
+        word = frontier[row - low, col // WORD_BITS]
+        return bool(word >> np.uint64(col % WORD_BITS) & np.uint64(1))
+
+    def distances(
+        self,
+        start: np.ndarray,
+        goal: np.ndarray = None,
+        budget: Optional[Budget] = None,
+    ) -> np.ndarray:
+        """
+        Вычисляет расстояния от клетки start до клеток лабиринта.
+
+        :param start: координаты стартовой клетки
+        :type start: numpy 1D array
+        :param goal: координаты клетки, после слоя которой поиск
+                     останавливается; None - вся компонента связности
+        :type goal: numpy 1D array
+        :param budget: бюджет поиска; раскрытие слоя расходует его на размер
+                       слоя, и по исчерпании поиск останавливается
+        :type budget: Budget
+        :return: поле расстояний формы (h, w), -1 - недостижимо (или не
+                 достигнуто до остановки); номер слоя равен расстоянию
+        :rtype: numpy 2D array
+        """
+        distances = np.full(self.shape, -1, dtype=np.int32)
+
+        # Клетки слоёв узкого лабиринта: строки слоя обычно содержат лишь
+        # несколько клеток, поэтому их биты перебираются напрямую, а
+        # расстояния записываются в поле одним присваиванием
+        rows: List[int] = []
+        cols: List[int] = []
+        depths: List[int] = []
+
+        for depth, (frontier, low) in enumerate(self._frontiers(start)):
+            if self.narrow:
+                size = len(rows)
+                for row, bits in frontier.items():
+                    while bits:
+                        lowest = bits & -bits
+                        rows.append(row)
+                        cols.append(lowest.bit_length() - 1)
+                        depths.append(depth)
+                        bits ^= lowest
+                size = len(rows) - size  # Число клеток слоя
+            else:
+                layer_rows, layer_cols = self._cells(frontier, low)
+                distances[layer_rows, layer_cols] = depth
+                size = len(layer_rows)
+
+            if goal is not None and self._contains(frontier, low, goal):
+                break
+
+            # Раскрытие слоя порождает следующий; бюджет расходуется заранее
+            if budget is not None and budget.spend(size):
+                break
+
+        if rows:
+            distances[rows, cols] = depths
+
+        return distances
+
+    def reachable(self, start: np.ndarray, goal: np.ndarray) -> bool:
+        """
+        Проверяет, достижима ли клетка goal из клетки start.
+
+        Координаты клеток слоёв не вычисляются, поэтому проверка дешевле
+        поиска расстояний.
+
+        :param start: координаты стартовой клетки
+        :type start: numpy 1D array
+        :param goal: координаты целевой клетки
+        :type goal: numpy 1D array
+        :return: True, если путь существует
+        :rtype: bool
+        """
+        return any(
+            self._contains(frontier, low, goal)
+            for frontier, low in self._frontiers(start)
+        )
@@ -0,0 +1,172 @@
+import os
+from typing import Optional
+
+import numpy as np
+
+from .fingerprint import fingerprint
+
+
+class Components:
+    def __init__(
+        self, labels: np.ndarray, count: int, maze_fingerprint: Optional[str] = None
+    ):
+        """
+        Создаёт индекс компонент связности лабиринта.
+
+        Клетки, между которыми есть путь, имеют одинаковую метку, поэтому
+        проверка достижимости цели сводится к сравнению двух меток, и
+        заведомо нерешаемые запросы отбрасываются без поиска.
+
+        :param labels: метки компонент клеток, 0 - стена
+        :type labels: numpy 2D array
+        :param count: число компонент
+        :type count: int
+        :param maze_fingerprint: отпечаток лабиринта (см. maze.fingerprint)
+        :type maze_fingerprint: string
+        """
+        self.labels = labels
+        self.count = count
+        self.fingerprint = maze_fingerprint
+
+    @classmethod
+    def build(cls, maze: np.ndarray) -> "Components":
+        """
+        Размечает компоненты связности проходимых клеток (соседи по
+        горизонтали и вертикали, как в action_map).
+
+        :param maze: матрица, представляющая лабиринт (0 - путь, 1 - стена)
+        :type maze: numpy 2D array
+        :return: индекс компонент
+        :rtype: Components
+        """
+        from scipy.ndimage import label
+
+        labels, count = label(np.asarray(maze) != 1)
+
+        # Самый компактный тип, вмещающий все метки
+        return cls(labels.astype(np.min_scalar_type(count)), count, fingerprint(maze))
+
+    def label(self, position: np.ndarray) -> int:
+        """Метка компоненты клетки position (0 - стена)."""
+        return int(self.labels[int(position[0]), int(position[1])])
+
+    def connected(self, start: np.ndarray, goal: np.ndarray) -> bool:
+        """
+        Проверяет, лежат ли клетки start и goal в одной компоненте.
+
+        :param start: координаты стартовой клетки
+        :type start: numpy 1D array
+        :param goal: координаты целевой клетки
+        :type goal: numpy 1D array
+        :return: True, если путь между клетками существует
+        :rtype: bool
+        """
+        label = self.label(start)
+        return label != 0 and label == self.label(goal)
+
+    def size(self, position: np.ndarray) -> int:
+        """
+        Число клеток компоненты, содержащей клетку position; столько вершин
+        в худшем случае раскроет поиск из неё.
+
+        :param position: координаты клетки
+        :type position: numpy 1D array
+        :return: размер компоненты (0 для стены)
+        :rtype: int
+        """
+        label = self.label(position)
+        if label == 0:
+            return 0
+        return int(np.count_nonzero(self.labels == label))
+
+    def save(self, filename: str):
+        """
+        Сохраняет индекс в файл filename (формат .npz).
+
+        :type filename: string
+        :param filename: имя файла, в который будет сохранён индекс
+        """
+        np.savez_compressed(
+            filename,
+            labels=self.labels,
+            count=self.count,
+            fingerprint=np.array(self.fingerprint or ""),
+        )
+
+    @classmethod
+    def load(cls, filename: str, maze: np.ndarray) -> "Components":
+        """
+        Загружает индекс лабиринта maze из файла filename; файл принимается,
+        только если его отпечаток совпадает с отпечатком maze.
+
+        :type filename: string
+        :param filename: имя файла, из которого будет загружен индекс
+        :param maze: матрица, представляющая лабиринт
+        :type maze: numpy 2D array
+        :return: индекс компонент
+        :rtype: Components
+        :raises ValueError: если файл построен для другого лабиринта (или
+                            сохранён без отпечатка)
+        """
+        with np.load(filename) as data:
+            stored = str(data["fingerprint"]) if "fingerprint" in data else ""
+            if data["labels"].shape != tuple(maze.shape):
+                raise ValueError(f"{filename} does not match the maze shape")
+            if stored != fingerprint(maze):
+                raise ValueError(f"{filename} was built for a different maze")
+
+            return cls(data["labels"], int(data["count"]), stored)
+
+
+def components_filename(maze_filename: str) -> str:
+    """
+    Возвращает имя файла индекса компонент, хранящегося рядом с файлом
+    лабиринта.
+
+    :type maze_filename: string
+    :param maze_filename: имя файла лабиринта (.npy или .bits)
+    :return: имя файла индекса (.components.npz)
+    :rtype: string
+    """
+    return os.path.splitext(maze_filename)[0] + ".components.npz"
+
+
+def load_components(maze_filename: str, maze: np.ndarray) -> Components:
+    """
+    Загружает индекс компонент, сохранённый рядом с лабиринтом, или строит
+    и сохраняет его, если файла ещё нет или он построен для другого
+    лабиринта.
+
+    :type maze_filename: string
+    :param maze_filename: имя файла лабиринта
+    :param maze: матрица, представляющая лабиринт
+    :return: индекс компонент
+    :rtype: Components
+    """
+    filename = components_filename(maze_filename)
+
+    if os.path.exists(filename):
+        try:
+            return Components.load(filename, maze)
+        except ValueError:
+            pass  # Лабиринт изменился: индекс строится заново
+
+    components = Components.build(maze)
+
+    try:
+        components.save(filename)
+    except OSError:
+        pass  # Каталог лабиринта только для чтения: индекс не кешируется
+
+    return components
+
+
+if __name__ == "__main__":
+    from .generator import load
+
+    filename = input("Введите имя файла лабиринта: ")
+
+    components = Components.build(load(filename))
+    components.save(components_filename(filename))
+
+    print(f"Компонент связности: {components.count}")
@@ -0,0 +1,183 @@
+# Наборы лабиринтов: множество лабиринтов одного размера в одном файле
+#
+# Лабиринты хранятся трёхмерным массивом uint8 формы (N, h, w) в файле .npy,
+# который читается отображением в память, а параметры генерации и зёрна
+# каждого лабиринта - в индексе .index.json рядом с ним.
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from .generator import eller_rows, generate, generate_kruskal
+
+# Генераторы по именам: (ширина, высота, зерно, параметры) -> лабиринт
+GENERATORS = {
+    "dfs": lambda w, h, seed, **options: generate(w, h, seed=seed, **options),
+    "kruskal": lambda w, h, seed, **options: generate_kruskal(
+        w, h, seed=seed, **options
+    ),
+    "eller": lambda w, h, seed, **options: np.array(
+        list(eller_rows(w, h, seed=seed, **options))
+    ),
+}
+
+# Число лабиринтов в одной задаче пула процессов
+CHUNK_SIZE = 64
+
+
+def item_seed(seed: int, index: int) -> int:
+    """
+    Выводит зерно отдельного лабиринта из общего зерна набора.
+
+    Зёрна независимы и не зависят от числа процессов и порядка генерации.
+
+    :param seed: общее зерно набора
+    :type seed: int
+    :param index: номер лабиринта в наборе
+    :type index: int
+    :return: зерно лабиринта
+    :rtype: int
+    """
+    sequence = np.random.SeedSequence(seed, spawn_key=(index,))
+    return int(sequence.generate_state(1, dtype=np.uint64)[0])
+
+
+def index_filename(filename: str) -> str:
+    """
+    Возвращает имя файла индекса, хранящегося рядом с набором.
+
+    :type filename: string
+    :param filename: имя файла набора (.npy)
+    :return: имя файла индекса (.index.json)
+    :rtype: string
+    """
+    return os.path.splitext(filename)[0] + ".index.json"
+
+
+def _fill(filename: str, seeds: List[int], start: int, algorithm: str, options: dict):
+    """
+    Генерирует лабиринты с номерами от start и записывает их прямо в файл
+    набора. Выполняется в процессе пула.
+    """
+    mazes = np.load(filename, mmap_mode="r+")
+    _, h, w = mazes.shape
+
+    for offset, seed in enumerate(seeds):
+        mazes[start + offset] = GENERATORS[algorithm](w, h, seed, **options)
+
+    mazes.flush()
+
+
+def generate_dataset(
+    filename: str,
+    count: int,
+    w: int = 10,
+    h: int = 10,
+    algorithm: str = "kruskal",
+    seed: int = 0,
+    workers: Optional[int] = None,
+    **options,
+):
+    """
+    Генерирует набор из count лабиринтов в пуле процессов.
+
+    Файл набора создаётся заранее, и каждый процесс записывает свои
+    лабиринты в него напрямую, поэтому лабиринты не передаются между
+    процессами.
+
+    :type filename: string
+    :param filename: имя файла набора (.npy)
+    :type count: int
+    :param count: число лабиринтов
+    :type w: int
+    :param w: ширина лабиринтов
+    :type h: int
+    :param h: высота лабиринтов
+    :type algorithm: string
+    :param algorithm: генератор (ключ GENERATORS)
+    :type seed: int
+    :param seed: общее зерно набора
+    :type workers: int
+    :param workers: число процессов (None - по числу ядер, 1 - без пула)
+    :param options: дополнительные параметры генератора (num_paths, braid)
+    """
+    seeds = [item_seed(seed, index) for index in range(count)]
+
+    mazes = np.lib.format.open_memmap(
+        filename, mode="w+", dtype=np.uint8, shape=(count, h, w)
+    )
+    del mazes
+
+    chunks = [
+        (filename, seeds[start : start + CHUNK_SIZE], start, algorithm, options)
+        for start in range(0, count, CHUNK_SIZE)
+    ]
+
+    if workers == 1:
+        for chunk in chunks:
+            _fill(*chunk)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(_fill, *chunk) for chunk in chunks]:
+                future.result()
+
+    index = {
+        "algorithm": algorithm,
+        "options": options,
+        "shape": [count, h, w],
+        "seed": seed,
+        "seeds": seeds,
+    }
+
+    with open(index_filename(filename), "w") as file:
+        json.dump(index, file, indent=2)
+
+
+class MazeDataset:
+    def __init__(self, filename: str):
+        """
+        Открывает набор лабиринтов только для чтения.
+
+        Файл отображается в память, поэтому лабиринт считывается с диска
+        только при обращении к нему.
+
+        :param filename: имя файла набора (.npy)
+        :type filename: string
+        """
+        self.filename = filename
+        self.mazes = np.load(filename, mmap_mode="r")
+
+        self.index = {}
+        if os.path.exists(index_filename(filename)):
+            with open(index_filename(filename)) as file:
+                self.index = json.load(file)
+
+    @property
+    def seeds(self) -> List[int]:
+        """Зёрна лабиринтов набора."""
+        return self.index.get("seeds", [])
+
+    def __len__(self) -> int:
+        return len(self.mazes)
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        return self.mazes[index]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+def is_dataset(filename: str) -> bool:
+    """
+    Проверяет, является ли файл набором лабиринтов.
+
+    :type filename: string
+    :param filename: имя файла
+    :return: True, если рядом с файлом лежит индекс набора
+    :rtype: bool
+    """
+    return filename.endswith(".npy") and os.path.exists(index_filename(filename))
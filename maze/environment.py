@@ -1,8 +1,8 @@
 import numpy as np
-import matplotlib.pyplot as plt
 from utils import plotlive
 
-fig, ax = plt.subplots()
+# matplotlib загружается только при первом рисовании, чтобы решатели и
+# анализ импортировались без графики
 
 
 class Situation:
@@ -83,6 +83,9 @@ class Situation:
         :return: None
         :rtype: None
         """
+        import matplotlib.pyplot as plt
+
+        ax = plt.gca()
         plt.imshow(self.maze, interpolation="none", aspect="equal", cmap="Greys")
 
         plt.xticks([], [])
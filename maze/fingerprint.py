@@ -0,0 +1,28 @@
+from hashlib import blake2b
+
+import numpy as np
+
+from .grid import CHUNK_ROWS
+
+
+def fingerprint(maze: np.ndarray) -> str:
+    """
+    Вычисляет отпечаток лабиринта по его форме и расположению стен.
+
+    Тип матрицы и формат файла не учитываются, поэтому один лабиринт,
+    сохранённый как .npy или .bits, имеет один отпечаток. Матрица читается
+    частями по строкам, как в Grid.
+
+    :param maze: матрица, представляющая лабиринт (0 - путь, 1 - стена)
+    :type maze: numpy 2D array
+    :return: шестнадцатеричный хеш формы и стен лабиринта
+    :rtype: string
+    """
+    digest = blake2b(digest_size=16)
+    digest.update(repr(tuple(maze.shape)).encode())
+
+    for row in range(0, maze.shape[0], CHUNK_ROWS):
+        walls = np.asarray(maze[row : row + CHUNK_ROWS]) == 1
+        digest.update(np.packbits(walls, axis=1).tobytes())
+
+    return digest.hexdigest()
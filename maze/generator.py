@@ -1,11 +1,21 @@
-# Генератор случайного лабиринта с использованием алгоритма поиска в глубину
+# Генератор случайного лабиринта с использованием алгоритма поиска в глубину,
+# а также быстрые генераторы на основе алгоритмов Краскала и Эллера
 # Источник: http://en.wikipedia.org/wiki/Maze_generation_algorithm
 
 import random
+from typing import Iterator, Optional, Union
+
 import numpy as np
 
+from .packed import SUFFIX as PACKED_SUFFIX, load_packed, write_header
+
+# Зерно генератора: число, готовый np.random.Generator или None (случайное)
+Seed = Union[int, np.random.Generator, None]
+
 
-def generate(w: int = 10, h: int = 10, num_paths: int = 3) -> np.ndarray:
+def generate(
+    w: int = 10, h: int = 10, num_paths: int = 3, seed: Optional[int] = None
+) -> np.ndarray:
     """
     Генерирует случайный лабиринт с помощью алгоритма поиска в глубину с несколькими путями.
 
@@ -15,10 +25,15 @@ def generate(w: int = 10, h: int = 10, num_paths: int = 3) -> np.ndarray:
     :param h: высота лабиринта
     :type num_paths: int
     :param num_paths: количество путей в лабиринте
+    :type seed: int
+    :param seed: зерно генератора случайных чисел; по умолчанию используется
+                 общий генератор модуля random
     :return: сгенерированный лабиринт в виде матрицы NumPy,
              где 0 - путь, 1 - стена
     :rtype: numpy 2D array
     """
+    rng = random if seed is None else random.Random(seed)
+
     maze = [[1 for _ in range(w)] for _ in range(h)]  # Все ячейки — стены
 
     # Направления движения: вверх, вправо, вниз, влево
@@ -32,7 +47,7 @@ def generate(w: int = 10, h: int = 10, num_paths: int = 3) -> np.ndarray:
 
         while stack:
             x, y = stack[-1]
-            directions = random.sample(range(4), 4)  # Случайный порядок направлений
+            directions = rng.sample(range(4), 4)  # Случайный порядок направлений
 
             for i in directions:
                 nx, ny = x + dx[i], y + dy[i]
@@ -54,7 +69,7 @@ def generate(w: int = 10, h: int = 10, num_paths: int = 3) -> np.ndarray:
 
     # Генерируем несколько путей
     for _ in range(num_paths):
-        cx, cy = random.randint(0, w - 1), random.randint(0, h - 1)
+        cx, cy = rng.randint(0, w - 1), rng.randint(0, h - 1)
         carve_path(cx, cy)
 
     # Преобразуем список в массив NumPy для удобства работы
@@ -67,6 +82,211 @@ def generate(w: int = 10, h: int = 10, num_paths: int = 3) -> np.ndarray:
     return maze  # Возвращаем сгенерированный лабиринт
 
 
+def generate_kruskal(
+    w: int = 10, h: int = 10, braid: float = 0.0, seed: Seed = None
+) -> np.ndarray:
+    """
+    Быстро генерирует лабиринт алгоритмом Краскала.
+
+    Клетки с чётными координатами образуют решётку; между соседними клетками
+    решётки случайно взвешиваются стены, а проходы прокладываются по рёбрам
+    минимального остовного дерева, которое строит SciPy. Поэтому лабиринт
+    строится без цикла Python по клеткам.
+
+    :type w: int
+    :param w: ширина лабиринта
+    :type h: int
+    :param h: высота лабиринта
+    :type braid: float
+    :param braid: вероятность дополнительно открыть стену вне дерева
+                  (0 - ровно один путь между любыми клетками)
+    :param seed: зерно или генератор np.random.Generator
+    :return: лабиринт в виде матрицы uint8, где 0 - путь, 1 - стена
+    :rtype: numpy 2D array
+    """
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import minimum_spanning_tree
+
+    rng = np.random.default_rng(seed)
+
+    # Размеры решётки клеток
+    width, height = (w + 1) // 2, (h + 1) // 2
+    nodes = np.arange(width * height).reshape(height, width)
+
+    # Рёбра решётки: горизонтальные, затем вертикальные
+    sources = np.concatenate((nodes[:, :-1].ravel(), nodes[:-1, :].ravel()))
+    targets = np.concatenate((nodes[:, 1:].ravel(), nodes[1:, :].ravel()))
+
+    # Нулевой вес SciPy считает отсутствием ребра, поэтому веса из (0, 1]
+    weights = 1.0 - rng.random(len(sources))
+    graph = csr_matrix((weights, (sources, targets)), shape=(nodes.size, nodes.size))
+
+    tree = minimum_spanning_tree(graph).tocoo()
+    opened = [np.minimum(tree.row, tree.col), np.maximum(tree.row, tree.col)]
+
+    if braid > 0:
+        extra = rng.random(len(sources)) < braid
+        opened[0] = np.concatenate((opened[0], sources[extra]))
+        opened[1] = np.concatenate((opened[1], targets[extra]))
+
+    maze = np.ones((h, w), dtype=np.uint8)
+    maze[::2, ::2] = 0
+
+    # Стена между клетками решётки лежит посередине между ними
+    first_row, first_col = np.divmod(opened[0], width)
+    second_row, second_col = np.divmod(opened[1], width)
+    maze[first_row + second_row, first_col + second_col] = 0
+
+    open_goal(maze[-1], w)
+
+    return maze
+
+
+def open_goal(row: np.ndarray, w: int):
+    """
+    Соединяет правую нижнюю клетку с ближайшей клеткой решётки.
+
+    При чётных размерах последняя строка или столбец лабиринта лежат вне
+    решётки, поэтому целевая клетка соединяется с ней коротким проходом.
+
+    :type row: numpy 1D array
+    :param row: последняя строка лабиринта
+    :type w: int
+    :param w: ширина лабиринта
+    """
+    row[2 * ((w - 1) // 2) :] = 0
+
+
+def eller_rows(
+    w: int = 10, h: int = 10, braid: float = 0.0, seed: Seed = None
+) -> Iterator[np.ndarray]:
+    """
+    Генерирует лабиринт построчно алгоритмом Эллера.
+
+    Хранится только текущая строка клеток и номера множеств, к которым они
+    принадлежат, поэтому память не зависит от высоты лабиринта.
+
+    :type w: int
+    :param w: ширина лабиринта
+    :type h: int
+    :param h: высота лабиринта
+    :type braid: float
+    :param braid: вероятность открыть стену между клетками одного множества
+                  (0 - ровно один путь между любыми клетками)
+    :param seed: зерно или генератор np.random.Generator
+    :return: строки лабиринта в виде массивов uint8, где 0 - путь, 1 - стена
+    :rtype: Iterator[numpy 1D array]
+    """
+    rng = np.random.default_rng(seed)
+
+    width, height = (w + 1) // 2, (h + 1) // 2
+    labels = np.arange(width)  # Множество каждой клетки текущей строки
+    next_label = width
+
+    for lattice_row in range(height):
+        final = lattice_row == height - 1
+
+        joins = rng.random(width - 1) < 0.5
+        loops = rng.random(width - 1) < braid
+
+        # Объединение множеств текущей строки (система непересекающихся множеств)
+        parent = {}
+
+        def find(label: int) -> int:
+            root = label
+            while root in parent:
+                root = parent[root]
+            while label != root:
+                parent[label], label = root, parent[label]
+            return root
+
+        row = np.ones(w, dtype=np.uint8)
+        row[::2] = 0
+
+        current = labels.tolist()
+        for i in range(width - 1):
+            first, second = find(current[i]), find(current[i + 1])
+
+            # В последней строке объединяются все различные множества
+            if first != second and (final or joins[i]):
+                parent[second] = first
+                row[2 * i + 1] = 0
+            elif first == second and loops[i]:
+                row[2 * i + 1] = 0
+
+        labels = np.array([find(label) for label in current])
+
+        if final and h % 2:
+            open_goal(row, w)
+
+        yield row
+
+        if 2 * lattice_row + 1 == h:
+            break
+
+        row = np.ones(w, dtype=np.uint8)
+
+        if final:
+            # Лишняя строка при чётной высоте: проход к целевой клетке
+            open_goal(row, w)
+            yield row
+            break
+
+        # Каждое множество продолжается вниз хотя бы одной клеткой
+        down = rng.random(width) < 0.5
+        order = np.lexsort((rng.random(width), labels))
+        ordered = labels[order]
+        down[order[np.r_[True, ordered[1:] != ordered[:-1]]]] = True
+
+        row[::2][down] = 0
+        yield row
+
+        # Клетки без прохода вниз начинают новые множества
+        fresh = np.count_nonzero(~down)
+        labels[~down] = np.arange(next_label, next_label + fresh)
+        next_label += fresh
+
+
+def generate_eller(
+    filename: str,
+    w: int = 10,
+    h: int = 10,
+    braid: float = 0.0,
+    seed: Seed = None,
+):
+    """
+    Генерирует лабиринт алгоритмом Эллера и записывает его в файл по мере
+    построения строк, не держа лабиринт в памяти целиком.
+
+    Формат определяется расширением: .bits - упакованный формат,
+    иначе .npy с элементами uint8.
+
+    :type filename: string
+    :param filename: имя файла
+    :type w: int
+    :param w: ширина лабиринта
+    :type h: int
+    :param h: высота лабиринта
+    :type braid: float
+    :param braid: вероятность открыть стену между клетками одного множества
+    :param seed: зерно или генератор np.random.Generator
+    """
+    with open(filename, "wb") as file:
+        if filename.endswith(PACKED_SUFFIX):
+            write_header(file, (h, w))
+            for row in eller_rows(w, h, braid, seed):
+                file.write(np.packbits(row).tobytes())
+        else:
+            header = {
+                "descr": np.lib.format.dtype_to_descr(np.dtype(np.uint8)),
+                "fortran_order": False,
+                "shape": (h, w),
+            }
+            np.lib.format.write_array_header_1_0(file, header)
+            for row in eller_rows(w, h, braid, seed):
+                file.write(row.tobytes())
+
+
 def save(maze: np.ndarray, filename: str):
     """
     Сохраняет лабиринт в файл filename.
@@ -79,23 +299,34 @@ def save(maze: np.ndarray, filename: str):
     np.save(filename, maze)
 
 
-def load(filename: str) -> np.ndarray:
+def load(filename: str, mmap_mode: str = None) -> np.ndarray:
     """
     Загружает лабиринт из файла filename.
 
     :type filename: string
     :param filename: имя файла, из которого будет загружен лабиринт
-    :return: лабиринт в виде матрицы NumPy
+    :type mmap_mode: string
+    :param mmap_mode: режим отображения файла в память (например, "r");
+                      по умолчанию файл читается целиком
+    :return: лабиринт в виде матрицы NumPy; файлы упакованного формата
+             (.bits) всегда отображаются в память как PackedMaze
     :rtype: numpy 2D array
     """
-    return np.load(filename)
+    if filename.endswith(PACKED_SUFFIX):
+        return load_packed(filename)
+
+    return np.load(filename, mmap_mode=mmap_mode)
 
 
 if __name__ == "__main__":
     w, h = map(int, input("Введите ширину и высоту лабиринта: ").split())
-    num_paths = int(input("Введите количество путей: "))
+    algorithm = input("Выберите алгоритм (dfs, kruskal, eller): ") or "dfs"
     filename = input("Введите имя файла: ")
 
-    maze = generate(w, h, num_paths)
-
-    save(maze, filename)
+    if algorithm == "dfs":
+        num_paths = int(input("Введите количество путей: "))
+        save(generate(w, h, num_paths), filename)
+    elif algorithm == "kruskal":
+        save(generate_kruskal(w, h), filename)
+    else:
+        generate_eller(filename, w, h)
@@ -0,0 +1,60 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from scipy.sparse import csr_matrix
+
+
+def adjacency(maze: np.ndarray) -> "csr_matrix":
+    """
+    Строит разреженную матрицу смежности лабиринта.
+
+    Вершины графа - клетки лабиринта, пронумерованные как row * w + col,
+    рёбра соединяют соседние по горизонтали и вертикали проходимые клетки.
+
+    :param maze: матрица, представляющая лабиринт (0 - путь, 1 - стена)
+    :type maze: numpy 2D array
+    :return: симметричная матрица смежности в формате CSR
+    :rtype: scipy.sparse.csr_matrix
+    """
+    h, w = maze.shape
+    free = np.asarray(maze) != 1
+    ids = np.arange(h * w).reshape(h, w)
+
+    # Рёбра вправо и вниз между соседними проходимыми клетками
+    right = ids[:, :-1][free[:, :-1] & free[:, 1:]]
+    down = ids[:-1, :][free[:-1, :] & free[1:, :]]
+
+    src = np.concatenate([right, down])
+    dst = np.concatenate([right + 1, down + w])
+
+    # Делаем граф неориентированным
+    rows = np.concatenate([src, dst])
+    cols = np.concatenate([dst, src])
+    data = np.ones(len(rows), dtype=np.int8)
+
+    from scipy.sparse import csr_matrix
+
+    return csr_matrix((data, (rows, cols)), shape=(h * w, h * w))
+
+
+def actions_from_nodes(nodes: np.ndarray, w: int) -> list:
+    """
+    Переводит последовательность вершин графа в список действий.
+
+    :param nodes: вершины пути от начальной до целевой
+    :type nodes: numpy 1D array
+    :param w: ширина лабиринта
+    :type w: int
+    :return: список действий (0-3)
+    :rtype: list
+    """
+    steps = np.diff(nodes)
+
+    # Смещения индексов соответствуют action_map: 0 - (0, 1), 1 - (1, 0),
+    # 2 - (-1, 0), 3 - (0, -1)
+    actions = np.select(
+        [steps == 1, steps == w, steps == -w], [0, 1, 2], default=3
+    )
+    return actions.tolist()
@@ -0,0 +1,133 @@
+from typing import Iterable, List, Union
+
+import numpy as np
+
+# Число строк лабиринта, читаемых за раз при построении сетки
+CHUNK_ROWS = 4096
+
+
+class Grid:
+    def __init__(self, maze: np.ndarray):
+        """
+        Создаёт компактное представление лабиринта для решателей.
+
+        Лабиринт окружается рамкой из стен, а клетки нумеруются плоскими
+        целочисленными индексами, поэтому проверка границ сводится к
+        проверке стены, а соседи получаются сложением со смещением.
+
+        Матрица читается частями по строкам, поэтому лабиринт, отображённый
+        в память (np.load с mmap_mode или PackedMaze), не распаковывается
+        целиком.
+
+        :param maze: матрица, представляющая лабиринт (0 - путь, 1 - стена)
+        :type maze: numpy 2D array
+        """
+        self.shape = maze.shape
+        self.stride = maze.shape[1] + 2  # Ширина строки с учётом рамки
+        self.size = (maze.shape[0] + 2) * self.stride
+
+        padded = np.ones((maze.shape[0] + 2, self.stride), dtype=np.uint8)
+        for row in range(0, maze.shape[0], CHUNK_ROWS):
+            rows = np.asarray(maze[row : row + CHUNK_ROWS])
+            padded[row + 1 : row + 1 + len(rows), 1:-1] = rows == 1
+
+        # Стены в виде байтового массива: индексация быстрее, чем у NumPy
+        self.walls = bytearray(padded.tobytes())
+
+        # Смещения индексов, соответствующие действиям из action_map
+        self.offsets = (1, self.stride, -self.stride, -1)
+
+    def index(self, position: np.ndarray) -> int:
+        """
+        Переводит координаты клетки в плоский индекс.
+
+        :param position: координаты клетки
+        :type position: numpy 1D array
+        :return: индекс клетки
+        :rtype: int
+        """
+        return (int(position[0]) + 1) * self.stride + int(position[1]) + 1
+
+    def position(self, index: int) -> np.ndarray:
+        """
+        Переводит плоский индекс в координаты клетки.
+
+        :param index: индекс клетки
+        :type index: int
+        :return: координаты клетки
+        :rtype: numpy 1D array
+        """
+        row, col = divmod(index, self.stride)
+        return np.array([row - 1, col - 1])
+
+    def visited(self) -> bytearray:
+        """
+        Создаёт пустую битовую карту посещённых клеток.
+
+        :return: массив, где 1 - клетка посещена
+        :rtype: bytearray
+        """
+        return bytearray(self.size)
+
+    def predecessors(self) -> bytearray:
+        """
+        Создаёт пустое хранилище предшественников.
+
+        Для каждой клетки хранится действие, которым она была достигнута,
+        поэтому предшественник восстанавливается вычитанием смещения.
+
+        :return: массив действий, индексированный клетками
+        :rtype: bytearray
+        """
+        return bytearray(self.size)
+
+    def nearest(
+        self, cells: Union[bytearray, Iterable[int]], goal: int, default: int
+    ) -> int:
+        """
+        Находит клетку, ближайшую к клетке goal по манхэттенскому расстоянию.
+
+        :param cells: битовая карта клеток (как у visited) или индексы клеток
+        :param goal: индекс целевой клетки
+        :type goal: int
+        :param default: клетка, возвращаемая, если клеток нет
+        :type default: int
+        :return: индекс ближайшей клетки
+        :rtype: int
+        """
+        if isinstance(cells, bytearray):
+            index = np.flatnonzero(np.frombuffer(cells, dtype=np.uint8))
+        else:
+            index = np.fromiter(cells, dtype=np.int64)
+
+        if not index.size:
+            return default
+
+        rows, cols = np.divmod(index, self.stride)
+        goal_row, goal_col = divmod(goal, self.stride)
+        return int(index[np.argmin(abs(rows - goal_row) + abs(cols - goal_col))])
+
+    def path(self, came_from: bytearray, cell: int, start: int) -> List[int]:
+        """
+        Восстанавливает путь действий от клетки start до клетки cell.
+
+        :param came_from: хранилище предшественников
+        :type came_from: bytearray
+        :param cell: конечная клетка пути
+        :type cell: int
+        :param start: начальная клетка пути
+        :type start: int
+        :return: список действий
+        :rtype: List[int]
+        """
+        offsets = self.offsets
+        actions = []
+
+        while cell != start:
+            action = came_from[cell]
+            actions.append(action)
+            cell -= offsets[action]
+
+        actions.reverse()
+        return actions
+
@@ -0,0 +1,294 @@
+import os
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .fingerprint import fingerprint
+from .grid import Grid
+
+# Размер кластера по умолчанию (в клетках по каждой оси)
+CLUSTER_SIZE = 16
+
+# Проходы на границе кластеров длиннее этого порога получают два входа
+# (по краям), короче - один (посередине)
+WIDE_ENTRANCE = 6
+
+
+class Hierarchy:
+    def __init__(
+        self,
+        grid: Grid,
+        cluster: int,
+        edges: Dict[int, List[Tuple[int, int]]],
+        maze_fingerprint: Optional[str] = None,
+    ):
+        """
+        Создаёт абстракцию лабиринта для иерархического поиска (HPA*).
+
+        Лабиринт разбивается на квадратные кластеры; вершинами абстрактного
+        графа служат входы - клетки по обе стороны проходов через границы
+        кластеров. Соседние входы разных кластеров соединены рёбрами длины 1,
+        входы одного кластера - рёбрами, длина которых равна кратчайшему
+        пути внутри кластера.
+
+        :param grid: компактное представление лабиринта
+        :type grid: Grid
+        :param cluster: размер кластера
+        :type cluster: int
+        :param edges: карта: вход -> список (соседний вход, длина)
+        :type edges: Dict[int, List[Tuple[int, int]]]
+        :param maze_fingerprint: отпечаток лабиринта (см. maze.fingerprint)
+        :type maze_fingerprint: string
+        """
+        self.grid = grid
+        self.cluster = cluster
+        self.edges = edges
+        self.fingerprint = maze_fingerprint
+
+    @classmethod
+    def build(cls, maze: np.ndarray, cluster: int = CLUSTER_SIZE) -> "Hierarchy":
+        """
+        Находит входы кластеров и вычисляет расстояния между входами
+        внутри каждого кластера.
+
+        :param maze: матрица, представляющая лабиринт (0 - путь, 1 - стена)
+        :type maze: numpy 2D array
+        :param cluster: размер кластера
+        :type cluster: int
+        :return: абстракция лабиринта
+        :rtype: Hierarchy
+        """
+        grid = Grid(maze)
+        h, w = grid.shape
+        stride = grid.stride
+
+        free = np.frombuffer(bytes(grid.walls), dtype=np.uint8).reshape(-1, stride)
+        free = free == 0
+
+        edges: Dict[int, List[Tuple[int, int]]] = {}
+
+        def connect(first: int, second: int, cost: int):
+            edges.setdefault(first, []).append((second, cost))
+            edges.setdefault(second, []).append((first, cost))
+
+        def entrances(passable: np.ndarray) -> List[int]:
+            """Выбирает входы в каждом проходе вдоль границы."""
+            result = []
+            padded = np.concatenate(([False], passable, [False]))
+            bounds = np.flatnonzero(padded[1:] != padded[:-1]).reshape(-1, 2)
+
+            for begin, end in bounds.tolist():
+                if end - begin >= WIDE_ENTRANCE:
+                    result += [begin, end - 1]
+                else:
+                    result.append((begin + end - 1) // 2)
+
+            return result
+
+        # Входы на вертикальных границах: клетки слева и справа от границы
+        for col in range(cluster, w, cluster):
+            for row in range(0, h, cluster):
+                rows = slice(row + 1, min(row + cluster, h) + 1)
+                passable = free[rows, col] & free[rows, col + 1]
+
+                for offset in entrances(passable):
+                    cell = (row + 1 + offset) * stride + col
+                    connect(cell, cell + 1, 1)
+
+        # Входы на горизонтальных границах: клетки сверху и снизу от границы
+        for row in range(cluster, h, cluster):
+            for col in range(0, w, cluster):
+                cols = slice(col + 1, min(col + cluster, w) + 1)
+                passable = free[row, cols] & free[row + 1, cols]
+
+                for offset in entrances(passable):
+                    cell = row * stride + col + 1 + offset
+                    connect(cell, cell + stride, 1)
+
+        hierarchy = cls(grid, cluster, edges, fingerprint(maze))
+
+        # Группируем входы по кластерам
+        members: Dict[Tuple[int, int], List[int]] = {}
+        for cell in edges:
+            members.setdefault(hierarchy.cluster_of(cell), []).append(cell)
+
+        # Расстояния между входами одного кластера
+        for cells in members.values():
+            for index, cell in enumerate(cells[:-1]):
+                distances, _ = hierarchy.explore(cell)
+
+                for other in cells[index + 1 :]:
+                    if other in distances:
+                        connect(cell, other, distances[other])
+
+        return hierarchy
+
+    def cluster_of(self, cell: int) -> Tuple[int, int]:
+        """
+        Определяет кластер, в котором лежит клетка.
+
+        :param cell: индекс клетки
+        :type cell: int
+        :return: номер кластера по строкам и по столбцам
+        :rtype: Tuple[int, int]
+        """
+        row, col = divmod(cell, self.grid.stride)
+        return (row - 1) // self.cluster, (col - 1) // self.cluster
+
+    def explore(
+        self, cell: int, target: Optional[int] = None
+    ) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """
+        Выполняет поиск в ширину от клетки cell, не выходя за её кластер.
+
+        :param cell: начальная клетка
+        :type cell: int
+        :param target: клетка, при достижении которой поиск завершается
+        :type target: int
+        :return: расстояния до достигнутых клеток и действия, которыми
+                 они достигнуты
+        :rtype: Tuple[Dict[int, int], Dict[int, int]]
+        """
+        walls = self.grid.walls
+        offsets = self.grid.offsets
+        stride = self.grid.stride
+
+        # Границы кластера в индексах сетки с рамкой
+        block_row, block_col = self.cluster_of(cell)
+        top = block_row * self.cluster + 1
+        left = block_col * self.cluster + 1
+        bottom = top + self.cluster
+        right = left + self.cluster
+
+        distances = {cell: 0}
+        came_from = {}
+        queue = deque([cell])
+
+        while queue:
+            current = queue.popleft()
+            if current == target:
+                break
+
+            depth = distances[current] + 1
+
+            for action in range(4):
+                next_cell = current + offsets[action]
+                if walls[next_cell] or next_cell in distances:
+                    continue
+
+                row, col = divmod(next_cell, stride)
+                if top <= row < bottom and left <= col < right:
+                    distances[next_cell] = depth
+                    came_from[next_cell] = action
+                    queue.append(next_cell)
+
+        return distances, came_from
+
+    def refine(self, cell: int, target: int) -> List[int]:
+        """
+        Восстанавливает действия кратчайшего пути между двумя клетками
+        одного кластера или соседними клетками соседних кластеров.
+
+        :param cell: начальная клетка
+        :type cell: int
+        :param target: конечная клетка
+        :type target: int
+        :return: список действий
+        :rtype: List[int]
+        """
+        offsets = self.grid.offsets
+
+        if self.cluster_of(cell) != self.cluster_of(target):
+            return [offsets.index(target - cell)]
+
+        _, came_from = self.explore(cell, target)
+
+        actions = []
+        while target != cell:
+            action = came_from[target]
+            actions.append(action)
+            target -= offsets[action]
+
+        actions.reverse()
+        return actions
+
+    def save(self, filename: str):
+        """
+        Сохраняет абстракцию в файл filename (формат .npz).
+
+        :type filename: string
+        :param filename: имя файла, в который будет сохранена абстракция
+        """
+        edges = np.array(
+            [
+                (cell, other, cost)
+                for cell, links in self.edges.items()
+                for other, cost in links
+                if cell < other
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 3)
+
+        np.savez(
+            filename,
+            shape=np.array(self.grid.shape),
+            cluster=self.cluster,
+            edges=edges,
+            fingerprint=np.array(self.fingerprint or ""),
+        )
+
+    @classmethod
+    def load(cls, filename: str, maze: np.ndarray) -> "Hierarchy":
+        """
+        Загружает абстракцию лабиринта maze из файла filename; файл
+        принимается, только если его отпечаток совпадает с отпечатком maze.
+
+        :type filename: string
+        :param filename: имя файла, из которого будет загружена абстракция
+        :param maze: матрица, представляющая лабиринт
+        :type maze: numpy 2D array
+        :return: абстракция лабиринта
+        :rtype: Hierarchy
+        :raises ValueError: если файл построен для другого лабиринта (или
+                            сохранён без отпечатка)
+        """
+        with np.load(filename) as data:
+            stored = str(data["fingerprint"]) if "fingerprint" in data else ""
+            if tuple(data["shape"]) != tuple(maze.shape):
+                raise ValueError(f"{filename} does not match the maze shape")
+            if stored != fingerprint(maze):
+                raise ValueError(f"{filename} was built for a different maze")
+
+            cluster = int(data["cluster"])
+            rows = data["edges"].tolist()
+
+        edges: Dict[int, List[Tuple[int, int]]] = {}
+        for cell, other, cost in rows:
+            edges.setdefault(cell, []).append((other, cost))
+            edges.setdefault(other, []).append((cell, cost))
+
+        return cls(Grid(maze), cluster, edges, stored)
+
+
+def hierarchy_filename(maze_filename: str) -> str:
+    """
+    Возвращает имя файла абстракции, хранящегося рядом с файлом лабиринта.
+
+    :type maze_filename: string
+    :param maze_filename: имя файла лабиринта (.npy или .bits)
+    :return: имя файла абстракции (.hierarchy.npz)
+    :rtype: string
+    """
+    return os.path.splitext(maze_filename)[0] + ".hierarchy.npz"
+
+
+if __name__ == "__main__":
+    from .generator import load
+
+    filename = input("Введите имя файла лабиринта: ")
+    cluster = int(input("Введите размер кластера: "))
+
+    hierarchy = Hierarchy.build(load(filename), cluster)
+
+    hierarchy.save(hierarchy_filename(filename))
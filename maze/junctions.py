@@ -0,0 +1,158 @@
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from .grid import Grid
+
+
+class JunctionGraph:
+    def __init__(self, grid: Grid):
+        """
+        Сжимает лабиринт во взвешенный граф развилок.
+
+        Ключевыми считаются проходимые клетки, у которых число проходимых
+        соседей не равно двум: развилки и тупики. Каждый коридор между
+        ключевыми клетками заменяется одним ребром, вес которого равен
+        длине коридора. Для ребра хранится только первое действие:
+        остальные восстанавливаются повторным проходом по коридору.
+
+        :param grid: компактное представление лабиринта
+        :type grid: Grid
+        """
+        self.grid = grid
+
+        free = np.frombuffer(bytes(grid.walls), dtype=np.uint8) == 0
+
+        # Число проходимых соседей каждой клетки; рамка из стен
+        # гарантирует, что сдвиги не переходят через край строки
+        degree = np.zeros(grid.size, dtype=np.uint8)
+        for offset in grid.offsets:
+            if offset > 0:
+                degree[:-offset] += free[offset:]
+            else:
+                degree[-offset:] += free[:offset]
+
+        self.keys = bytearray((free & (degree != 2)).astype(np.uint8).tobytes())
+
+        # Карта: ключевая клетка -> список (соседняя ключевая клетка, длина,
+        # первое действие)
+        self.edges: Dict[int, List[Tuple[int, int, int]]] = {}
+
+        walls = grid.walls
+        keys = np.flatnonzero(free & (degree != 2)).tolist()
+
+        for cell in keys:
+            self.edges[cell] = []
+
+        # Каждый коридор проходится один раз: обратное ребро получается
+        # обращением последнего действия
+        walked = set()
+        for cell in keys:
+            for action, offset in enumerate(grid.offsets):
+                if walls[cell + offset] or (cell, action) in walked:
+                    continue
+
+                end, cost, last_action = self.walk(cell, action)
+
+                self.edges[cell].append((end, cost, action))
+                if (end, 3 - last_action) != (cell, action):
+                    self.edges[end].append((cell, cost, 3 - last_action))
+                walked.add((end, 3 - last_action))
+
+    def walk(
+        self, cell: int, action: int, stops: Iterable[int] = ()
+    ) -> Tuple[int, int, int]:
+        """
+        Проходит коридор от клетки cell, начиная с действия action, до
+        ближайшей ключевой клетки или клетки из stops.
+
+        :param cell: клетка, из которой начинается проход
+        :type cell: int
+        :param action: первое действие
+        :type action: int
+        :param stops: дополнительные клетки, на которых проход завершается
+        :type stops: Iterable[int]
+        :return: конечная клетка, длина коридора и последнее действие
+        :rtype: Tuple[int, int, int]
+        """
+        walls = self.grid.walls
+        offsets = self.grid.offsets
+        keys = self.keys
+        stops = set(stops)
+
+        current = cell + offsets[action]
+        cost = 1
+
+        while not keys[current] and current not in stops:
+            # В коридоре ровно одно продолжение, кроме обратного действия
+            for next_action in range(4):
+                if (
+                    next_action != 3 - action
+                    and not walls[current + offsets[next_action]]
+                ):
+                    action = next_action
+                    break
+
+            current += offsets[action]
+            cost += 1
+
+        return current, cost, action
+
+    def corridor(self, cell: int, action: int, cost: int) -> List[int]:
+        """
+        Восстанавливает действия вдоль коридора заданной длины.
+
+        :param cell: клетка, из которой начинается коридор
+        :type cell: int
+        :param action: первое действие
+        :type action: int
+        :param cost: длина коридора
+        :type cost: int
+        :return: список действий
+        :rtype: List[int]
+        """
+        walls = self.grid.walls
+        offsets = self.grid.offsets
+
+        actions = [action]
+        current = cell + offsets[action]
+
+        for _ in range(cost - 1):
+            for next_action in range(4):
+                if (
+                    next_action != 3 - action
+                    and not walls[current + offsets[next_action]]
+                ):
+                    action = next_action
+                    break
+
+            actions.append(action)
+            current += offsets[action]
+
+        return actions
+
+    def attach(
+        self, cell: int, stops: Iterable[int] = ()
+    ) -> List[Tuple[int, int, int, int]]:
+        """
+        Находит рёбра, соединяющие произвольную клетку с графом развилок.
+
+        :param cell: клетка (например, старт или цель внутри коридора)
+        :type cell: int
+        :param stops: дополнительные клетки, на которых проход завершается
+        :type stops: Iterable[int]
+        :return: список (конечная клетка, длина, первое действие, последнее действие)
+        :rtype: List[Tuple[int, int, int, int]]
+        """
+        walls = self.grid.walls
+        offsets = self.grid.offsets
+
+        # Сама клетка тоже останавливает проход, если коридор замкнут в кольцо
+        stops = set(stops) | {cell}
+
+        return [
+            (end, cost, action, last_action)
+            for action in range(4)
+            if not walls[cell + offsets[action]]
+            for end, cost, last_action in [self.walk(cell, action, stops)]
+        ]
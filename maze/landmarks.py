@@ -0,0 +1,240 @@
+import os
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from .fingerprint import fingerprint
+from .graph import adjacency
+
+# Число строк сетки, оценки которых вычисляются за раз
+BOUND_ROWS = 32
+
+
+class Landmarks:
+    def __init__(
+        self,
+        cells: np.ndarray,
+        distances: np.ndarray,
+        maze_fingerprint: Optional[str] = None,
+    ):
+        """
+        Создаёт набор ориентиров (landmarks) для эвристики ALT.
+
+        :param cells: координаты ориентиров, массив формы (K, 2)
+        :type cells: numpy 2D array
+        :param distances: расстояния от каждого ориентира до каждой клетки,
+                          массив формы (K, h, w); недостижимые клетки помечены
+                          максимальным значением типа
+        :type distances: numpy 3D array
+        :param maze_fingerprint: отпечаток лабиринта, для которого вычислены
+                                 расстояния (см. maze.fingerprint)
+        :type maze_fingerprint: string
+        """
+        self.cells = cells
+        self.distances = distances
+        self.fingerprint = maze_fingerprint
+
+    @classmethod
+    def build(cls, maze: np.ndarray, k: int = 8) -> "Landmarks":
+        """
+        Выбирает k ориентиров методом самой удалённой точки и вычисляет
+        поля расстояний от них.
+
+        Следующим ориентиром становится проходимая клетка, наиболее удалённая
+        от уже выбранных; клетки других компонент связности считаются
+        бесконечно удалёнными, поэтому ориентиры попадают и в них.
+
+        :param maze: матрица, представляющая лабиринт (0 - путь, 1 - стена)
+        :type maze: numpy 2D array
+        :param k: число ориентиров
+        :type k: int
+        :return: набор ориентиров
+        :rtype: Landmarks
+        """
+        from scipy.sparse.csgraph import shortest_path
+
+        graph = adjacency(maze)
+        free = np.flatnonzero(np.asarray(maze).ravel() != 1)
+
+        def field(cell: int) -> np.ndarray:
+            return shortest_path(graph, directed=False, unweighted=True, indices=cell)
+
+        # Первый ориентир - клетка, наиболее удалённая от произвольной
+        initial = field(free[0])[free]
+        initial[np.isinf(initial)] = -1
+        cell = free[np.argmax(initial)]
+
+        cells, fields = [], []
+        nearest = np.full(len(free), np.inf)
+
+        for _ in range(min(k, len(free))):
+            distances = field(cell)
+            cells.append(cell)
+            fields.append(distances)
+
+            nearest = np.minimum(nearest, distances[free])
+            if not nearest.max() > 0:
+                break  # Все проходимые клетки уже стали ориентирами
+
+            cell = free[np.argmax(nearest)]
+
+        fields = np.array(fields)
+        reachable = np.isfinite(fields)
+
+        # Выбираем самый компактный беззнаковый тип, вмещающий расстояния
+        dtype = np.min_scalar_type(int(fields[reachable].max()) + 1)
+        compact = np.full(fields.shape, np.iinfo(dtype).max, dtype=dtype)
+        compact[reachable] = fields[reachable]
+
+        h, w = maze.shape
+        return cls(
+            np.column_stack(np.divmod(np.array(cells), w)),
+            compact.reshape(len(cells), h, w),
+            fingerprint(maze),
+        )
+
+    def bound(
+        self, goal: np.ndarray, start: int = 0, stop: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Вычисляет нижние оценки расстояния от клеток строк [start, stop) до
+        цели по неравенству треугольника: |d(L, n) - d(L, goal)| <= d(n, goal).
+
+        :param goal: координаты цели
+        :type goal: numpy 1D array
+        :param start: первая строка
+        :type start: int
+        :param stop: строка после последней (None - до конца лабиринта)
+        :type stop: int
+        :return: матрица нижних оценок строк; клетки, из которых цель
+                 недостижима, получают оценку, превышающую длину любого пути
+        :rtype: numpy 2D array
+        """
+        unreachable = np.iinfo(self.distances.dtype).max
+        infinity = self.distances[0].size + 1
+
+        fields = self.distances[:, start:stop]
+        result = np.zeros(fields.shape[1:], dtype=np.int64)
+
+        for field, to_goal in zip(fields, self.distances[:, goal[0], goal[1]]):
+            to_goal = int(to_goal)
+            missing = field == unreachable
+
+            if to_goal == unreachable:
+                # Цель вне компоненты ориентира: из его компоненты она недостижима
+                estimate = np.where(missing, 0, infinity)
+            else:
+                estimate = np.where(
+                    missing, infinity, np.abs(field.astype(np.int64) - to_goal)
+                )
+
+            np.maximum(result, estimate, out=result)
+
+        return result
+
+    def heuristic(self, goal: np.ndarray) -> Callable[[int], int]:
+        """
+        Готовит эвристику для решателей, работающих с Grid: максимум оценки
+        ALT и манхэттенского расстояния до цели для клетки в плоской
+        нумерации сетки с рамкой.
+
+        Оценки вычисляются полосами по BOUND_ROWS строк при первом обращении
+        к клетке полосы, поэтому запрос стоит пропорционально области,
+        затронутой поиском, а не площади лабиринта.
+
+        :param goal: координаты цели
+        :type goal: numpy 1D array
+        :return: функция: индекс клетки Grid -> нижняя оценка
+        :rtype: Callable[[int], int]
+        """
+        h, w = self.distances.shape[1:]
+        stride = w + 2
+        span = BOUND_ROWS * stride  # Клеток сетки в полосе
+        columns = np.abs(np.arange(w) - goal[1])
+
+        # Полосы строк сетки с рамкой; рамка получает нулевую оценку
+        bands: List[Optional[List[int]]] = [None] * -(-(h + 2) // BOUND_ROWS)
+
+        def band(index: int) -> List[int]:
+            first = index * BOUND_ROWS  # Первая строка полосы в сетке
+            start, stop = max(first - 1, 0), min(first + BOUND_ROWS - 1, h)
+
+            bounds = np.zeros((BOUND_ROWS, stride), dtype=np.int64)
+            if start < stop:
+                manhattan = np.abs(np.arange(start, stop) - goal[0])[:, None] + columns
+                bounds[start + 1 - first : stop + 1 - first, 1:-1] = np.maximum(
+                    self.bound(goal, start, stop), manhattan
+                )
+
+            bands[index] = bounds.ravel().tolist()
+            return bands[index]
+
+        def heuristic(cell: int) -> int:
+            index, offset = divmod(cell, span)
+            return (bands[index] or band(index))[offset]
+
+        return heuristic
+
+    def save(self, filename: str):
+        """
+        Сохраняет ориентиры в файл filename (формат .npz).
+
+        :type filename: string
+        :param filename: имя файла, в который будут сохранены ориентиры
+        """
+        np.savez(
+            filename,
+            cells=self.cells,
+            distances=self.distances,
+            fingerprint=np.array(self.fingerprint or ""),
+        )
+
+    @classmethod
+    def load(cls, filename: str, maze: np.ndarray) -> "Landmarks":
+        """
+        Загружает ориентиры лабиринта maze из файла filename.
+
+        Расстояния от ориентиров для другого лабиринта дают недопустимую
+        эвристику, и A* молча находит неоптимальный путь, поэтому файл
+        принимается, только если его отпечаток совпадает с отпечатком maze.
+
+        :type filename: string
+        :param filename: имя файла, из которого будут загружены ориентиры
+        :param maze: матрица, представляющая лабиринт
+        :type maze: numpy 2D array
+        :return: набор ориентиров
+        :rtype: Landmarks
+        :raises ValueError: если файл вычислен для другого лабиринта (или
+                            сохранён без отпечатка)
+        """
+        with np.load(filename) as data:
+            stored = str(data["fingerprint"]) if "fingerprint" in data else ""
+            if data["distances"].shape[1:] != tuple(maze.shape):
+                raise ValueError(f"{filename} does not match the maze shape")
+            if stored != fingerprint(maze):
+                raise ValueError(f"{filename} was built for a different maze")
+
+            return cls(data["cells"], data["distances"], stored)
+
+
+def landmarks_filename(maze_filename: str) -> str:
+    """
+    Возвращает имя файла ориентиров, хранящегося рядом с файлом лабиринта.
+
+    :type maze_filename: string
+    :param maze_filename: имя файла лабиринта (.npy или .bits)
+    :return: имя файла ориентиров (.landmarks.npz)
+    :rtype: string
+    """
+    return os.path.splitext(maze_filename)[0] + ".landmarks.npz"
+
+
+if __name__ == "__main__":
+    from .generator import load
+
+    filename = input("Введите имя файла лабиринта: ")
+    k = int(input("Введите количество ориентиров: "))
+
+    landmarks = Landmarks.build(load(filename), k)
+
+    landmarks.save(landmarks_filename(filename))
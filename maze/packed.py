@@ -0,0 +1,157 @@
+# Компактный формат хранения лабиринта: 1 бит на клетку
+#
+# Файл состоит из заголовка длиной HEADER_SIZE байт (сигнатура MAGIC,
+# высота и ширина как uint64 little-endian) и строк лабиринта, упакованных
+# np.packbits: каждая строка занимает ceil(w / 8) байт, 1 - стена.
+
+from typing import Tuple
+
+import numpy as np
+
+MAGIC = b"MAZEBIT1"
+HEADER_SIZE = len(MAGIC) + 16
+SUFFIX = ".bits"
+
+# Число строк, обрабатываемых за раз при упаковке и распаковке
+CHUNK_ROWS = 4096
+
+
+class PackedMaze:
+    def __init__(self, data: np.ndarray, shape: Tuple[int, int]):
+        """
+        Создаёт лабиринт, стены которого хранятся упакованными по битам.
+
+        Поддерживает чтение отдельных клеток (maze[row, col]) и строк
+        (maze[start:stop]) без распаковки всего лабиринта.
+
+        :param data: упакованные строки, массив uint8 формы (h, ceil(w / 8))
+        :type data: numpy 2D array
+        :param shape: размеры лабиринта (h, w)
+        :type shape: Tuple[int, int]
+        """
+        self.data = data
+        self.shape = shape
+        self.ndim = 2
+        self.dtype = np.dtype(np.uint8)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple) and len(key) == 2:
+            row, col = key
+
+            if all(isinstance(index, (int, np.integer)) for index in key):
+                # Одна клетка: достаём нужный бит из байта
+                col = int(col)
+                return int(self.data[row, col >> 3] >> (7 - (col & 7))) & 1
+
+            return self[row][..., col]
+
+        return np.unpackbits(self.data[key], axis=-1, count=self.shape[1])
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        maze = self[:]
+        return maze if dtype is None else maze.astype(dtype)
+
+
+def write_header(file, shape: Tuple[int, int]):
+    """
+    Записывает заголовок упакованного формата в открытый двоичный файл.
+
+    :param file: файл, открытый на запись в двоичном режиме
+    :param shape: размеры лабиринта (h, w)
+    :type shape: Tuple[int, int]
+    """
+    file.write(MAGIC)
+    file.write(np.array(shape, dtype="<u8").tobytes())
+
+
+def save_packed(maze: np.ndarray, filename: str):
+    """
+    Сохраняет лабиринт в упакованном формате.
+
+    Строки упаковываются частями, поэтому лабиринт, отображённый в память,
+    не загружается целиком.
+
+    :type maze: numpy 2D array
+    :param maze: лабиринт (0 - путь, 1 - стена)
+    :type filename: string
+    :param filename: имя файла
+    """
+    h, w = maze.shape
+
+    with open(filename, "wb") as file:
+        write_header(file, (h, w))
+
+        for row in range(0, h, CHUNK_ROWS):
+            rows = np.asarray(maze[row : row + CHUNK_ROWS])
+            file.write(np.packbits(rows == 1, axis=1).tobytes())
+
+
+def load_packed(filename: str) -> PackedMaze:
+    """
+    Открывает упакованный лабиринт, отображая файл в память только для чтения.
+
+    :type filename: string
+    :param filename: имя файла
+    :return: упакованный лабиринт
+    :rtype: PackedMaze
+    """
+    with open(filename, "rb") as file:
+        header = file.read(HEADER_SIZE)
+
+    if header[: len(MAGIC)] != MAGIC:
+        raise ValueError(f"{filename} is not a packed maze file")
+
+    h, w = map(int, np.frombuffer(header[len(MAGIC) :], dtype="<u8"))
+
+    data = np.memmap(
+        filename, dtype=np.uint8, mode="r", offset=HEADER_SIZE, shape=(h, (w + 7) // 8)
+    )
+
+    return PackedMaze(data, (h, w))
+
+
+def npy_to_packed(source: str, target: str):
+    """
+    Преобразует лабиринт из формата .npy в упакованный формат.
+
+    :type source: string
+    :param source: имя файла .npy
+    :type target: string
+    :param target: имя упакованного файла
+    """
+    save_packed(np.load(source, mmap_mode="r"), target)
+
+
+def packed_to_npy(source: str, target: str, dtype=np.int64):
+    """
+    Преобразует упакованный лабиринт в формат .npy.
+
+    :type source: string
+    :param source: имя упакованного файла
+    :type target: string
+    :param target: имя файла .npy
+    :param dtype: тип элементов матрицы
+    """
+    maze = load_packed(source)
+    h, _ = maze.shape
+
+    result = np.lib.format.open_memmap(target, mode="w+", dtype=dtype, shape=maze.shape)
+
+    for row in range(0, h, CHUNK_ROWS):
+        result[row : row + CHUNK_ROWS] = maze[row : row + CHUNK_ROWS]
+
+    result.flush()
+    del result
+
+
+if __name__ == "__main__":
+    source = input("Введите имя исходного файла: ")
+    target = input("Введите имя результирующего файла: ")
+
+    if source.endswith(SUFFIX):
+        packed_to_npy(source, target)
+    else:
+        npy_to_packed(source, target)
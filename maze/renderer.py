@@ -0,0 +1,329 @@
+# Воспроизведение решения: интерактивное (блиттинг) и без графического
+# интерфейса (запись кадров, GIF или MP4 прямо из массивов).
+# matplotlib загружается только при создании окна или записи кадров
+
+import os
+import re
+import subprocess
+from time import sleep
+from typing import Iterator, List
+
+import numpy as np
+
+from analyzer.trace import EXPAND, GENERATE, GOAL, SearchTrace
+
+from .environment import action_map
+
+# Цвета кадров при записи без графического интерфейса (RGB)
+WALL_COLOR = (0, 0, 0)
+FREE_COLOR = (255, 255, 255)
+TRAIL_COLOR = (255, 170, 170)
+ROBOT_COLOR = (255, 0, 0)
+GOAL_COLOR = (0, 0, 255)
+
+# Цвета событий поиска поверх лабиринта (RGBA); раскрытие перекрывает
+# порождение той же клетки
+EVENT_COLORS = {
+    GENERATE: (150, 230, 150, 200),
+    EXPAND: (140, 190, 255, 200),
+    GOAL: (0, 0, 255, 255),
+}
+
+# Через сколько кадров пройденный путь переносится в фон при блиттинге,
+# чтобы стоимость кадра не росла с длиной пути
+BAKE_FRAMES = 256
+
+
+def trajectory(position: np.ndarray, actions: List[int]) -> np.ndarray:
+    """
+    Вычисляет последовательность позиций робота.
+
+    :param position: координаты стартовой позиции
+    :type position: numpy 1D array
+    :param actions: список действий
+    :type actions: List[int]
+    :return: массив координат формы (len(actions) + 1, 2)
+    :rtype: numpy 2D array
+    """
+    moves = np.array([action_map[action] for action in range(4)])
+
+    steps = np.zeros((len(actions) + 1, 2), dtype=np.int64)
+    steps[0] = position
+    steps[1:] = moves[np.asarray(actions, dtype=np.int64)]
+
+    return np.cumsum(steps, axis=0)
+
+
+def frame_indices(length: int, step: int) -> List[int]:
+    """Номера позиций, показываемых в кадрах: каждая step-я и последняя."""
+    indices = list(range(0, length, step))
+    if indices[-1] != length - 1:
+        indices.append(length - 1)
+    return indices
+
+
+class ReplayRenderer:
+    def __init__(self, maze: np.ndarray, position: np.ndarray, goal: np.ndarray):
+        """
+        Создаёт окно воспроизведения: лабиринт рисуется один раз, а при
+        воспроизведении перерисовываются только робот и пройденный путь.
+        События поиска (SearchTrace) рисуются на отдельном прозрачном слое.
+
+        :param maze: матрица, представляющая лабиринт
+        :type maze: numpy 2D array
+        :param position: координаты стартовой позиции
+        :type position: numpy 1D array
+        :param goal: координаты целевой позиции
+        :type goal: numpy 1D array
+        """
+        import matplotlib.pyplot as plt
+
+        self.position = position
+
+        self.figure, self.axes = plt.subplots()
+        self.axes.imshow(
+            np.asarray(maze), interpolation="none", aspect="equal", cmap="Greys"
+        )
+        self.axes.set_xticks([], [])
+        self.axes.set_yticks([], [])
+
+        self.axes.plot(goal[1], goal[0], "bs", markersize=4)  # Отметка цели
+
+        # Слой событий поиска: прозрачное изображение RGBA поверх лабиринта
+        self.overlay = np.zeros(maze.shape + (4,), dtype=np.uint8)
+        self.events = self.axes.imshow(
+            self.overlay, interpolation="none", aspect="equal", animated=True
+        )
+        self.background = None  # Фон для блиттинга событий
+
+        # Подвижные элементы рисуются только при блиттинге
+        (self.trail,) = self.axes.plot([], [], "r-", alpha=0.4, animated=True)
+        (self.robot,) = self.axes.plot([], [], "rs", markersize=4, animated=True)
+
+    def show_events(self, kinds: np.ndarray, positions: np.ndarray):
+        """
+        Дорисовывает пакет событий поиска. Подходит как потребитель
+        SearchTrace для наблюдения за поиском во время решения.
+
+        :param kinds: виды событий
+        :type kinds: numpy 1D array
+        :param positions: координаты клеток событий формы (N, 2)
+        :type positions: numpy 2D array
+        """
+        canvas = self.figure.canvas
+
+        if self.background is None:
+            import matplotlib.pyplot as plt
+
+            plt.show(block=False)
+            canvas.draw()
+            self.background = canvas.copy_from_bbox(self.axes.bbox)
+
+        for kind, color in EVENT_COLORS.items():
+            cells = positions[kinds == kind]
+            self.overlay[cells[:, 0], cells[:, 1]] = color
+
+        self.events.set_data(self.overlay)
+
+        canvas.restore_region(self.background)
+        self.axes.draw_artist(self.events)
+        canvas.blit(self.axes.bbox)
+        canvas.flush_events()
+
+    def explore(self, trace: SearchTrace, speed: float = 1000.0, batch: int = 256):
+        """
+        Воспроизводит записанные события поиска.
+
+        :param trace: записанные события
+        :type trace: SearchTrace
+        :param speed: скорость воспроизведения (событий в секунду)
+        :type speed: float
+        :param batch: число событий в одном кадре
+        :type batch: int
+        """
+        kinds, positions = trace.events()
+
+        for start in range(0, len(kinds), batch):
+            self.show_events(
+                kinds[start : start + batch], positions[start : start + batch]
+            )
+            sleep(batch / speed)
+
+    def play(self, actions: List[int], speed: float = 10.0, step: int = 1):
+        """
+        Воспроизводит решение в окне.
+
+        :param actions: список действий
+        :type actions: List[int]
+        :param speed: скорость воспроизведения (действий в секунду)
+        :type speed: float
+        :param step: число действий между кадрами
+        :type step: int
+        """
+        import matplotlib.pyplot as plt
+
+        canvas = self.figure.canvas
+        path = trajectory(self.position, actions)
+
+        # Показанные события поиска становятся частью фона
+        self.events.set_animated(False)
+
+        plt.show(block=False)
+        canvas.draw()
+        background = canvas.copy_from_bbox(self.axes.bbox)
+        base = 0  # Начало пути, ещё не перенесённого в фон
+
+        for index in frame_indices(len(path), step):
+            canvas.restore_region(background)
+
+            self.trail.set_data(path[base : index + 1, 1], path[base : index + 1, 0])
+            self.axes.draw_artist(self.trail)
+
+            if index - base >= BAKE_FRAMES:
+                background = canvas.copy_from_bbox(self.axes.bbox)
+                base = index
+
+            self.robot.set_data([path[index, 1]], [path[index, 0]])
+            self.axes.draw_artist(self.robot)
+
+            canvas.blit(self.axes.bbox)
+            canvas.flush_events()
+
+            sleep(step / speed)
+
+
+def render_frames(
+    maze: np.ndarray,
+    position: np.ndarray,
+    goal: np.ndarray,
+    actions: List[int],
+    step: int = 1,
+    scale: int = 1,
+) -> Iterator[np.ndarray]:
+    """
+    Строит кадры воспроизведения прямо из массивов, без matplotlib.
+
+    Изображение лабиринта строится один раз; в каждом кадре дорисовываются
+    только новые клетки пути и робот.
+
+    :param maze: матрица, представляющая лабиринт
+    :param position: координаты стартовой позиции
+    :param goal: координаты целевой позиции
+    :param actions: список действий
+    :param step: число действий между кадрами
+    :param scale: размер клетки в пикселях
+    :return: кадры в виде массивов RGB формы (h * scale, w * scale, 3)
+    :rtype: Iterator[numpy 3D array]
+    """
+    image = np.where(
+        np.asarray(maze)[..., None] == 1,
+        np.array(WALL_COLOR, dtype=np.uint8),
+        np.array(FREE_COLOR, dtype=np.uint8),
+    )
+
+    path = trajectory(position, actions)
+    drawn = 0  # Число уже нарисованных позиций пути
+
+    for index in frame_indices(len(path), step):
+        cells = path[drawn : index + 1]
+        image[cells[:, 0], cells[:, 1]] = TRAIL_COLOR
+        drawn = index + 1
+
+        frame = image.copy()
+        frame[goal[0], goal[1]] = GOAL_COLOR
+        frame[path[index, 0], path[index, 1]] = ROBOT_COLOR
+
+        if scale > 1:
+            frame = frame.repeat(scale, axis=0).repeat(scale, axis=1)
+
+        yield frame
+
+
+def export(
+    maze: np.ndarray,
+    position: np.ndarray,
+    goal: np.ndarray,
+    actions: List[int],
+    filename: str,
+    fps: float = 30.0,
+    step: int = 1,
+    scale: int = 1,
+):
+    """
+    Записывает воспроизведение решения без графического интерфейса.
+
+    Формат определяется по имени файла: .gif - анимация GIF (Pillow),
+    .mp4 - видео (ffmpeg), иначе - отдельные кадры по шаблону имён
+    (например, frames/%05d.png); к имени без номера кадра (out.png)
+    номер добавляется перед расширением (out_00000.png, ...).
+
+    :type filename: string
+    :param filename: имя файла или шаблон имён кадров
+    :type fps: float
+    :param fps: число кадров в секунду
+    :type step: int
+    :param step: число действий между кадрами
+    :type scale: int
+    :param scale: размер клетки в пикселях
+    """
+    frames = render_frames(maze, position, goal, actions, step, scale)
+
+    if filename.endswith(".gif"):
+        from PIL import Image
+
+        first = Image.fromarray(next(frames))
+        first.save(
+            filename,
+            save_all=True,
+            append_images=(Image.fromarray(frame) for frame in frames),
+            duration=1000 / fps,
+            loop=0,
+        )
+    elif filename.endswith(".mp4"):
+        import matplotlib
+
+        first = next(frames)
+        height, width, _ = first.shape
+
+        # Кадры передаются ffmpeg по каналу без сжатия; размеры кадра
+        # дополняются до чётных, как требует yuv420p
+        command = [
+            matplotlib.rcParams["animation.ffmpeg_path"],
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "rgb24",
+            "-s",
+            f"{width}x{height}",
+            "-r",
+            str(fps),
+            "-i",
+            "-",
+            "-vf",
+            "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-pix_fmt",
+            "yuv420p",
+            filename,
+        ]
+
+        with subprocess.Popen(command, stdin=subprocess.PIPE) as process:
+            process.stdin.write(first.tobytes())
+            for frame in frames:
+                process.stdin.write(frame.tobytes())
+            process.stdin.close()
+
+        if process.returncode:
+            raise RuntimeError(f"ffmpeg failed with code {process.returncode}")
+    else:
+        from matplotlib.image import imsave
+
+        # Имя без номера кадра дополняется им перед расширением
+        if not re.search(r"%\d*d", filename):
+            root, extension = os.path.splitext(filename.replace("%", "%%"))
+            filename = root + "_%05d" + extension
+
+        for index, frame in enumerate(frames):
+            imsave(filename % index, frame)
@@ -0,0 +1,39 @@
+import asyncio
+import getopt
+import sys
+
+from solvers.server import DEFAULT_TIMEOUT, SolveServer
+
+# Путь сокета Unix по умолчанию
+DEFAULT_SOCKET = "solver.sock"
+
+
+async def serve(path, port, workers, timeout):
+    server = SolveServer(workers, timeout)
+    address = path if path is not None else f"127.0.0.1:{port}"
+    print(f"Serving {len(server.workers)} workers on {address}...")
+
+    try:
+        await server.serve(path, port)
+    finally:
+        server.close()
+
+
+def main(argv):
+    try:
+        opts = dict(getopt.getopt(argv, "u:p:w:t:")[0])
+    except getopt.GetoptError:
+        print("Invalid arguments. Exiting...")
+        exit()
+
+    # С -p сервер слушает TCP на localhost, иначе сокет Unix
+    port = int(opts["-p"]) if "-p" in opts else None
+    path = opts.get("-u", DEFAULT_SOCKET) if port is None else None
+    workers = int(opts.get("-w", 0)) or None
+    timeout = float(opts.get("-t", DEFAULT_TIMEOUT))
+
+    asyncio.run(serve(path, port, workers, timeout))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -3,4 +3,13 @@ from .dfs import dfs
 from .dfs_with_cmp import dfs_with_cmp
 from .ucs import ucs
 from .bnb import bnb
-from .bidirectional_search import bidirectional_search
+from .bidirectional_search import bidirectional_astar, bidirectional_search
+from .csgraph_search import csgraph_search
+from .wavefront import wavefront
+from .bitboard_bfs import bitboard_bfs
+from .junction_search import junction_search
+from .astar import astar
+from .jps import jps
+from .hpa import hpa
+from .dstar_lite import DStarLite, dstar_lite
+from .cache import SolveCache, cached_solve
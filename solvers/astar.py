@@ -0,0 +1,143 @@
+from heapq import heappop, heappush
+from typing import List, Optional
+
+from analyzer.budget import Budget
+from analyzer.statistic import Statistic
+from analyzer.trace import EXPAND, GENERATE, SearchTrace
+from maze.environment import Situation
+from maze.grid import Grid
+from maze.landmarks import Landmarks
+
+
+# Функция поиска A*
+def astar(
+    initial_situation: Situation,
+    landmarks: Optional[Landmarks] = None,
+    trace: Optional[SearchTrace] = None,
+    budget: Optional[Budget] = None,
+) -> Optional[tuple[List[int], Statistic]]:
+    """
+    :param initial_situation: начальная ситуация лабиринта
+    :param landmarks: ориентиры для эвристики ALT; если заданы, оценка
+                      усиливается неравенством треугольника
+    :param trace: приёмник событий поиска; без него события не собираются
+    :param budget: ограничение раскрытий, времени или памяти; исчерпав его,
+                   поиск возвращает путь к ближайшей к цели раскрытой клетке
+    :return: список действий, ведущих к цели, или None, если решение не найдено
+
+    Функция поиска решения в лабиринте с использованием алгоритма A*.
+
+    Вершины упорядочиваются по сумме f = g + h, где g - длина пройденного пути,
+    а h - манхэттенское расстояние до цели. Для четырёх действий из action_map
+    оно никогда не превышает истинной длины пути, поэтому найденный путь
+    оптимален. При равных f предпочтение отдаётся более глубоким вершинам.
+
+    Алгоритм работает следующим образом:
+    1. Инициализируем приоритетную очередь (f, -g, клетка).
+    2. Извлекаем клетку с наименьшим f; устаревшие записи уже раскрытых
+       клеток пропускаем.
+    3. Проверяем, достигнута ли целевая ситуация — если да, восстанавливаем путь.
+    4. Генерируем возможные действия (0-3) и для каждого действия:
+       - Если следующая клетка проходима и путь к ней короче известного,
+         запоминаем предшественника и добавляем её в очередь.
+    5. Если решение не найдено, возвращаем None.
+    """
+    if budget is not None:
+        budget.start()
+
+    grid = Grid(initial_situation.maze)
+    walls = grid.walls
+    offsets = grid.offsets
+    stride = grid.stride
+
+    start = grid.index(initial_situation.position)
+    goal = grid.index(initial_situation.goal)
+    goal_row, goal_col = divmod(goal, stride)
+
+    def heuristic(cell: int) -> int:
+        """Манхэттенское расстояние от клетки cell до цели."""
+        row, col = divmod(cell, stride)
+        return abs(row - goal_row) + abs(col - goal_col)
+
+    if landmarks is not None:
+        heuristic = landmarks.heuristic(initial_situation.goal)
+
+    queue = [(heuristic(start), 0, start)]  # Очередь с приоритетом (f, -g, клетка)
+    best = {start: 0}  # Лучшая известная длина пути до клетки
+    visited = grid.visited()  # Битовая карта раскрытых клеток
+    came_from = grid.predecessors()  # Действие, которым достигнута клетка
+
+    max_depth = 0  # Максимальная глубина поиска
+    all_generated = 0  # Общее число порождённых вершин
+    max_frontier = 0  # Максимальный размер фронта поиска
+
+    while queue:
+        max_frontier = max(max_frontier, len(queue))
+
+        _, depth, current = heappop(queue)
+        depth = -depth
+
+        # Проверяем, достигнута ли целевая ситуация
+        if current == goal:
+            path = grid.path(came_from, current, start)
+            if trace is not None:
+                trace.finish(path, goal)
+
+            return path, Statistic(
+                len(path), max_depth + 1, all_generated, max_frontier, visited.count(1)
+            )
+
+        # Пропускаем устаревшие записи уже раскрытых клеток
+        if visited[current]:
+            continue
+
+        # Останавливаемся, если бюджет поиска исчерпан
+        if budget is not None and budget.spend():
+            break
+
+        visited[current] = 1
+        all_generated += 1
+
+        if trace is not None:
+            trace.emit(EXPAND, current)
+
+        # Обновляем максимальную глубину
+        max_depth = max(max_depth, depth)
+
+        # Генерируем все возможные действия (0-3)
+        for action in range(4):
+            next_cell = current + offsets[action]
+            next_depth = depth + 1
+
+            # Если следующая клетка проходима и путь к ней стал короче
+            if not walls[next_cell] and next_depth < best.get(
+                next_cell, next_depth + 1
+            ):
+                best[next_cell] = next_depth
+                came_from[next_cell] = action
+                heappush(
+                    queue, (next_depth + heuristic(next_cell), -next_depth, next_cell)
+                )
+                if trace is not None:
+                    trace.emit(GENERATE, next_cell)
+
+    if budget is not None and budget.exhausted:
+        # Бюджет исчерпан: возвращаем путь к ближайшей к цели раскрытой клетке
+        cell = grid.nearest(visited, goal, start)
+        path = grid.path(came_from, cell, start)
+        if trace is not None:
+            trace.finish(path)
+
+        return path, Statistic(
+            len(path),
+            max_depth,
+            all_generated,
+            max_frontier,
+            visited.count(1),
+            truncated=True,
+        )
+
+    if trace is not None:
+        trace.finish(None)
+
+    return None  # Решение не найдено
@@ -1,14 +1,24 @@
 from collections import deque
 from typing import List, Optional
 
+from analyzer.budget import Budget
 from analyzer.statistic import Statistic
-from maze.environment import Situation, make_move
+from analyzer.trace import EXPAND, GENERATE, SearchTrace
+from maze.environment import Situation
+from maze.grid import Grid
 
 
 # Функция поиска в ширину
-def bfs(initial_situation: Situation) -> Optional[tuple[List[int], Statistic]]:
+def bfs(
+    initial_situation: Situation,
+    trace: Optional[SearchTrace] = None,
+    budget: Optional[Budget] = None,
+) -> Optional[tuple[List[int], Statistic]]:
     """
     :param initial_situation: начальное ситуация
+    :param trace: приёмник событий поиска; без него события не собираются
+    :param budget: ограничение раскрытий, времени или памяти; исчерпав его,
+                   поиск возвращает путь к ближайшей к цели посещённой клетке
     :return: путь, который привёл к целевой ситуации, или None,
              если решение не найдено
 
@@ -28,43 +38,89 @@ def bfs(initial_situation: Situation) -> Optional[tuple[List[int], Statistic]]:
        с обновлённым путём.
     5. Если очередь пуста, то решение не найдено.
     """
-    visited = set()  # Храним все посещённые ситуации
+    if budget is not None:
+        budget.start()
+
+    grid = Grid(initial_situation.maze)
+    walls = grid.walls
+    offsets = grid.offsets
+    goal = grid.index(initial_situation.goal)
+
+    start = grid.index(initial_situation.position)
+
+    visited = grid.visited()  # Битовая карта посещённых клеток
+    came_from = grid.predecessors()  # Действие, которым достигнута клетка
     queue = deque(
-        [(initial_situation, [], 0)]
-    )  # Каждый элемент: (текущая ситуация, путь действий, глубина)
+        [(start, 0, 0)]
+    )  # Каждый элемент: (текущая клетка, последнее действие, глубина)
 
     max_depth = 0  # Максимальная глубина поиска
     all_generated = 0  # Общее число порождённых вершин
+    max_frontier = 0  # Максимальный размер фронта поиска
 
     while queue:
-        current_situation, path, depth = queue.popleft()
+        max_frontier = max(max_frontier, len(queue))
+
+        current, last_action, depth = queue.popleft()
 
         # Проверяем, достигнуто ли целевое ситуация
-        if current_situation.finished:
-            return path, Statistic(len(path), max_depth + 1, all_generated)
+        if current == goal:
+            came_from[current] = last_action
+            path = grid.path(came_from, current, start)
+            if trace is not None:
+                trace.finish(path, goal)
+
+            return path, Statistic(
+                len(path), max_depth + 1, all_generated, max_frontier, visited.count(1)
+            )
 
         # Пропускаем, если это ситуация уже была посещена
-        if current_situation in visited:
+        if visited[current]:
             continue
 
-        # Добавляем текущую ситуация в посещённые
-        visited.add(current_situation)
+        # Останавливаемся, если бюджет поиска исчерпан
+        if budget is not None and budget.spend():
+            break
+
+        # Добавляем текущую ситуация в посещённые и запоминаем предшественника
+        visited[current] = 1
+        came_from[current] = last_action
         all_generated += 1
 
+        if trace is not None:
+            trace.emit(EXPAND, current)
+
         # Обновляем максимальную глубину
         max_depth = max(max_depth, depth)
 
         # Генерируем все возможные действия (0-3)
         for action in range(4):
-            next_situation = make_move(current_situation, action)
-
-            # Если новая ситуация валидна и не посещена ранее
-            if (
-                next_situation
-                and next_situation.valid
-                and next_situation not in visited
-            ):
-                # Добавляем новую ситуацию в очередь с обновлённым путём
-                queue.append((next_situation, path + [action], depth + 1))
+            next_cell = current + offsets[action]
+
+            # Если новая клетка не стена и не посещена ранее
+            if not walls[next_cell] and not visited[next_cell]:
+                # Добавляем новую ситуацию в очередь
+                queue.append((next_cell, action, depth + 1))
+                if trace is not None:
+                    trace.emit(GENERATE, next_cell)
+
+    if budget is not None and budget.exhausted:
+        # Бюджет исчерпан: возвращаем путь к ближайшей к цели посещённой клетке
+        cell = grid.nearest(visited, goal, start)
+        path = grid.path(came_from, cell, start)
+        if trace is not None:
+            trace.finish(path)
+
+        return path, Statistic(
+            len(path),
+            max_depth,
+            all_generated,
+            max_frontier,
+            visited.count(1),
+            truncated=True,
+        )
+
+    if trace is not None:
+        trace.finish(None)
 
     return None  # Решение не найдено
@@ -1,108 +1,400 @@
-from collections import deque
-from typing import Dict, List, Tuple, Optional
+from heapq import heappop, heappush
+from typing import List, Optional, Tuple
 
+from analyzer.budget import Budget
 from analyzer.statistic import Statistic
-from maze.environment import Situation, make_move
+from analyzer.trace import EXPAND, GENERATE, SearchTrace
+from maze.environment import Situation
+from maze.grid import Grid
+from maze.landmarks import Landmarks
+
+INFINITY = float("inf")
 
 
 def bidirectional_search(
-    initial_state: Situation, goal_state: Situation
+    initial_state: Situation,
+    goal_state: Situation,
+    trace: Optional[SearchTrace] = None,
+    budget: Optional[Budget] = None,
 ) -> Optional[tuple[List[int], Statistic]]:
     """
     Алгоритм двунаправленного поиска.
 
     :param initial_state: начальная ситуация робота в лабиринте
     :param goal_state: целевая ситуация (финиш)
+    :param trace: приёмник событий поиска; без него события не собираются
+    :param budget: ограничение раскрытий, времени или памяти; исчерпав его,
+                   поиск возвращает путь к ближайшей к цели клетке,
+                   посещённой поиском от начальной клетки
     :return: список действий, ведущих к цели, или None, если решение не найдено
+
+    Поиск в ширину ведётся одновременно от начальной и от целевой клетки
+    целыми слоями: за шаг раскрывается весь текущий слой того фронта,
+    который меньше. Встреча фронтов проверяется при порождении клетки, а для
+    каждой клетки хранится только действие, которым она достигнута.
+
+    Алгоритм работает следующим образом:
+    1. Инициализируем фронты начальной и целевой клетками.
+    2. Выбираем фронт с меньшим числом клеток и раскрываем весь его слой.
+    3. Если порождённая клетка уже посещена с другой стороны, фронты
+       встретились: склеиваем пути от обоих концов до неё.
+    4. Если один из фронтов опустел, решение не найдено.
+
+    Клетки, посещённые до раскрытия слоя, находятся от своих концов на
+    расстоянии не больше глубин фронтов, и эти множества не пересекаются.
+    Поэтому первая же встреча даёт кратчайший путь.
     """
-    # Очереди для двух направлений поиска
-    front_queue = deque([(initial_state, [], 0)])  # Поиск от начальной ситуации
-    back_queue = deque([(goal_state, [], 0)])  # Поиск от целевой ситуации
+    if budget is not None:
+        budget.start()
+
+    grid = Grid(initial_state.maze)
+    start = grid.index(initial_state.position)
+    goal = grid.index(goal_state.position)
 
-    # Множества для посещённых ситуаций с каждой стороны
-    front_visited = {
-        initial_state: []
-    }  # Карта: ситуация -> путь от начальной ситуации
-    back_visited = {goal_state: []}  # Карта: ситуация -> путь от целевой ситуации
+    # Битовые карты посещённых клеток с каждой стороны
+    front_visited = grid.visited()
+    back_visited = grid.visited()
+    front_visited[start] = 1
+    back_visited[goal] = 1
 
-    max_depth = [0, 0]  # Максимальная глубина поиска на фронте
+    # Действия, которыми клетки достигнуты с каждой стороны
+    front_came_from = grid.predecessors()
+    back_came_from = grid.predecessors()
+
+    front_layer = [start]  # Текущий слой поиска от начальной клетки
+    back_layer = [goal]  # Текущий слой поиска от целевой клетки
+
+    depth = [0, 0]  # Глубина каждого фронта
     all_generated = 0  # Общее число порождённых вершин
+    max_frontier = 0  # Максимальный суммарный размер фронтов
+
+    meeting = start if start == goal else None
+
+    while meeting is None and front_layer and back_layer:
+        max_frontier = max(max_frontier, len(front_layer) + len(back_layer))
 
-    while front_queue and back_queue:
-        # Расширяем фронт от начальной ситуации
-        result, depth_increase, max_depth_in_front = expand_front(
-            front_queue, front_visited, back_visited, False
+        # Раскрываем меньший фронт, чтобы число раскрытий росло медленнее
+        if len(front_layer) <= len(back_layer):
+            front_layer, meeting = expand_layer(
+                grid,
+                front_layer,
+                front_visited,
+                front_came_from,
+                back_visited,
+                trace,
+                budget,
+            )
+            depth[0] += 1
+            all_generated += len(front_layer)
+        else:
+            back_layer, meeting = expand_layer(
+                grid,
+                back_layer,
+                back_visited,
+                back_came_from,
+                front_visited,
+                trace,
+                budget,
+            )
+            depth[1] += 1
+            all_generated += len(back_layer)
+
+        # Останавливаемся, если бюджет поиска исчерпан
+        if budget is not None and budget.exhausted:
+            break
+
+    if meeting is None and budget is not None and budget.exhausted:
+        # Бюджет исчерпан: путь строится только фронтом от начальной клетки
+        cell = grid.nearest(front_visited, goal, start)
+        path = grid.path(front_came_from, cell, start)
+        if trace is not None:
+            trace.finish(path)
+
+        return path, Statistic(
+            len(path),
+            depth[0],
+            all_generated,
+            max_frontier,
+            front_visited.count(1) + back_visited.count(1),
+            truncated=True,
         )
 
-        max_depth[0] = max(max_depth[0], max_depth_in_front)
+    if meeting is None:
+        if trace is not None:
+            trace.finish(None)
+
+        return None  # Решение не найдено
+
+    result = join_paths(grid, front_came_from, back_came_from, meeting, start, goal)
+
+    if trace is not None:
+        trace.finish(result, goal)
 
-        all_generated += depth_increase
+    return result, Statistic(
+        len(result),
+        depth[0] + depth[1],
+        all_generated,
+        max_frontier,
+        front_visited.count(1) + back_visited.count(1),
+    )
 
-        if result:
-            return result, Statistic(
-                len(result), max_depth_in_front + max_depth[1], all_generated
-            )  # Путь найден
 
-        # Расширяем фронт от целевой ситуации
-        result, depth_increase, max_depth_in_front = expand_front(
-            back_queue, back_visited, front_visited, True
+def bidirectional_astar(
+    initial_situation: Situation,
+    landmarks: Optional[Landmarks] = None,
+    trace: Optional[SearchTrace] = None,
+    budget: Optional[Budget] = None,
+) -> Optional[tuple[List[int], Statistic]]:
+    """
+    :param initial_situation: начальная ситуация лабиринта
+    :param landmarks: ориентиры для эвристики ALT; если заданы, оценки обеих
+                      сторон усиливаются неравенством треугольника
+    :param trace: приёмник событий поиска; без него события не собираются
+    :param budget: ограничение раскрытий, времени или памяти; исчерпав его,
+                   поиск возвращает лучший найденный путь до цели (без
+                   доказательства оптимальности) или путь к ближайшей к цели
+                   клетке, достигнутой прямым поиском
+    :return: список действий, ведущих к цели, или None, если решение не найдено
+
+    Функция двунаправленного поиска A* (New Bidirectional A*, NBA*).
+
+    Каждая сторона ведёт свой A* с оценкой расстояния до противоположного
+    конца. Клетка, раскрытая одной стороной, закрыта для обеих. Длина
+    лучшего найденного пути L позволяет отбрасывать клетки, не раскрывая
+    их: клетка x стороны s отбрасывается, если g_s(x) + h_s(x) >= L или
+    g_s(x) + F_t - h_t(x) >= L, где F_t - наименьшая оценка f другой
+    стороны. Эвристика согласована, поэтому найденный путь оптимален.
+
+    Алгоритм работает следующим образом:
+    1. Инициализируем очереди сторон начальной и целевой клетками.
+    2. Извлекаем клетку из меньшей очереди; закрытые клетки пропускаем.
+    3. Если клетка не отброшена, обновляем расстояния до соседей, ещё не
+       закрытых ни одной стороной, и длину L через клетки, достигнутые
+       обеими сторонами.
+    4. Останавливаемся, когда наименьшая оценка f одной из сторон не меньше
+       L или очередь опустела; путь склеивается в клетке, давшей L.
+    """
+    if budget is not None:
+        budget.start()
+
+    grid = Grid(initial_situation.maze)
+    walls = grid.walls
+    offsets = grid.offsets
+    stride = grid.stride
+
+    start = grid.index(initial_situation.position)
+    goal = grid.index(initial_situation.goal)
+
+    def manhattan(target: int):
+        """Манхэттенское расстояние до клетки target."""
+        target_row, target_col = divmod(target, stride)
+
+        def heuristic(cell: int) -> int:
+            row, col = divmod(cell, stride)
+            return abs(row - target_row) + abs(col - target_col)
+
+        return heuristic
+
+    # Оценки расстояния до цели (прямой поиск) и до старта (обратный)
+    if landmarks is not None:
+        heuristics = (
+            landmarks.heuristic(initial_situation.goal),
+            landmarks.heuristic(initial_situation.position),
         )
+    else:
+        heuristics = (manhattan(goal), manhattan(start))
 
-        max_depth[1] = max(max_depth[1], max_depth_in_front)
+    initial = heuristics[0](start)
 
-        all_generated += depth_increase
+    queues = ([(initial, 0, start)], [(initial, 0, goal)])  # (f, -g, клетка)
+    best = ({start: 0}, {goal: 0})  # Лучшие известные длины путей каждой стороны
+    came_from = (grid.predecessors(), grid.predecessors())
+    bounds = [initial, initial]  # Наименьшие оценки f сторон
+    closed = grid.visited()  # Клетки, раскрытые или отброшенные любой стороной
 
-        if result:
-            return result, Statistic(
-                len(result), max_depth_in_front + max_depth[0], all_generated
-            )
+    length = 0 if start == goal else INFINITY  # Длина лучшего пути L
+    meeting = start if start == goal else None  # Клетка, через которую он идёт
+
+    max_depth = 0  # Максимальная глубина поиска
+    all_generated = 0  # Общее число порождённых вершин
+    max_frontier = 0  # Максимальный суммарный размер очередей
+
+    while queues[0] and queues[1] and max(bounds) < length:
+        max_frontier = max(max_frontier, len(queues[0]) + len(queues[1]))
 
-    return None  # Решение не найдено
+        # Продвигаем сторону с меньшей очередью
+        side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        other = 1 - side
+        queue = queues[side]
+        g, g_other = best[side], best[other]
 
+        _, depth, cell = heappop(queue)
+        depth = -depth
 
-def expand_front(
-    queue: deque[Tuple[Situation, List, int]],
-    visited_from_this_side: Dict[Situation, List],
-    visited_from_other_side: Dict[Situation, List],
-    reverse_path: bool,
-):
+        # Пропускаем закрытые клетки и устаревшие записи
+        if closed[cell] or depth > g[cell]:
+            continue
+
+        # Останавливаемся, если бюджет поиска исчерпан
+        if budget is not None and budget.spend():
+            break
+
+        closed[cell] = 1
+
+        if (
+            depth + heuristics[side](cell) < length
+            and depth + bounds[other] - heuristics[other](cell) < length
+        ):
+            all_generated += 1
+
+            if trace is not None:
+                trace.emit(EXPAND, cell)
+
+            # Обновляем максимальную глубину
+            max_depth = max(max_depth, depth)
+
+            for action in range(4):
+                next_cell = cell + offsets[action]
+
+                if walls[next_cell] or closed[next_cell]:
+                    continue
+
+                next_depth = depth + 1
+
+                if next_depth < g.get(next_cell, INFINITY):
+                    g[next_cell] = next_depth
+                    came_from[side][next_cell] = action
+                    estimate = next_depth + heuristics[side](next_cell)
+                    heappush(queue, (estimate, -next_depth, next_cell))
+
+                    if trace is not None:
+                        trace.emit(GENERATE, next_cell)
+
+                    # Клетка достигнута обеими сторонами: путь через неё
+                    total = next_depth + g_other.get(next_cell, INFINITY)
+                    if total < length:
+                        length = total
+                        meeting = next_cell
+
+        if queue:
+            bounds[side] = queue[0][0]
+
+    truncated = budget is not None and budget.exhausted
+
+    if meeting is None and truncated:
+        # Бюджет исчерпан до встречи: путь к ближайшей к цели клетке прямого поиска
+        path = grid.path(came_from[0], grid.nearest(best[0], goal, start), start)
+        if trace is not None:
+            trace.finish(path)
+
+        return path, Statistic(
+            len(path),
+            max_depth,
+            all_generated,
+            max_frontier,
+            closed.count(1),
+            truncated=True,
+        )
+
+    if meeting is None:
+        if trace is not None:
+            trace.finish(None)
+
+        return None  # Решение не найдено
+
+    result = join_paths(grid, came_from[0], came_from[1], meeting, start, goal)
+
+    if trace is not None:
+        trace.finish(result, goal)
+
+    return result, Statistic(
+        len(result),
+        max_depth,
+        all_generated,
+        max_frontier,
+        closed.count(1),
+        truncated=truncated,
+    )
+
+
+def join_paths(
+    grid: Grid,
+    front_came_from: bytearray,
+    back_came_from: bytearray,
+    meeting: int,
+    start: int,
+    goal: int,
+) -> List[int]:
     """
-    Расширяет один фронт поиска и проверяет пересечение с другим фронтом.
+    Склеивает путь от начальной клетки до точки встречи с развёрнутым путём
+    от точки встречи до целевой клетки.
 
-    :param queue: очередь для текущего фронта поиска
-    :param visited_from_this_side: ситуации, посещённые с этой стороны
-    :param visited_from_other_side: ситуации, посещённые с противоположной стороны
-    :param reverse_path: если True, разворачиваем путь от целевой ситуации
-    :return: список действий, если путь найден, или None
+    :param grid: компактное представление лабиринта
+    :param front_came_from: предшественники со стороны начальной клетки
+    :param back_came_from: предшественники со стороны целевой клетки
+    :param meeting: клетка, в которой встретились фронты
+    :param start: начальная клетка
+    :param goal: целевая клетка
+    :return: список действий от начальной клетки до целевой
     """
-    current_state, path, current_depth = queue.popleft()
-    nodes_generated = 0  # Счётчик для порождённых вершин
-    max_depth_in_front = current_depth  # Максимальная глубина в текущем фронте
-
-    # Проверяем, пересекается ли текущая ситуация с другим фронтом
-    if current_state in visited_from_other_side:
-        # Получаем путь от другого фронта
-        other_path = visited_from_other_side[current_state]
-
-        # Если мы расширяем путь от целевой ситуации, разворачиваем его
-        if reverse_path:
-            return (
-                path + [(3 - x) for x in other_path[::-1]],
-                nodes_generated,
-                max_depth_in_front,
-            )
-        else:
-            return other_path[::-1] + path, nodes_generated, max_depth_in_front
+    front_path = grid.path(front_came_from, meeting, start)
+    back_path = grid.path(back_came_from, meeting, goal)
+
+    # Обратные действия: 0 <-> 3, 1 <-> 2
+    return front_path + [(3 - x) for x in back_path[::-1]]
+
+
+def expand_layer(
+    grid: Grid,
+    layer: List[int],
+    visited_from_this_side: bytearray,
+    came_from: bytearray,
+    visited_from_other_side: bytearray,
+    trace: Optional[SearchTrace] = None,
+    budget: Optional[Budget] = None,
+) -> Tuple[List[int], Optional[int]]:
+    """
+    Раскрывает весь слой одного фронта поиска и проверяет порождённые клетки
+    на пересечение с другим фронтом.
+
+    :param grid: компактное представление лабиринта
+    :param layer: клетки текущего слоя фронта
+    :param visited_from_this_side: клетки, посещённые с этой стороны
+    :param came_from: предшественники клеток с этой стороны
+    :param visited_from_other_side: клетки, посещённые с противоположной стороны
+    :param trace: приёмник событий поиска или None
+    :param budget: бюджет поиска или None; при его исчерпании раскрытие слоя
+                   прерывается
+    :return: следующий слой фронта и клетка встречи фронтов (или None);
+             при встрече или исчерпании бюджета слой содержит только
+             клетки, порождённые до этого
+    """
+    walls = grid.walls
+    offsets = grid.offsets
+    next_layer = []
+
+    for cell in layer:
+        if budget is not None and budget.spend():
+            break
+
+        if trace is not None:
+            trace.emit(EXPAND, cell)
+
+        # Генерируем возможные действия (0-3)
+        for action in range(4):
+            next_cell = cell + offsets[action]
+
+            # Если следующая клетка не стена и не посещена с этой стороны
+            if not walls[next_cell] and not visited_from_this_side[next_cell]:
+                visited_from_this_side[next_cell] = 1
+                came_from[next_cell] = action  # Запоминаем предшественника
+                next_layer.append(next_cell)
 
-    # Генерируем возможные действия (0-3)
-    for action in range(4):
-        next_state = make_move(current_state, action)
+                if trace is not None:
+                    trace.emit(GENERATE, next_cell)
 
-        # Если следующая ситация валидна и не посещена с этой стороны
-        if next_state and next_state.valid and next_state not in visited_from_this_side:
-            visited_from_this_side[next_state] = path + [action]  # Обновляем путь
-            queue.append((next_state, path + [action], current_depth + 1))
-            nodes_generated += 1  # Увеличиваем число порождённых вершин
-            max_depth_in_front = max(max_depth_in_front, current_depth + 1)
+                # Проверяем встречу с другим фронтом при порождении
+                if visited_from_other_side[next_cell]:
+                    return next_layer, next_cell
 
-    return None, nodes_generated, max_depth_in_front
+    return next_layer, None
@@ -0,0 +1,103 @@
+from typing import List, Optional
+
+import numpy as np
+
+from analyzer.budget import Budget
+from analyzer.statistic import Statistic
+from analyzer.trace import EXPAND, SearchTrace
+from maze.bitboard import Bitboard
+from maze.environment import Situation
+
+from .wavefront import descend, nearest
+
+
+# Функция поиска в ширину по битовым строкам лабиринта
+def bitboard_bfs(
+    initial_situation: Situation,
+    bitboard: Optional[Bitboard] = None,
+    trace: Optional[SearchTrace] = None,
+    budget: Optional[Budget] = None,
+) -> Optional[tuple[List[int], Statistic]]:
+    """
+    :param initial_situation: начальная ситуация лабиринта
+    :param bitboard: заранее построенное битовое представление этого лабиринта
+    :param trace: приёмник событий поиска; события передаются целыми слоями
+    :param budget: ограничение раскрытий, времени или памяти; проверяется
+                   после каждого слоя, исчерпав его, поиск возвращает путь к
+                   ближайшей к цели помеченной клетке
+    :return: список действий, ведущих к цели, или None, если решение не найдено
+
+    Функция поиска в ширину с битовым параллелизмом (Bitboard BFS).
+
+    Строки лабиринта хранятся битовыми наборами, и весь фронт поиска
+    сдвигается в четырёх направлениях операциями над словами, по 64 клетки
+    за операцию (см. maze.bitboard.Bitboard). Стоимость шага пропорциональна
+    ширине полосы строк, занятой фронтом, поэтому поиск выгоден на открытых
+    картах с короткими путями. Для проверки одной лишь достижимости
+    используйте Bitboard.reachable: она не вычисляет координаты клеток.
+
+    Алгоритм работает следующим образом:
+    1. Кодируем проходимые клетки строк битами, если это не сделано заранее.
+    2. Сдвигаем битовую карту фронта в четырёх направлениях и оставляем
+       проходимые непомеченные клетки - это следующий слой.
+    3. Записываем номер слоя в поле расстояний его клеток.
+    4. Повторяем, пока цель не помечена и новый слой не пуст.
+    5. Если цель не помечена, решение не найдено; иначе спускаемся по полю
+       расстояний от цели к старту и восстанавливаем действия.
+    """
+    if budget is not None:
+        budget.start()
+
+    maze = initial_situation.maze
+    w = maze.shape[1]
+
+    if bitboard is None:
+        bitboard = Bitboard(maze)
+
+    # Поле расстояний с рамкой, как у волнового поиска
+    distances = np.pad(
+        bitboard.distances(
+            initial_situation.position, initial_situation.goal, budget
+        ),
+        1,
+        constant_values=-1,
+    )
+
+    goal = (int(initial_situation.goal[0]) + 1, int(initial_situation.goal[1]) + 1)
+    depth = int(distances[goal])
+
+    truncated = depth < 0 and budget is not None and budget.exhausted
+    if truncated:
+        # Бюджет исчерпан: путь ведёт к ближайшей к цели помеченной клетке
+        goal = nearest(distances, goal)
+        depth = int(distances[goal])
+
+    if depth < 0:
+        if trace is not None:
+            trace.finish(None)
+
+        return None  # Решение не найдено
+
+    cells = np.flatnonzero(distances >= 0)  # Индексы помеченных клеток
+    levels = distances.ravel()[cells]
+
+    if trace is not None:
+        # Слои вычисляются битовыми операциями, поэтому события передаются
+        # после поиска в порядке возрастания расстояния
+        trace.extend(EXPAND, cells[np.argsort(levels, kind="stable")])
+
+    path = descend(distances, goal)
+
+    if trace is not None:
+        trace.finish(path, None if truncated else goal[0] * (w + 2) + goal[1])
+
+    max_frontier = int(np.bincount(levels).max())  # Наибольший размер слоя
+
+    return path, Statistic(
+        len(path),
+        int(levels.max()),
+        len(cells),
+        max_frontier,
+        len(cells),
+        truncated=truncated,
+    )
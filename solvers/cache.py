@@ -0,0 +1,339 @@
+import copy
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Union
+
+import numpy as np
+
+from analyzer.budget import Budget
+from analyzer.statistic import Statistic
+from maze.bitboard import Bitboard
+from maze.components import Components, components_filename
+from maze.environment import Situation
+from maze.fingerprint import fingerprint
+from maze.generator import load
+from maze.graph import adjacency
+from maze.grid import Grid
+from maze.hierarchy import Hierarchy, hierarchy_filename
+from maze.junctions import JunctionGraph
+from maze.landmarks import Landmarks, landmarks_filename
+
+from .astar import astar
+from .bfs import bfs
+from .bidirectional_search import bidirectional_astar, bidirectional_search
+from .bitboard_bfs import bitboard_bfs
+from .bnb import bnb
+from .hpa import hpa
+from .csgraph_search import csgraph_search
+from .dfs import dfs
+from .dfs_with_cmp import dfs_with_cmp
+from .dstar_lite import dstar_lite
+from .jps import jps
+from .junction_search import junction_search
+from .ucs import ucs
+from .wavefront import wavefront
+
+# Решатели по именам, принятым в main.py
+SOLVERS: Dict[str, Callable] = {
+    "bfs": bfs,
+    "dfs": dfs,
+    "dfs_with_cmp": dfs_with_cmp,
+    "ucs": ucs,
+    "bnb": bnb,
+    "bidirectional_search": bidirectional_search,
+    "bidirectional_astar": bidirectional_astar,
+    "csgraph_search": csgraph_search,
+    "wavefront": wavefront,
+    "bitboard_bfs": bitboard_bfs,
+    "junction_search": junction_search,
+    "astar": astar,
+    "jps": jps,
+    "hpa": hpa,
+    "dstar_lite": dstar_lite,
+}
+
+# Предвычисляемые структуры: решатель -> (имя аргумента, вид структуры)
+PREPARED = {
+    "csgraph_search": ("graph", "adjacency"),
+    "junction_search": ("graph", "junctions"),
+    "astar": ("landmarks", "landmarks"),
+    "jps": ("landmarks", "landmarks"),
+    "bidirectional_astar": ("landmarks", "landmarks"),
+    "hpa": ("hierarchy", "hierarchy"),
+    "bitboard_bfs": ("bitboard", "bitboard"),
+}
+
+BUILDERS: Dict[str, Callable[[np.ndarray], Any]] = {
+    "adjacency": adjacency,
+    "junctions": lambda maze: JunctionGraph(Grid(maze)),
+    "landmarks": Landmarks.build,
+    "hierarchy": Hierarchy.build,
+    "bitboard": Bitboard,
+    "components": Components.build,
+}
+
+_MISSING = object()
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = 128):
+        """
+        Создаёт словарь ограниченного размера, вытесняющий давно
+        не использованные записи.
+
+        :param maxsize: максимальное число записей
+        :type maxsize: int
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Возвращает значение по ключу key и отмечает его как недавно использованное.
+
+        :param key: ключ записи
+        :param default: значение, возвращаемое при промахе
+        :return: сохранённое значение или default
+        """
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+
+        self.misses += 1
+        return default
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Сохраняет значение value по ключу key, вытесняя самую старую запись
+        при переполнении.
+
+        :param key: ключ записи
+        :param value: сохраняемое значение
+        """
+        self._data[key] = value
+        self._data.move_to_end(key)
+
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        """Удаляет все записи и обнуляет счётчики."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class MazeEntry:
+    def __init__(self, maze: np.ndarray, key: str):
+        """
+        Хранит лабиринт, его отпечаток и построенные для него структуры.
+
+        :param maze: матрица, представляющая лабиринт
+        :param key: отпечаток лабиринта
+        """
+        self.maze = maze
+        self.key = key
+        self.structures: Dict[str, Any] = {}
+
+    def structure(self, kind: str) -> Any:
+        """
+        Возвращает предвычисленную структуру вида kind, строя её при первом
+        обращении.
+
+        :param kind: вид структуры (adjacency, junctions, landmarks, hierarchy,
+                     bitboard, components)
+        :return: структура
+        """
+        if kind not in self.structures:
+            self.structures[kind] = BUILDERS[kind](self.maze)
+        return self.structures[kind]
+
+
+class SolveCache:
+    def __init__(self, maxsize: int = 1024, maze_maxsize: int = 8):
+        """
+        Создаёт кеш решений и загруженных лабиринтов.
+
+        :param maxsize: максимальное число сохранённых решений
+        :type maxsize: int
+        :param maze_maxsize: максимальное число лабиринтов со структурами
+        :type maze_maxsize: int
+        """
+        self.results = LRUCache(maxsize)
+        self.mazes = LRUCache(maze_maxsize)
+        self.files = LRUCache(maze_maxsize)
+
+    def load(self, filename: str) -> MazeEntry:
+        """
+        Загружает лабиринт из файла, повторно используя уже загруженный,
+        если файл не менялся. Файлы ориентиров, абстракции и индекса
+        компонент рядом с лабиринтом подхватываются автоматически, если их
+        отпечаток совпадает с отпечатком лабиринта.
+
+        :param filename: имя файла лабиринта
+        :return: запись лабиринта
+        """
+        stat = os.stat(filename)
+        file_key = (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+
+        key = self.files.get(file_key)
+        entry = self.mazes.get(key) if key is not None else None
+
+        if entry is None:
+            entry = self.entry(load(filename), copy=False)
+            self.files.put(file_key, entry.key)
+
+            # Структуры, сохранённые рядом с лабиринтом; файл, построенный
+            # для другого лабиринта, пропускается, и структура строится заново
+            for kind, sidecar, loader in (
+                ("landmarks", landmarks_filename(filename), Landmarks.load),
+                ("hierarchy", hierarchy_filename(filename), Hierarchy.load),
+                ("components", components_filename(filename), Components.load),
+            ):
+                if kind in entry.structures or not os.path.exists(sidecar):
+                    continue
+                try:
+                    entry.structures[kind] = loader(sidecar, entry.maze)
+                except ValueError:
+                    pass
+
+        return entry
+
+    def entry(self, maze: np.ndarray, copy: bool = True) -> MazeEntry:
+        """
+        Возвращает запись лабиринта по его содержимому.
+
+        :param maze: матрица, представляющая лабиринт
+        :param copy: сохранить копию, чтобы изменения исходного массива
+                     не испортили кеш
+        :return: запись лабиринта
+        """
+        key = fingerprint(maze)
+        entry = self.mazes.get(key)
+
+        if entry is None:
+            # Упакованный лабиринт (PackedMaze) уже отображён только для чтения
+            if isinstance(maze, np.ndarray):
+                if copy:
+                    maze = maze.copy()
+                maze.flags.writeable = False
+
+            entry = MazeEntry(maze, key)
+            self.mazes.put(key, entry)
+
+        return entry
+
+    def solve(
+        self,
+        maze: Union[np.ndarray, str, MazeEntry],
+        start: np.ndarray,
+        goal: np.ndarray,
+        solver: str,
+        budget: Optional[Budget] = None,
+    ) -> Optional[tuple[List[int], Statistic]]:
+        """
+        Решает лабиринт, запоминая результат.
+
+        Запрос, в котором старт и цель лежат в разных компонентах связности,
+        отклоняется по индексу компонент без запуска решателя. Усечённые
+        по бюджету результаты не запоминаются, а запомненный полный
+        результат возвращается при любом бюджете. Возвращается копия
+        запомненной статистики, которую вызывающий может менять.
+
+        :param maze: лабиринт, имя его файла или запись из load/entry
+        :param start: координаты стартовой клетки
+        :param goal: координаты целевой клетки
+        :param solver: имя решателя (ключ SOLVERS)
+        :param budget: бюджет поиска или None
+        :return: список действий и статистика или None, если решение не найдено
+        """
+        if isinstance(maze, str):
+            entry = self.load(maze)
+        elif isinstance(maze, MazeEntry):
+            entry = maze
+        else:
+            entry = self.entry(maze)
+
+        start = np.asarray(start)
+        goal = np.asarray(goal)
+
+        key = (entry.key, tuple(map(int, start)), tuple(map(int, goal)), solver)
+        result = self.results.get(key, _MISSING)
+
+        if result is _MISSING:
+            result = None
+
+            if entry.structure("components").connected(start, goal):
+                situation = Situation(entry.maze, start, goal)
+                kwargs = {}
+
+                if solver == "bidirectional_search":
+                    kwargs["goal_state"] = Situation(entry.maze, goal, goal)
+                if solver in PREPARED:
+                    argument, kind = PREPARED[solver]
+                    kwargs[argument] = entry.structure(kind)
+
+                result = SOLVERS[solver](situation, budget=budget, **kwargs)
+                if result is not None:
+                    result = (tuple(result[0]), result[1])
+
+            # Усечённый результат зависит от бюджета
+            if result is None or not result[1].truncated:
+                self.results.put(key, result)
+
+        if result is None:
+            return None
+
+        # Вызывающий (например, measure) дописывает в статистику время и память
+        return list(result[0]), copy.copy(result[1])
+
+    def info(self) -> Dict[str, int]:
+        """
+        Возвращает счётчики попаданий и промахов.
+
+        :return: словарь со счётчиками кеша решений и кеша лабиринтов
+        """
+        return {
+            "hits": self.results.hits,
+            "misses": self.results.misses,
+            "size": len(self.results),
+            "maze_hits": self.mazes.hits,
+            "maze_misses": self.mazes.misses,
+            "mazes": len(self.mazes),
+        }
+
+    def clear(self):
+        """Очищает все кеши."""
+        self.results.clear()
+        self.mazes.clear()
+        self.files.clear()
+
+
+# Общий кеш процесса
+default_cache = SolveCache()
+
+
+def cached_solve(
+    maze: Union[np.ndarray, str, MazeEntry],
+    start: np.ndarray,
+    goal: np.ndarray,
+    solver: str,
+    budget: Optional[Budget] = None,
+) -> Optional[tuple[List[int], Statistic]]:
+    """
+    Решает лабиринт через общий кеш процесса (см. SolveCache.solve).
+
+    :param maze: лабиринт, имя его файла или запись лабиринта
+    :param start: координаты стартовой клетки
+    :param goal: координаты целевой клетки
+    :param solver: имя решателя (ключ SOLVERS)
+    :param budget: бюджет поиска или None
+    :return: список действий и статистика или None, если решение не найдено
+    """
+    return default_cache.solve(maze, start, goal, solver, budget)
@@ -0,0 +1,142 @@
+from typing import TYPE_CHECKING, List, Optional
+
+import numpy as np
+
+from analyzer.budget import Budget
+from analyzer.statistic import Statistic
+from analyzer.trace import EXPAND, SearchTrace
+from maze.environment import Situation
+from maze.graph import actions_from_nodes, adjacency
+
+if TYPE_CHECKING:
+    from scipy.sparse import csr_matrix
+
+
+# Функция поиска кратчайшего пути средствами scipy.sparse.csgraph
+def csgraph_search(
+    initial_situation: Situation,
+    graph: Optional["csr_matrix"] = None,
+    trace: Optional[SearchTrace] = None,
+    budget: Optional[Budget] = None,
+) -> Optional[tuple[List[int], Statistic]]:
+    """
+    :param initial_situation: начальная ситуация лабиринта
+    :param graph: заранее построенная матрица смежности этого лабиринта
+    :param trace: приёмник событий поиска; порядок раскрытия внутри SciPy
+                  недоступен, поэтому достигнутые клетки сообщаются по
+                  возрастанию расстояния после поиска
+    :param budget: ограничение раскрытий, времени или памяти; скомпилированный
+                   поиск нельзя прервать, поэтому с бюджетом он повторяется с
+                   удваивающимся радиусом, а бюджет проверяется между
+                   повторами; исчерпав его, поиск возвращает путь к
+                   ближайшей к цели достигнутой клетке
+    :return: список действий, ведущих к цели, или None, если решение не найдено
+
+    Функция поиска кратчайшего пути с помощью скомпилированных процедур
+    scipy.sparse.csgraph.
+
+    Алгоритм работает следующим образом:
+    1. Строим разреженную матрицу смежности лабиринта.
+    2. Запускаем поиск в ширину от начальной клетки (shortest_path для
+       невзвешенного графа), получая расстояния и предшественников.
+    3. Если цель недостижима, решение не найдено.
+    4. Иначе восстанавливаем путь по предшественникам и переводим его в действия.
+
+    Так как поиск проходит всю компоненту связности, функция также служит
+    эталоном для проверки остальных решателей.
+    """
+    if budget is not None:
+        budget.start()
+
+    maze = initial_situation.maze
+    w = maze.shape[1]
+
+    start_row, start_col = map(int, initial_situation.position)
+    goal_row, goal_col = map(int, initial_situation.goal)
+
+    start = start_row * w + start_col
+    goal = goal_row * w + goal_col
+
+    from scipy.sparse.csgraph import dijkstra, shortest_path
+
+    if graph is None:
+        graph = adjacency(maze)
+
+    truncated = False
+
+    if budget is None:
+        distances, predecessors = shortest_path(
+            graph,
+            directed=False,
+            unweighted=True,
+            indices=start,
+            return_predecessors=True,
+        )
+    else:
+        limit = 1  # Радиус поиска
+        previous = 0  # Число клеток, достигнутых с прошлым радиусом
+
+        while True:
+            distances, predecessors = dijkstra(
+                graph,
+                directed=False,
+                unweighted=True,
+                indices=start,
+                return_predecessors=True,
+                limit=limit,
+            )
+            count = int(np.count_nonzero(np.isfinite(distances)))
+
+            # Цель достигнута, или радиус больше не добавляет клеток
+            if np.isfinite(distances[goal]) or count == previous:
+                break
+
+            if budget.spend(count):
+                # Бюджет исчерпан: путь ведёт к ближайшей к цели клетке
+                cells = np.flatnonzero(np.isfinite(distances))
+                rows, cols = np.divmod(cells, w)
+                closest = np.argmin(abs(rows - goal_row) + abs(cols - goal_col))
+                goal = int(cells[closest])
+                goal_row, goal_col = divmod(goal, w)
+                truncated = True
+                break
+
+            limit *= 2
+            previous = count
+
+    if trace is not None:
+        # Клетки в порядке слоёв поиска в ширину, в индексах Grid
+        cells = np.flatnonzero(np.isfinite(distances))
+        rows, cols = np.divmod(cells[np.argsort(distances[cells])], w)
+        trace.extend(EXPAND, (rows + 1) * (w + 2) + cols + 1)
+
+    # Проверяем, достижима ли цель
+    if np.isinf(distances[goal]):
+        if trace is not None:
+            trace.finish(None)
+
+        return None  # Решение не найдено
+
+    # Восстанавливаем путь по предшественникам
+    nodes = [goal]
+    while nodes[-1] != start:
+        nodes.append(predecessors[nodes[-1]])
+    nodes.reverse()
+
+    path = actions_from_nodes(np.asarray(nodes), w)
+
+    reached = distances[np.isfinite(distances)]
+
+    if trace is not None:
+        if truncated:
+            trace.finish(path)
+        else:
+            trace.finish(path, (goal_row + 1) * (w + 2) + goal_col + 1)
+
+    return path, Statistic(
+        len(path),
+        int(reached.max()),
+        len(reached),
+        max_visited=len(reached),
+        truncated=truncated,
+    )
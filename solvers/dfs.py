@@ -1,13 +1,23 @@
 from typing import List, Optional
 
+from analyzer.budget import Budget
 from analyzer.statistic import Statistic
-from maze.environment import Situation, make_move
+from analyzer.trace import EXPAND, GENERATE, SearchTrace
+from maze.environment import Situation
+from maze.grid import Grid
 
 
 # Функция поиска в глубину
-def dfs(initial_situation: Situation) -> Optional[tuple[List[int], Statistic]]:
+def dfs(
+    initial_situation: Situation,
+    trace: Optional[SearchTrace] = None,
+    budget: Optional[Budget] = None,
+) -> Optional[tuple[List[int], Statistic]]:
     """
     :param initial_situation: начальное ситуация
+    :param trace: приёмник событий поиска; без него события не собираются
+    :param budget: ограничение раскрытий, времени или памяти; исчерпав его,
+                   поиск возвращает путь к ближайшей к цели посещённой клетке
     :return: путь, который привёл к целевой ситуации, или None,
              если решение не найдено
 
@@ -27,39 +37,87 @@ def dfs(initial_situation: Situation) -> Optional[tuple[List[int], Statistic]]:
        с обновлённым путём.
     5. Если стек пуст, то решение не найдено.
     """
-    visited = set()  # Храним все посещённые ситуации
+    if budget is not None:
+        budget.start()
+
+    grid = Grid(initial_situation.maze)
+    walls = grid.walls
+    offsets = grid.offsets
+    goal = grid.index(initial_situation.goal)
+
+    start = grid.index(initial_situation.position)
+
+    visited = grid.visited()  # Битовая карта посещённых клеток
+    came_from = grid.predecessors()  # Действие, которым достигнута клетка
     stack = [
-        (initial_situation, [], 0)
-    ]  # Каждый элемент: (текущая ситуация, путь действий)
+        (start, 0, 0)
+    ]  # Каждый элемент: (текущая клетка, последнее действие, глубина)
 
     max_depth = 0  # Максимальная глубина поиска
     all_generated = 0  # Общее число порождённых вершин
+    max_frontier = 0  # Максимальный размер фронта поиска
 
     while stack:
-        current_situation, path, depth = stack.pop()
+        max_frontier = max(max_frontier, len(stack))
+
+        current, last_action, depth = stack.pop()
+
+        # Запоминаем предшественника. Повторное раскрытие клетки перезаписывает
+        # его, но записи её потомков в стеке к этому моменту уже обработаны
+        came_from[current] = last_action
 
         # Проверяем, достигнута ли целевая ситуация
-        if current_situation.finished:
-            return path, Statistic(len(path), max_depth + 1, all_generated)
+        if current == goal:
+            path = grid.path(came_from, current, start)
+            if trace is not None:
+                trace.finish(path, goal)
+
+            return path, Statistic(
+                len(path), max_depth + 1, all_generated, max_frontier, visited.count(1)
+            )
+
+        # Останавливаемся, если бюджет поиска исчерпан
+        if budget is not None and budget.spend():
+            break
 
         # Добавляем текущую ситуация в посещённые
-        visited.add(current_situation)
+        visited[current] = 1
         all_generated += 1
 
+        if trace is not None:
+            trace.emit(EXPAND, current)
+
         # Обновляем максимальную глубину
         max_depth = max(max_depth, depth)
 
         # Генерируем все возможные действия (0-3)
         for action in range(4):
-            next_situation = make_move(current_situation, action)
-
-            # Если новая ситуация валидна и не посещено ранее
-            if (
-                next_situation
-                and next_situation.valid
-                and next_situation not in visited
-            ):
-                # Добавляем новую ситуацию в стек с обновлённым путём
-                stack.append((next_situation, path + [action], depth + 1))
+            next_cell = current + offsets[action]
+
+            # Если новая клетка не стена и не посещена ранее
+            if not walls[next_cell] and not visited[next_cell]:
+                # Добавляем новую ситуацию в стек
+                stack.append((next_cell, action, depth + 1))
+                if trace is not None:
+                    trace.emit(GENERATE, next_cell)
+
+    if budget is not None and budget.exhausted:
+        # Бюджет исчерпан: возвращаем путь к ближайшей к цели посещённой клетке
+        cell = grid.nearest(visited, goal, start)
+        path = grid.path(came_from, cell, start)
+        if trace is not None:
+            trace.finish(path)
+
+        return path, Statistic(
+            len(path),
+            max_depth,
+            all_generated,
+            max_frontier,
+            visited.count(1),
+            truncated=True,
+        )
+
+    if trace is not None:
+        trace.finish(None)
 
     return None  # Решение не найдено
@@ -1,13 +1,24 @@
+from math import hypot
 from typing import List, Optional
 
+from analyzer.budget import Budget
 from analyzer.statistic import Statistic
-from maze.environment import Situation, make_move
+from analyzer.trace import EXPAND, GENERATE, SearchTrace
+from maze.environment import Situation
+from maze.grid import Grid
 
 
 # Функция поиска в глубину
-def dfs_with_cmp(initial_situation: Situation) -> Optional[tuple[List[int], Statistic]]:
+def dfs_with_cmp(
+    initial_situation: Situation,
+    trace: Optional[SearchTrace] = None,
+    budget: Optional[Budget] = None,
+) -> Optional[tuple[List[int], Statistic]]:
     """
     :param initial_situation: начальное ситуация лабиринта
+    :param trace: приёмник событий поиска; без него события не собираются
+    :param budget: ограничение раскрытий, времени или памяти; исчерпав его,
+                   поиск возвращает путь к ближайшей к цели посещённой клетке
     :return: список действий, приводящих к цели, или None, если решение не найдено
 
     Функция поиска решения в лабиринте с использованием алгоритма поиска в глубину (DFS)
@@ -24,25 +35,62 @@ def dfs_with_cmp(initial_situation: Situation) -> Optional[tuple[List[int], Stat
        - Если следующая ситуация валидна и ещё не посещена, добавляем её в стек с обновлённым путём.
     6. Если решение не найдено, возвращаем None.
     """
-    visited = set()  # Храним все посещённые ситуации
+    if budget is not None:
+        budget.start()
+
+    grid = Grid(initial_situation.maze)
+    walls = grid.walls
+    offsets = grid.offsets
+    goal = grid.index(initial_situation.goal)
+    goal_row, goal_col = divmod(goal, grid.stride)
+
+    start = grid.index(initial_situation.position)
+
+    visited = grid.visited()  # Битовая карта посещённых клеток
+    came_from = grid.predecessors()  # Действие, которым достигнута клетка
     stack = [
-        (initial_situation, [], 0)
-    ]  # Каждый элемент: (текущая ситуация, путь действий)
+        (start, 0, 0)
+    ]  # Каждый элемент: (текущая клетка, последнее действие, глубина)
 
     max_depth = 0  # Максимальная глубина поиска
     all_generated = 0  # Общее число порождённых вершин
+    max_frontier = 0  # Максимальный размер фронта поиска
+
+    def distance(cell: int) -> float:
+        """Евклидово расстояние от клетки cell до цели."""
+        row, col = divmod(cell, grid.stride)
+        return hypot(row - goal_row, col - goal_col)
 
     while stack:
-        current_situation, path, depth = stack.pop()
+        max_frontier = max(max_frontier, len(stack))
+
+        current, last_action, depth = stack.pop()
+
+        # Запоминаем предшественника. Повторное раскрытие клетки перезаписывает
+        # его, но записи её потомков в стеке к этому моменту уже обработаны
+        came_from[current] = last_action
 
         # Проверяем, достигнуто ли целевое ситуация
-        if current_situation.finished:
-            return path, Statistic(len(path), max_depth + 1, all_generated)
+        if current == goal:
+            path = grid.path(came_from, current, start)
+            if trace is not None:
+                trace.finish(path, goal)
+
+            return path, Statistic(
+                len(path), max_depth + 1, all_generated, max_frontier, visited.count(1)
+            )
+
+        # Останавливаемся, если бюджет поиска исчерпан
+        if budget is not None and budget.spend():
+            break
 
         # Добавляем текущую ситуацию в посещённые
-        visited.add(current_situation)
+        visited[current] = 1
         all_generated += 1
 
+        if trace is not None:
+            trace.emit(EXPAND, current)
+
         # Обновляем максимальную глубину
         max_depth = max(max_depth, depth)
 
@@ -50,18 +98,35 @@ def dfs_with_cmp(initial_situation: Situation) -> Optional[tuple[List[int], Stat
         next_actions = list(range(4))
 
         # Сортируем возможные действия так, чтобы робот был ближе к цели
-        next_actions.sort(key=lambda action: make_move(current_situation, action))
+        next_actions.sort(key=lambda action: distance(current + offsets[action]))
 
         for action in next_actions:
-            next_situation = make_move(current_situation, action)
-
-            # Если новая ситуация валидна и не посещено ранее
-            if (
-                next_situation
-                and next_situation.valid
-                and next_situation not in visited
-            ):
-                # Добавляем новую ситуацию в стек с обновлённым путём
-                stack.append((next_situation, path + [action], depth + 1))
+            next_cell = current + offsets[action]
+
+            # Если новая клетка не стена и не посещена ранее
+            if not walls[next_cell] and not visited[next_cell]:
+                # Добавляем новую ситуацию в стек
+                stack.append((next_cell, action, depth + 1))
+                if trace is not None:
+                    trace.emit(GENERATE, next_cell)
+
+    if budget is not None and budget.exhausted:
+        # Бюджет исчерпан: возвращаем путь к ближайшей к цели посещённой клетке
+        cell = grid.nearest(visited, goal, start)
+        path = grid.path(came_from, cell, start)
+        if trace is not None:
+            trace.finish(path)
+
+        return path, Statistic(
+            len(path),
+            max_depth,
+            all_generated,
+            max_frontier,
+            visited.count(1),
+            truncated=True,
+        )
+
+    if trace is not None:
+        trace.finish(None)
 
     return None  # Решение не найдено
@@ -0,0 +1,281 @@
+from heapq import heappop, heappush
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from analyzer.budget import Budget
+from analyzer.statistic import Statistic
+from analyzer.trace import EXPAND, SearchTrace
+from maze.environment import Situation
+from maze.grid import Grid
+
+INFINITY = float("inf")
+
+
+class DStarLite:
+    def __init__(
+        self,
+        initial_situation: Situation,
+        trace: Optional[SearchTrace] = None,
+        budget: Optional[Budget] = None,
+    ):
+        """
+        Создаёт инкрементальный планировщик D* Lite.
+
+        Поиск ведётся от цели к роботу и сохраняет своё состояние между
+        вызовами plan: после изменения клеток лабиринта (update) или
+        перемещения робота (move) пересчитываются только вершины, чьи
+        расстояния до цели действительно изменились, поэтому время
+        перепланирования зависит от размера изменения, а не лабиринта.
+
+        :param initial_situation: начальная ситуация лабиринта
+        :type initial_situation: Situation
+        :param trace: приёмник событий поиска; без него события не собираются
+        :type trace: SearchTrace
+        :param budget: ограничение раскрытий, времени или памяти на каждый
+                       вызов plan; исчерпав его, plan возвращает пустой путь
+                       (поиск идёт от цели и ещё не достиг робота), а
+                       следующий вызов продолжает прерванный поиск
+        :type budget: Budget
+        """
+        self.maze = initial_situation.maze
+        self.trace = trace
+        self.budget = budget
+        self.grid = Grid(self.maze)
+
+        self.start = self.grid.index(initial_situation.position)
+        self.goal = self.grid.index(initial_situation.goal)
+        self.km = 0  # Поправка ключей, накопленная при перемещениях робота
+
+        self.g = [INFINITY] * self.grid.size  # Расстояние до цели
+        self.rhs = [INFINITY] * self.grid.size  # Оценка через соседей
+        self.rhs[self.goal] = 0
+        self.queue: List[Tuple[Tuple[float, float], int]] = []
+        self.queued: Dict[int, Tuple[float, float]] = {}  # Актуальные ключи очереди
+
+        self.push(self.goal)
+
+    def heuristic(self, cell: int) -> int:
+        """Манхэттенское расстояние от клетки cell до робота."""
+        row, col = divmod(cell, self.grid.stride)
+        start_row, start_col = divmod(self.start, self.grid.stride)
+        return abs(row - start_row) + abs(col - start_col)
+
+    def key(self, cell: int) -> Tuple[float, float]:
+        """Ключ вершины в очереди с приоритетом."""
+        value = min(self.g[cell], self.rhs[cell])
+        return value + self.heuristic(cell) + self.km, value
+
+    def push(self, cell: int):
+        """Добавляет вершину в очередь с актуальным ключом."""
+        key = self.key(cell)
+        self.queued[cell] = key
+        heappush(self.queue, (key, cell))
+
+    def update_vertex(self, cell: int):
+        """Пересчитывает оценку rhs клетки и её место в очереди."""
+        walls = self.grid.walls
+        g = self.g
+
+        if cell != self.goal:
+            best = INFINITY
+            if not walls[cell]:
+                for offset in self.grid.offsets:
+                    if not walls[cell + offset]:
+                        best = min(best, g[cell + offset] + 1)
+            self.rhs[cell] = best
+
+        if g[cell] != self.rhs[cell]:
+            self.push(cell)
+        else:
+            self.queued.pop(cell, None)
+
+    def top(self) -> Optional[Tuple[Tuple[float, float], int]]:
+        """Возвращает актуальную вершину с наименьшим ключом, удаляя устаревшие."""
+        queue = self.queue
+        while queue and self.queued.get(queue[0][1]) != queue[0][0]:
+            heappop(queue)
+        return queue[0] if queue else None
+
+    def compute(self) -> Tuple[int, int, int]:
+        """
+        Раскрывает несогласованные вершины, пока расстояние до робота
+        не станет точным.
+
+        :return: число раскрытий, максимальная глубина и максимальный
+                 размер очереди
+        :rtype: Tuple[int, int, int]
+        """
+        walls = self.grid.walls
+        offsets = self.grid.offsets
+        g, rhs = self.g, self.rhs
+        trace = self.trace
+        budget = self.budget
+
+        expanded = 0  # Число раскрытых вершин
+        max_depth = 0  # Максимальная глубина поиска
+        max_frontier = 0  # Максимальный размер очереди
+
+        while True:
+            max_frontier = max(max_frontier, len(self.queue))
+
+            entry = self.top()
+            start_key = self.key(self.start)
+            if entry is None or (
+                entry[0] >= start_key and rhs[self.start] == g[self.start]
+            ):
+                break
+
+            # Останавливаемся, если бюджет поиска исчерпан; очередь остаётся
+            # согласованной, и следующий вызов продолжит поиск
+            if budget is not None and budget.spend():
+                break
+
+            old_key, cell = heappop(self.queue)
+            new_key = self.key(cell)
+            expanded += 1
+
+            if old_key < new_key:
+                # Ключ устарел после перемещения робота: возвращаем в очередь
+                self.push(cell)
+                continue
+
+            del self.queued[cell]
+
+            if trace is not None:
+                trace.emit(EXPAND, cell)
+
+            if g[cell] > rhs[cell]:
+                # Расстояние уменьшилось: вершина становится согласованной
+                g[cell] = rhs[cell]
+                max_depth = max(max_depth, g[cell])
+                neighbours = []
+            else:
+                # Расстояние увеличилось: сбрасываем и пересчитываем её саму
+                g[cell] = INFINITY
+                neighbours = [cell]
+
+            for offset in offsets:
+                if not walls[cell + offset]:
+                    neighbours.append(cell + offset)
+
+            for neighbour in neighbours:
+                self.update_vertex(neighbour)
+
+        return expanded, max_depth, max_frontier
+
+    def update(self, cells: Iterable[np.ndarray]):
+        """
+        Учитывает изменение клеток лабиринта.
+
+        Новые значения клеток читаются из матрицы лабиринта, поэтому её нужно
+        изменить до вызова. Пересчёт выполняется при следующем вызове plan.
+
+        :param cells: координаты изменившихся клеток
+        :type cells: Iterable[numpy 1D array]
+        """
+        walls = self.grid.walls
+
+        for position in cells:
+            cell = self.grid.index(position)
+            walls[cell] = int(self.maze[int(position[0]), int(position[1])] == 1)
+
+            # Меняются рёбра клетки во все стороны: пересчитываем её и соседей
+            self.update_vertex(cell)
+            for offset in self.grid.offsets:
+                if not walls[cell + offset]:
+                    self.update_vertex(cell + offset)
+
+    def move(self, position: np.ndarray):
+        """
+        Переносит робота в клетку position, сохраняя состояние поиска.
+
+        :param position: новые координаты робота
+        :type position: numpy 1D array
+        """
+        cell = self.grid.index(position)
+        self.km += self.heuristic(cell)
+        self.start = cell
+
+    def plan(self) -> Optional[tuple[List[int], Statistic]]:
+        """
+        Восстанавливает кратчайший путь от робота до цели.
+
+        :return: список действий и статистика текущего перепланирования
+                 или None, если цель недостижима
+        """
+        if self.budget is not None:
+            self.budget.start()
+
+        expanded, max_depth, max_frontier = self.compute()
+
+        walls = self.grid.walls
+        offsets = self.grid.offsets
+        g = self.g
+
+        # Вершины с конечным расстоянием до цели - посещённые за всё время
+        visited = len(g) - g.count(INFINITY)
+
+        if self.budget is not None and self.budget.exhausted:
+            # Бюджет исчерпан: расстояния от робота ещё не точны, робот
+            # остаётся на месте
+            if self.trace is not None:
+                self.trace.finish([])
+
+            return [], Statistic(
+                0, max_depth, expanded, max_frontier, visited, truncated=True
+            )
+
+        if g[self.start] == INFINITY:
+            if self.trace is not None:
+                self.trace.finish(None)
+
+            return None  # Решение не найдено
+
+        # Спускаемся по расстояниям до цели
+        path = []
+        cell = self.start
+        while cell != self.goal:
+            action = min(
+                (action for action in range(4) if not walls[cell + offsets[action]]),
+                key=lambda action: g[cell + offsets[action]],
+            )
+            path.append(action)
+            cell += offsets[action]
+
+        if self.trace is not None:
+            self.trace.finish(path, self.goal)
+
+        return path, Statistic(len(path), max_depth, expanded, max_frontier, visited)
+
+
+# Функция поиска D* Lite
+def dstar_lite(
+    initial_situation: Situation,
+    trace: Optional[SearchTrace] = None,
+    budget: Optional[Budget] = None,
+) -> Optional[tuple[List[int], Statistic]]:
+    """
+    :param initial_situation: начальная ситуация лабиринта
+    :param trace: приёмник событий поиска; без него события не собираются
+    :param budget: ограничение раскрытий, времени или памяти; исчерпав его,
+                   поиск возвращает пустой путь (см. DStarLite)
+    :return: список действий, ведущих к цели, или None, если решение не найдено
+
+    Функция поиска решения в лабиринте с использованием алгоритма D* Lite.
+
+    Однократный вызов выполняет полный поиск от цели к старту; для
+    перепланирования после изменений лабиринта используется класс
+    DStarLite, сохраняющий состояние поиска между вызовами.
+
+    Алгоритм работает следующим образом:
+    1. Инициализируем очередь целевой клеткой с оценкой rhs = 0.
+    2. Раскрываем вершину с наименьшим ключом (g + h, g): если её оценка
+       уменьшилась, фиксируем её, иначе сбрасываем и пересчитываем.
+    3. Пересчитываем оценки rhs соседей по их расстояниям g.
+    4. Останавливаемся, когда ключ стартовой клетки не больше наименьшего
+       ключа очереди и её оценки согласованы.
+    5. Спускаемся от старта к цели по убыванию g; если g старта бесконечно,
+       решение не найдено.
+    """
+    return DStarLite(initial_situation, trace, budget).plan()
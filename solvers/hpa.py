@@ -0,0 +1,171 @@
+from heapq import heappop, heappush
+from typing import List, Optional
+
+from analyzer.budget import Budget
+from analyzer.statistic import Statistic
+from analyzer.trace import EXPAND, GENERATE, SearchTrace
+from maze.environment import Situation
+from maze.hierarchy import Hierarchy
+
+
+# Функция иерархического поиска (HPA*)
+def hpa(
+    initial_situation: Situation,
+    hierarchy: Optional[Hierarchy] = None,
+    trace: Optional[SearchTrace] = None,
+    budget: Optional[Budget] = None,
+) -> Optional[tuple[List[int], Statistic]]:
+    """
+    :param initial_situation: начальная ситуация лабиринта
+    :param hierarchy: заранее построенная (или загруженная из файла)
+                      абстракция этого лабиринта
+    :param trace: приёмник событий поиска; без него события не собираются
+    :param budget: ограничение раскрытий, времени или памяти; исчерпав его,
+                   поиск возвращает путь к ближайшей к цели раскрытой вершине
+    :return: список действий, ведущих к цели, или None, если решение не найдено
+
+    Функция иерархического поиска пути (Hierarchical Path-Finding A*).
+
+    Поиск ведётся не по клеткам, а по входам кластеров, поэтому число
+    раскрытий растёт с числом кластеров, а не с площадью лабиринта. Путь
+    близок к кратчайшему, но не обязательно оптимален: внутри кластера
+    учитываются только пути, не выходящие за его границы.
+
+    Алгоритм работает следующим образом:
+    1. Строим абстракцию лабиринта, если она не передана.
+    2. Присоединяем стартовую и целевую клетки к входам их кластеров
+       поиском в ширину внутри кластера.
+    3. Ищем путь по абстрактному графу алгоритмом A* с манхэттенской
+       эвристикой.
+    4. Если цель достигнута, уточняем каждое абстрактное ребро до действий
+       по клеткам поиском внутри кластера.
+    5. Если очередь пуста, решение не найдено.
+    """
+    if budget is not None:
+        budget.start()
+
+    if hierarchy is None:
+        hierarchy = Hierarchy.build(initial_situation.maze)
+
+    grid = hierarchy.grid
+    edges = hierarchy.edges
+    stride = grid.stride
+
+    start = grid.index(initial_situation.position)
+    goal = grid.index(initial_situation.goal)
+    goal_row, goal_col = divmod(goal, stride)
+
+    def heuristic(cell: int) -> int:
+        """Манхэттенское расстояние от клетки cell до цели."""
+        row, col = divmod(cell, stride)
+        return abs(row - goal_row) + abs(col - goal_col)
+
+    # Рёбра от старта к входам его кластера (и к цели, если она рядом)
+    start_links = None
+    if start not in edges:
+        distances, _ = hierarchy.explore(start)
+        start_links = [
+            (cell, cost)
+            for cell, cost in distances.items()
+            if cell in edges or cell == goal
+        ]
+
+    # Рёбра от входов кластера цели к цели
+    extra = {}
+    if goal not in edges:
+        distances, _ = hierarchy.explore(goal)
+        for cell, cost in distances.items():
+            if cell in edges:
+                extra.setdefault(cell, []).append((goal, cost))
+
+    def links(node: int):
+        """Рёбра, исходящие из вершины node."""
+        if node == start and start_links is not None:
+            return start_links
+        return edges.get(node, []) + extra.get(node, [])
+
+    queue = [(heuristic(start), 0, start)]  # Очередь с приоритетом (f, -g, вершина)
+    best = {start: 0}  # Лучшая известная длина пути до вершины
+    came_from = {}  # Карта: вершина -> предыдущая вершина
+    closed = set()  # Раскрытые вершины
+
+    def unwind(node: int) -> List[int]:
+        """Уточняет путь по абстрактному графу до вершины node в действия."""
+        nodes = [node]
+        while node != start:
+            node = came_from[node]
+            nodes.append(node)
+        nodes.reverse()
+
+        path = []
+        for cell, target in zip(nodes, nodes[1:]):
+            path += hierarchy.refine(cell, target)
+        return path
+
+    max_depth = 0  # Максимальная глубина поиска
+    all_generated = 0  # Общее число порождённых вершин
+    max_frontier = 0  # Максимальный размер фронта поиска
+
+    while queue:
+        max_frontier = max(max_frontier, len(queue))
+
+        _, depth, node = heappop(queue)
+        depth = -depth
+
+        # Проверяем, достигнута ли целевая ситуация
+        if node == goal:
+            path = unwind(node)
+
+            if trace is not None:
+                trace.finish(path, goal)
+
+            return path, Statistic(
+                len(path), max_depth, all_generated, max_frontier, len(closed)
+            )
+
+        # Пропускаем устаревшие записи уже раскрытых вершин
+        if node in closed:
+            continue
+
+        # Останавливаемся, если бюджет поиска исчерпан
+        if budget is not None and budget.spend():
+            break
+
+        closed.add(node)
+        all_generated += 1
+
+        if trace is not None:
+            trace.emit(EXPAND, node)
+
+        # Обновляем максимальную глубину
+        max_depth = max(max_depth, depth)
+
+        for end, length in links(node):
+            next_depth = depth + length
+
+            if next_depth < best.get(end, next_depth + 1):
+                best[end] = next_depth
+                came_from[end] = node
+                heappush(queue, (next_depth + heuristic(end), -next_depth, end))
+                if trace is not None:
+                    trace.emit(GENERATE, end)
+
+    if budget is not None and budget.exhausted:
+        # Бюджет исчерпан: возвращаем путь к ближайшей к цели раскрытой вершине
+        path = unwind(grid.nearest(closed, goal, start))
+        if trace is not None:
+            trace.finish(path)
+
+        return path, Statistic(
+            len(path),
+            max_depth,
+            all_generated,
+            max_frontier,
+            len(closed),
+            truncated=True,
+        )
+
+    if trace is not None:
+        trace.finish(None)
+
+    return None  # Решение не найдено
@@ -0,0 +1,196 @@
+from heapq import heappop, heappush
+from typing import List, Optional
+
+from analyzer.budget import Budget
+from analyzer.statistic import Statistic
+from analyzer.trace import EXPAND, GENERATE, SearchTrace
+from maze.environment import Situation
+from maze.grid import Grid
+from maze.landmarks import Landmarks
+
+
+# Функция поиска с прыжками по точкам (Jump Point Search)
+def jps(
+    initial_situation: Situation,
+    landmarks: Optional[Landmarks] = None,
+    trace: Optional[SearchTrace] = None,
+    budget: Optional[Budget] = None,
+) -> Optional[tuple[List[int], Statistic]]:
+    """
+    :param initial_situation: начальная ситуация лабиринта
+    :param landmarks: ориентиры для эвристики ALT; если заданы, оценка
+                      усиливается неравенством треугольника
+    :param trace: приёмник событий поиска; без него события не собираются
+    :param budget: ограничение раскрытий, времени или памяти; исчерпав его,
+                   поиск возвращает путь к ближайшей к цели раскрытой точке прыжка
+    :return: список действий, ведущих к цели, или None, если решение не найдено
+
+    Функция поиска решения в лабиринте с использованием алгоритма
+    Jump Point Search для сетки с четырьмя действиями.
+
+    Из каждой клетки поиск «прыгает» по прямой, пропуская симметричные пути
+    равной длины, и останавливается только в точках прыжка: в цели, в клетках
+    с вынужденными соседями (проход сбоку, которого не было в предыдущей
+    клетке) и, при вертикальном движении, в клетках, из которых горизонтальный
+    прыжок находит точку прыжка. Между точками прыжка выполняется A*.
+
+    Алгоритм работает следующим образом:
+    1. Инициализируем приоритетную очередь (f, -g, клетка) стартовой клеткой.
+    2. Извлекаем клетку с наименьшим f; устаревшие записи пропускаем.
+    3. Проверяем, достигнута ли целевая ситуация — если да, разворачиваем
+       отрезки между точками прыжка в действия.
+    4. Для каждого неотсечённого направления прыгаем до следующей точки
+       прыжка и добавляем её в очередь, если путь к ней стал короче.
+    5. Если решение не найдено, возвращаем None.
+    """
+    if budget is not None:
+        budget.start()
+
+    grid = Grid(initial_situation.maze)
+    walls = grid.walls
+    offsets = grid.offsets
+    stride = grid.stride
+
+    start = grid.index(initial_situation.position)
+    goal = grid.index(initial_situation.goal)
+    goal_row, goal_col = divmod(goal, stride)
+
+    def heuristic(cell: int) -> int:
+        """Манхэттенское расстояние от клетки cell до цели."""
+        row, col = divmod(cell, stride)
+        return abs(row - goal_row) + abs(col - goal_col)
+
+    if landmarks is not None:
+        heuristic = landmarks.heuristic(initial_situation.goal)
+
+    def jump(cell: int, action: int) -> Optional[int]:
+        """Прыгает из клетки cell в направлении action до точки прыжка."""
+        offset = offsets[action]
+        cell += offset
+
+        while not walls[cell]:
+            if cell == goal:
+                return cell
+
+            previous = cell - offset
+
+            if action in (0, 3):
+                # Горизонтальное движение: вынужденные соседи сверху и снизу
+                for side in (stride, -stride):
+                    if not walls[cell + side] and walls[previous + side]:
+                        return cell
+            else:
+                # Вертикальное движение: вынужденные соседи слева и справа
+                for side in (1, -1):
+                    if not walls[cell + side] and walls[previous + side]:
+                        return cell
+
+                # Горизонтальные прыжки из клетки находят точки прыжка
+                if jump(cell, 0) is not None or jump(cell, 3) is not None:
+                    return cell
+
+            cell += offset
+
+        return None
+
+    queue = [(heuristic(start), 0, start)]  # Очередь с приоритетом (f, -g, клетка)
+    best = {start: 0}  # Лучшая известная длина пути до точки прыжка
+    came_from = {}  # Карта: точка прыжка -> (предыдущая точка, действие, длина)
+    visited = grid.visited()  # Битовая карта раскрытых точек прыжка
+
+    def unwind(cell: int) -> List[int]:
+        """Разворачивает отрезки между точками прыжка до клетки cell в действия."""
+        path = []
+        while cell != start:
+            cell, action, length = came_from[cell]
+            path += [action] * length
+        path.reverse()
+        return path
+
+    max_depth = 0  # Максимальная глубина поиска
+    all_generated = 0  # Общее число порождённых вершин
+    max_frontier = 0  # Максимальный размер фронта поиска
+
+    while queue:
+        max_frontier = max(max_frontier, len(queue))
+
+        _, depth, current = heappop(queue)
+        depth = -depth
+
+        # Проверяем, достигнута ли целевая ситуация
+        if current == goal:
+            path = unwind(current)
+
+            if trace is not None:
+                trace.finish(path, goal)
+
+            return path, Statistic(
+                len(path), max_depth, all_generated, max_frontier, visited.count(1)
+            )
+
+        # Пропускаем устаревшие записи уже раскрытых клеток
+        if visited[current]:
+            continue
+
+        # Останавливаемся, если бюджет поиска исчерпан
+        if budget is not None and budget.spend():
+            break
+
+        visited[current] = 1
+        all_generated += 1
+
+        if trace is not None:
+            trace.emit(EXPAND, current)
+
+        # Обновляем максимальную глубину
+        max_depth = max(max_depth, depth)
+
+        # Отсекаем направления: из стартовой клетки рассматриваются все,
+        # иначе - продолжение движения и повороты, но не разворот
+        if current == start:
+            actions = range(4)
+        else:
+            arrived = came_from[current][1]
+            actions = [a for a in range(4) if a != 3 - arrived]
+
+        for action in actions:
+            jump_point = jump(current, action)
+
+            if jump_point is None:
+                continue
+
+            length = abs(jump_point - current)
+            if action in (1, 2):
+                length //= stride
+
+            next_depth = depth + length
+
+            if next_depth < best.get(jump_point, next_depth + 1):
+                best[jump_point] = next_depth
+                came_from[jump_point] = (current, action, length)
+                heappush(
+                    queue,
+                    (next_depth + heuristic(jump_point), -next_depth, jump_point),
+                )
+                if trace is not None:
+                    trace.emit(GENERATE, jump_point)
+
+    if budget is not None and budget.exhausted:
+        # Бюджет исчерпан: возвращаем путь к ближайшей к цели раскрытой точке
+        path = unwind(grid.nearest(visited, goal, start))
+        if trace is not None:
+            trace.finish(path)
+
+        return path, Statistic(
+            len(path),
+            max_depth,
+            all_generated,
+            max_frontier,
+            visited.count(1),
+            truncated=True,
+        )
+
+    if trace is not None:
+        trace.finish(None)
+
+    return None  # Решение не найдено
@@ -0,0 +1,148 @@
+from heapq import heappop, heappush
+from typing import List, Optional
+
+from analyzer.budget import Budget
+from analyzer.statistic import Statistic
+from analyzer.trace import EXPAND, GENERATE, SearchTrace
+from maze.environment import Situation
+from maze.grid import Grid
+from maze.junctions import JunctionGraph
+
+
+# Функция поиска по сжатому графу развилок
+def junction_search(
+    initial_situation: Situation,
+    graph: Optional[JunctionGraph] = None,
+    trace: Optional[SearchTrace] = None,
+    budget: Optional[Budget] = None,
+) -> Optional[tuple[List[int], Statistic]]:
+    """
+    :param initial_situation: начальная ситуация лабиринта
+    :param graph: заранее построенный граф развилок этого лабиринта
+    :param trace: приёмник событий поиска; без него события не собираются
+    :param budget: ограничение раскрытий, времени или памяти; исчерпав его,
+                   поиск возвращает путь к ближайшей к цели достигнутой вершине
+    :return: список действий, ведущих к цели, или None, если решение не найдено
+
+    Функция поиска по сжатому графу развилок (Corridor contraction).
+
+    Коридоры шириной в одну клетку заменяются взвешенными рёбрами между
+    развилками и тупиками, поэтому каждое раскрытие проходит весь коридор
+    целиком, а не одну клетку.
+
+    Алгоритм работает следующим образом:
+    1. Строим граф развилок лабиринта.
+    2. Присоединяем к графу стартовую и целевую клетки, если они лежат
+       внутри коридоров.
+    3. Ищем кратчайший путь алгоритмом равных цен по взвешенным рёбрам.
+    4. Если цель достигнута, разворачиваем каждое ребро пути обратно в
+       действия по клеткам коридора.
+    5. Если очередь пуста, решение не найдено.
+    """
+    if budget is not None:
+        budget.start()
+
+    if graph is None:
+        graph = JunctionGraph(Grid(initial_situation.maze))
+
+    grid = graph.grid
+
+    start = grid.index(initial_situation.position)
+    goal = grid.index(initial_situation.goal)
+
+    # Рёбра от ключевых клеток к цели, лежащей внутри коридора
+    extra = {}
+    if not graph.keys[goal]:
+        for end, cost, _, last_action in graph.attach(goal):
+            extra.setdefault(end, []).append((goal, cost, 3 - last_action))
+
+    def links(node: int):
+        """Рёбра, исходящие из вершины node."""
+        if node == start and not graph.keys[start]:
+            return [
+                (end, cost, action)
+                for end, cost, action, _ in graph.attach(start, [goal])
+            ]
+        return graph.edges.get(node, []) + extra.get(node, [])
+
+    queue = [(0, start)]  # Очередь с приоритетом (стоимость, вершина)
+    best = {start: 0}  # Лучшая известная стоимость вершины
+    came_from = {}  # Карта: вершина -> (предыдущая вершина, действие, длина ребра)
+
+    def unwind(node: int) -> List[int]:
+        """Разворачивает рёбра пути до вершины node в действия по коридорам."""
+        edges = []
+        while node != start:
+            node, action, length = came_from[node]
+            edges.append((node, action, length))
+
+        path = []
+        for node, action, length in reversed(edges):
+            path += graph.corridor(node, action, length)
+        return path
+
+    max_depth = 0  # Максимальная глубина поиска
+    all_generated = 0  # Общее число порождённых вершин
+    max_frontier = 0  # Максимальный размер фронта поиска
+
+    while queue:
+        max_frontier = max(max_frontier, len(queue))
+
+        cost, node = heappop(queue)
+
+        # Пропускаем устаревшие записи очереди
+        if cost > best[node]:
+            continue
+
+        # Проверяем, достигнута ли целевая ситуация
+        if node == goal:
+            path = unwind(node)
+
+            if trace is not None:
+                trace.finish(path, goal)
+
+            return path, Statistic(
+                len(path), max_depth, all_generated, max_frontier, len(best)
+            )
+
+        # Останавливаемся, если бюджет поиска исчерпан
+        if budget is not None and budget.spend():
+            break
+
+        all_generated += 1
+
+        if trace is not None:
+            trace.emit(EXPAND, node)
+
+        # Обновляем максимальную глубину
+        max_depth = max(max_depth, cost)
+
+        for end, length, action in links(node):
+            next_cost = cost + length
+
+            if next_cost < best.get(end, next_cost + 1):
+                best[end] = next_cost
+                came_from[end] = (node, action, length)
+                heappush(queue, (next_cost, end))
+                if trace is not None:
+                    trace.emit(GENERATE, end)
+
+    if budget is not None and budget.exhausted:
+        # Бюджет исчерпан: возвращаем путь к ближайшей к цели достигнутой вершине
+        path = unwind(grid.nearest(best, goal, start))
+        if trace is not None:
+            trace.finish(path)
+
+        return path, Statistic(
+            len(path),
+            max_depth,
+            all_generated,
+            max_frontier,
+            len(best),
+            truncated=True,
+        )
+
+    if trace is not None:
+        trace.finish(None)
+
+    return None  # Решение не найдено
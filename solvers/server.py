@@ -0,0 +1,488 @@
+# Локальный сервер решателей: принимает запросы в формате JSON Lines через
+# сокет Unix или TCP на localhost, группирует одновременные запросы к одному
+# лабиринту в пакеты и решает их в пуле процессов с ограничением времени.
+#
+# Запрос - одна строка JSON:
+#     {"id": 1, "maze": "maze.npy", "start": [0, 0], "goal": [30, 30],
+#      "solver": "astar", "timeout": 5}
+# Необязательный "budget" ({"max_expansions": ..., "max_time": ...,
+# "max_memory": ...}) ограничивает поиск; исчерпав его, решатель возвращает
+# частичный путь, а в статистике ответа "truncated" равно true.
+# Вместо "maze" можно передать сам лабиринт ("upload": [[0, 1, ...], ...])
+# или отпечаток ранее переданного лабиринта ("key": "...").
+# Ответ - одна строка JSON с тем же id:
+#     {"id": 1, "actions": [...] или null, "statistic": {...}, "key": "..."}
+# или {"id": 1, "error": "..."}; ответы могут приходить не по порядку.
+
+import asyncio
+import json
+import multiprocessing
+import os
+from typing import Any, Dict, List, Optional, Set, Union
+
+import numpy as np
+
+from analyzer.budget import Budget
+from analyzer.statistic import Statistic, finite_values
+
+from .cache import SOLVERS, SolveCache
+
+# Ограничение времени одного запроса по умолчанию, с
+DEFAULT_TIMEOUT = 10.0
+
+# Сколько ждать других запросов к тому же лабиринту перед отправкой пакета, с
+BATCH_DELAY = 0.005
+
+# Наибольшая длина строки запроса (загружаемый лабиринт передаётся целиком)
+LINE_LIMIT = 1 << 26
+
+
+def serve_worker(connection):
+    """
+    Цикл процесса-исполнителя: получает пакеты запросов и возвращает ответы
+    по одному, по мере решения.
+
+    Лабиринты и их структуры остаются в кеше процесса между пакетами.
+
+    :param connection: конец канала, связанный с сервером
+    """
+    cache = SolveCache()
+
+    while True:
+        message = connection.recv()
+        if message is None:
+            return  # Сервер останавливается
+
+        reference, queries = message
+
+        try:
+            # Лабиринт загружается (или находится в кеше) один раз на пакет
+            if isinstance(reference, str):
+                entry = cache.load(reference)
+            else:
+                entry = cache.entry(reference, copy=False)
+        except Exception as error:
+            for _ in queries:
+                connection.send(("error", f"{type(error).__name__}: {error}"))
+            continue
+
+        for start, goal, solver, budget in queries:
+            try:
+                reply = ("ok", cache.solve(entry, start, goal, solver, budget))
+            except Exception as error:
+                reply = ("error", f"{type(error).__name__}: {error}")
+            connection.send(reply)
+
+
+class Worker:
+    def __init__(self, context: multiprocessing.context.BaseContext):
+        """
+        Создаёт процесс-исполнитель пула.
+
+        :param context: контекст multiprocessing, в котором создаются процессы
+        """
+        self.context = context
+        self.key: Optional[str] = None  # Лабиринт последнего пакета
+        self.start()
+
+    def start(self):
+        """Запускает процесс и канал связи с ним."""
+        self.connection, child = self.context.Pipe()
+        self.process = self.context.Process(
+            target=serve_worker, args=(child,), daemon=True
+        )
+        self.process.start()
+        child.close()
+
+    def send(self, reference: Union[str, np.ndarray], queries: List[tuple]):
+        """Передаёт процессу пакет запросов к лабиринту reference."""
+        self.connection.send((reference, queries))
+
+    def receive(self, timeout: Optional[float]) -> tuple:
+        """
+        Ждёт ответ на очередной запрос пакета.
+
+        :param timeout: наибольшее время ожидания, с (None - без ограничения)
+        :return: пара ("ok", результат) или ("error", сообщение)
+        :raises TimeoutError: если ответ не получен за timeout секунд
+        """
+        if not self.connection.poll(timeout):
+            raise TimeoutError
+        return self.connection.recv()
+
+    def restart(self):
+        """Прерывает поиск, завершая процесс, и запускает новый."""
+        self.process.terminate()
+        self.process.join()
+        self.connection.close()
+        self.key = None
+        self.start()
+
+    def close(self):
+        """Останавливает процесс."""
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.connection.close()
+
+
+class Query:
+    def __init__(
+        self,
+        start: tuple,
+        goal: tuple,
+        solver: str,
+        budget: Optional[Budget],
+        deadline: float,
+    ):
+        """
+        Хранит запрос, ожидающий решения в пакете.
+
+        :param start: координаты стартовой клетки
+        :param goal: координаты целевой клетки
+        :param solver: имя решателя (ключ SOLVERS)
+        :param budget: бюджет поиска или None
+        :param deadline: момент времени цикла событий, после которого
+                         поиск прерывается
+        """
+        self.start = start
+        self.goal = goal
+        self.solver = solver
+        self.budget = budget
+        self.deadline = deadline
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def resolve(self, reply: tuple):
+        """Передаёт ожидающему ответ исполнителя."""
+        if self.future.done():
+            return  # Клиент уже не ждёт ответа
+
+        status, value = reply
+        if status == "ok":
+            self.future.set_result(value)
+        else:
+            self.future.set_exception(RuntimeError(value))
+
+    def fail(self, error: Exception):
+        """Завершает запрос с ошибкой error."""
+        if not self.future.done():
+            self.future.set_exception(error)
+
+
+class Batch:
+    def __init__(self, key: str, reference: Union[str, np.ndarray]):
+        """
+        Хранит запросы к одному лабиринту, которые решаются одним
+        исполнителем за одну передачу лабиринта.
+
+        :param key: ключ лабиринта (путь к файлу или отпечаток)
+        :param reference: имя файла лабиринта или сам лабиринт
+        """
+        self.key = key
+        self.reference = reference
+        self.queries: List[Query] = []
+
+
+class SolveServer:
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        batch_delay: float = BATCH_DELAY,
+        maze_maxsize: int = 8,
+    ):
+        """
+        Создаёт сервер решателей.
+
+        Поиск выполняется в отдельных процессах, поэтому цикл событий не
+        блокируется, а поиск, превысивший ограничение времени, прерывается
+        завершением процесса-исполнителя.
+
+        :param workers: число процессов-исполнителей (None - по числу ядер)
+        :type workers: int
+        :param timeout: ограничение времени запроса по умолчанию, с
+        :type timeout: float
+        :param batch_delay: время сбора пакета запросов к одному лабиринту, с
+        :type batch_delay: float
+        :param maze_maxsize: число загруженных лабиринтов, хранимых сервером
+        :type maze_maxsize: int
+        """
+        self.timeout = timeout
+        self.batch_delay = batch_delay
+
+        # Загруженные клиентами лабиринты по отпечаткам
+        self.mazes = SolveCache(maze_maxsize=maze_maxsize)
+
+        # Процессы запускаются заново, а не копируют сервер вместе с потоками
+        context = multiprocessing.get_context("spawn")
+        self.workers = [Worker(context) for _ in range(workers or os.cpu_count())]
+        self.idle = list(self.workers)
+        self.available = asyncio.Semaphore(len(self.workers))
+
+        self.batches: Dict[str, Batch] = {}  # Собираемые пакеты по лабиринтам
+        self.tasks: Set[asyncio.Task] = set()
+
+    def reference(self, request: Dict[str, Any]) -> tuple:
+        """
+        Определяет лабиринт запроса.
+
+        :param request: разобранный запрос
+        :return: ключ лабиринта и ссылка на него для исполнителя
+        :raises ValueError: если лабиринт не задан или не найден
+        """
+        if "maze" in request:
+            filename = os.path.abspath(request["maze"])
+            if not os.path.exists(filename):
+                raise ValueError("Maze file not found: " + request["maze"])
+            return filename, filename
+
+        if "upload" in request:
+            maze = np.asarray(request["upload"], dtype=np.uint8)
+            if maze.ndim != 2:
+                raise ValueError("Uploaded maze must be a 2D array")
+            entry = self.mazes.entry(maze, copy=False)
+            return entry.key, entry.maze
+
+        if "key" in request:
+            entry = self.mazes.mazes.get(request["key"])
+            if entry is None:
+                raise ValueError("Unknown maze key: " + request["key"])
+            return entry.key, entry.maze
+
+        raise ValueError("Request has no maze, upload or key")
+
+    async def solve(
+        self,
+        key: str,
+        reference: Union[str, np.ndarray],
+        start: tuple,
+        goal: tuple,
+        solver: str,
+        timeout: Optional[float] = None,
+        budget: Optional[Budget] = None,
+    ) -> Optional[tuple[List[int], Statistic]]:
+        """
+        Решает лабиринт в пуле процессов.
+
+        Запрос присоединяется к собираемому пакету того же лабиринта, если
+        такой есть.
+
+        :param key: ключ лабиринта
+        :param reference: имя файла лабиринта или сам лабиринт
+        :param start: координаты стартовой клетки
+        :param goal: координаты целевой клетки
+        :param solver: имя решателя (ключ SOLVERS)
+        :param timeout: ограничение времени, с (None - по умолчанию сервера)
+        :param budget: бюджет поиска или None; в отличие от timeout, по его
+                       исчерпании возвращается частичный результат
+        :return: список действий и статистика или None, если решение не найдено
+        :raises TimeoutError: если решение не получено за отведённое время
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (self.timeout if timeout is None else timeout)
+
+        batch = self.batches.get(key)
+        if batch is None:
+            batch = self.batches[key] = Batch(key, reference)
+            task = asyncio.create_task(self.run(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+        query = Query(start, goal, solver, budget, deadline)
+        batch.queries.append(query)
+
+        # Страховка: запрос завершается по истечении времени, даже если
+        # пакет не смог ответить на него
+        return await asyncio.wait_for(query.future, max(deadline - loop.time(), 0))
+
+    async def run(self, batch: Batch):
+        """
+        Собирает пакет, дожидается свободного исполнителя и решает запросы
+        пакета, прерывая поиск по истечении времени запроса.
+
+        :param batch: пакет запросов
+        """
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(self.batch_delay)
+
+        async with self.available:
+            # Пока пакет ждал исполнителя, к нему могли добавиться запросы
+            if self.batches.get(batch.key) is batch:
+                del self.batches[batch.key]
+
+            # Предпочитаем исполнителя, у которого этот лабиринт уже загружен
+            worker = next(
+                (worker for worker in self.idle if worker.key == batch.key),
+                self.idle[0],
+            )
+            self.idle.remove(worker)
+
+            try:
+                pending = batch.queries
+                while pending:
+                    # Отменённые и просроченные запросы не решаются
+                    for query in pending:
+                        if loop.time() >= query.deadline:
+                            query.fail(TimeoutError())
+                    pending = [query for query in pending if not query.future.done()]
+                    if not pending:
+                        break
+
+                    try:
+                        worker.send(
+                            batch.reference,
+                            [
+                                (query.start, query.goal, query.solver, query.budget)
+                                for query in pending
+                            ],
+                        )
+                    except (EOFError, OSError):
+                        # Процесс завершился, пока простаивал: запросы пакета
+                        # передаются новому процессу
+                        await loop.run_in_executor(None, worker.restart)
+                        continue
+                    worker.key = batch.key
+
+                    for position, query in enumerate(pending):
+                        try:
+                            reply = await loop.run_in_executor(
+                                None,
+                                worker.receive,
+                                max(query.deadline - loop.time(), 0),
+                            )
+                        except (TimeoutError, EOFError, OSError) as error:
+                            # Поиск прерывается вместе с процессом; остальные
+                            # запросы пакета передаются новому процессу
+                            await loop.run_in_executor(None, worker.restart)
+                            if isinstance(error, TimeoutError):
+                                query.fail(error)
+                            else:
+                                query.fail(RuntimeError("Worker process failed"))
+                            pending = pending[position + 1 :]
+                            break
+
+                        query.resolve(reply)
+                    else:
+                        pending = []
+            except Exception as error:
+                # Ожидающие не должны остаться без ответа
+                for query in batch.queries:
+                    query.fail(RuntimeError(f"Worker failed: {error}"))
+            finally:
+                self.idle.append(worker)
+
+    async def request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Выполняет разобранный запрос клиента.
+
+        :param request: запрос (см. описание модуля)
+        :return: ответ без id
+        """
+        solver = request.get("solver", "bfs")
+        if solver not in SOLVERS:
+            raise ValueError("Unknown solver: " + str(solver))
+
+        key, reference = self.reference(request)
+        start = tuple(int(value) for value in request["start"])
+        goal = tuple(int(value) for value in request["goal"])
+
+        budget = None
+        if "budget" in request:
+            budget = Budget(**request["budget"])
+
+        result = await self.solve(
+            key, reference, start, goal, solver, request.get("timeout"), budget
+        )
+
+        reply: Dict[str, Any] = {"actions": None, "statistic": None}
+        if not isinstance(reference, str):
+            reply["key"] = key  # По отпечатку лабиринт можно не передавать снова
+
+        if result is not None:
+            actions, statistic = result
+            reply["actions"] = [int(action) for action in actions]
+            reply["statistic"] = statistic_fields(statistic)
+
+        return reply
+
+    async def respond(self, line: bytes, writer: asyncio.StreamWriter):
+        """Выполняет запрос из строки line и пишет ответ клиенту."""
+        request: Dict[str, Any] = {}
+
+        try:
+            request = json.loads(line)
+            reply = await self.request(request)
+        except TimeoutError:
+            reply = {"error": "timeout"}
+        except (KeyError, TypeError, ValueError, RuntimeError) as error:
+            reply = {"error": f"{type(error).__name__}: {error}"}
+
+        reply["id"] = request.get("id") if isinstance(request, dict) else None
+
+        writer.write(json.dumps(reply, default=native).encode() + b"\n")
+        await writer.drain()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Обслуживает соединение клиента: запросы выполняются одновременно,
+        ответы пишутся по мере готовности.
+        """
+        requests: Set[asyncio.Task] = set()
+
+        try:
+            async for line in reader:
+                if line.strip():
+                    task = asyncio.create_task(self.respond(line, writer))
+                    requests.add(task)
+                    task.add_done_callback(requests.discard)
+
+            await asyncio.gather(*requests, return_exceptions=True)
+        finally:
+            for task in requests:
+                task.cancel()
+            writer.close()
+
+    async def serve(self, path: Optional[str] = None, port: Optional[int] = None):
+        """
+        Принимает соединения до остановки сервера.
+
+        :param path: путь сокета Unix
+        :type path: string
+        :param port: порт TCP на localhost (если путь сокета не задан)
+        :type port: int
+        """
+        if path is not None:
+            server = await asyncio.start_unix_server(
+                self.handle, path, limit=LINE_LIMIT
+            )
+        else:
+            server = await asyncio.start_server(
+                self.handle, "127.0.0.1", port, limit=LINE_LIMIT
+            )
+
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        """Останавливает процессы-исполнители."""
+        for worker in self.workers:
+            worker.close()
+
+
+def statistic_fields(statistic: Statistic) -> Dict[str, Any]:
+    """
+    Значения статистики по полям analyzer.statistic.FIELDS; неопределённые
+    метрики пустого пути передаются как null (см. finite_values).
+    """
+    return finite_values(statistic.to_dict())
+
+
+def native(value: Any) -> Any:
+    """Переводит скаляры NumPy в типы Python для JSON."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
@@ -1,14 +1,25 @@
 from heapq import heappop, heappush
+from math import hypot
 from typing import List, Optional
 
+from analyzer.budget import Budget
 from analyzer.statistic import Statistic
-from maze.environment import Situation, make_move
+from analyzer.trace import EXPAND, GENERATE, SearchTrace
+from maze.environment import Situation
+from maze.grid import Grid
 
 
 # Функция поиска с использованием стратегии равных цен
-def ucs(initial_situation: Situation) -> Optional[tuple[List[int], Statistic]]:
+def ucs(
+    initial_situation: Situation,
+    trace: Optional[SearchTrace] = None,
+    budget: Optional[Budget] = None,
+) -> Optional[tuple[List[int], Statistic]]:
     """
     :param initial_situation: начальная ситуация лабиринта
+    :param trace: приёмник событий поиска; без него события не собираются
+    :param budget: ограничение раскрытий, времени или памяти; исчерпав его,
+                   поиск возвращает путь к ближайшей к цели посещённой клетке
     :return: список действий, ведущих к цели, или None, если решение не найдено
 
     Функция поиска решения в лабиринте с использованием алгоритма поиска по стратегии равных цен (Uniform Cost Search, UCS).
@@ -25,41 +36,100 @@ def ucs(initial_situation: Situation) -> Optional[tuple[List[int], Statistic]]:
        - Если следующая ситуация валидна и не посещена ранее, добавляем её в очередь с обновлённой стоимостью и путём.
     6. Если решение не найдено, возвращаем None.
     """
+    if budget is not None:
+        budget.start()
+
+    grid = Grid(initial_situation.maze)
+    walls = grid.walls
+    offsets = grid.offsets
+    goal = grid.index(initial_situation.goal)
+    goal_row, goal_col = divmod(goal, grid.stride)
+
+    def distance(cell: int) -> float:
+        """Евклидово расстояние от клетки cell до цели (для равных стоимостей)."""
+        row, col = divmod(cell, grid.stride)
+        return hypot(row - goal_row, col - goal_col)
+
+    start = grid.index(initial_situation.position)
+    # Равные по стоимости и расстоянию записи одной клетки упорядочены по
+    # последнему действию, а не по всему пути, как в исходной версии: среди
+    # равных по длине кратчайших путей может найтись другой
     queue = [
-        (0, initial_situation, [], 0)
-    ]  # Очередь с приоритетом (стоимость, ситуация, путь, глубина)
-    visited = set()  # Множество для хранения посещённых ситуаций
+        (0, distance(start), start, 0)
+    ]  # Очередь с приоритетом (стоимость, расстояние, клетка, действие)
+    visited = grid.visited()  # Битовая карта посещённых клеток
+    came_from = grid.predecessors()  # Действие, которым достигнута клетка
 
     max_depth = 0  # Максимальная глубина поиска
     all_generated = 0  # Общее число порождённых вершин
+    max_frontier = 0  # Максимальный размер фронта поиска
 
     while queue:
-        cost, current_situation, path, depth = heappop(
+        max_frontier = max(max_frontier, len(queue))
+
+        cost, _, current, last_action = heappop(
             queue
-        )  # Извлекаем ситуацию с наименьшей стоимостью
+        )  # Извлекаем клетку с наименьшей стоимостью
+        depth = cost  # Все переходы стоят 1, поэтому стоимость равна глубине
 
         # Проверяем, достигнута ли целевая ситуация
-        if current_situation.finished:
-            return path, Statistic(len(path), max_depth + 1, all_generated)
+        if current == goal:
+            came_from[current] = last_action
+            path = grid.path(came_from, current, start)
+            if trace is not None:
+                trace.finish(path, goal)
+
+            return path, Statistic(
+                len(path), max_depth + 1, all_generated, max_frontier, visited.count(1)
+            )
+
+        # Останавливаемся, если бюджет поиска исчерпан
+        if budget is not None and budget.spend():
+            break
+
+        # Предшественник запоминается при первом раскрытии, ему
+        # соответствует наименьшая стоимость
+        if not visited[current]:
+            came_from[current] = last_action
 
         # Добавляем текущую ситуацию в посещённые
-        visited.add(current_situation)
+        visited[current] = 1
         all_generated += 1
 
+        if trace is not None:
+            trace.emit(EXPAND, current)
+
         # Обновляем максимальную глубину
         max_depth = max(max_depth, depth)
 
         # Генерируем все возможные действия (0-3)
         for action in range(4):
-            next_situation = make_move(current_situation, action)
-
-            # Если следующая ситуация валидна и не посещена ранее
-            if (
-                next_situation
-                and next_situation.valid
-                and next_situation not in visited
-            ):
-                # Добавляем новую ситуацию в очередь с обновлённым путём
-                heappush(queue, (cost + 1, next_situation, path + [action], depth + 1))
+            next_cell = current + offsets[action]
+
+            # Если следующая клетка не стена и не посещена ранее
+            if not walls[next_cell] and not visited[next_cell]:
+                # Добавляем новую ситуацию в очередь
+                heappush(queue, (cost + 1, distance(next_cell), next_cell, action))
+                if trace is not None:
+                    trace.emit(GENERATE, next_cell)
+
+    if budget is not None and budget.exhausted:
+        # Бюджет исчерпан: возвращаем путь к ближайшей к цели посещённой клетке
+        cell = grid.nearest(visited, goal, start)
+        path = grid.path(came_from, cell, start)
+        if trace is not None:
+            trace.finish(path)
+
+        return path, Statistic(
+            len(path),
+            max_depth,
+            all_generated,
+            max_frontier,
+            visited.count(1),
+            truncated=True,
+        )
+
+    if trace is not None:
+        trace.finish(None)
 
     return None  # Решение не найдено
@@ -0,0 +1,211 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from analyzer.budget import Budget
+from analyzer.statistic import Statistic
+from analyzer.trace import EXPAND, GENERATE, SearchTrace
+from maze.environment import Situation, action_map
+
+
+def _propagate(
+    maze: np.ndarray,
+    start: Tuple[int, int],
+    stop: Optional[Tuple[int, int]] = None,
+    trace: Optional[SearchTrace] = None,
+    budget: Optional[Budget] = None,
+) -> Tuple[np.ndarray, int]:
+    """
+    Распространяет волну от клетки start слоями по окаймлённой стенами сетке.
+
+    Фронт хранится как массив плоских индексов, поэтому стоимость шага
+    пропорциональна размеру слоя, а не площади лабиринта.
+
+    :param maze: матрица, представляющая лабиринт
+    :param start: координаты стартовой клетки
+    :param stop: координаты клетки, по достижении которой волна останавливается
+    :param trace: приёмник событий поиска; события передаются целыми слоями
+    :param budget: бюджет поиска; раскрытие слоя расходует его на размер слоя
+    :return: поле расстояний с рамкой толщиной в одну клетку (-1 - недостижимо
+             или не достигнуто до исчерпания бюджета) и наибольший размер слоя
+    """
+    h, w = maze.shape
+    stride = w + 2
+
+    # Проходимые клетки, ещё не помеченные волной; рамка остаётся False
+    unseen = np.zeros((h + 2, stride), dtype=bool)
+    unseen[1:-1, 1:-1] = np.asarray(maze) != 1
+    unseen = unseen.ravel()
+
+    distances = np.full((h + 2) * stride, -1, dtype=np.int32)
+
+    # Смещения индексов, соответствующие действиям из action_map
+    offsets = np.array([1, stride, -stride, -1])
+
+    frontier = np.array([(start[0] + 1) * stride + start[1] + 1])
+    distances[frontier] = 0
+    unseen[frontier] = False
+
+    target = None if stop is None else (stop[0] + 1) * stride + stop[1] + 1
+    depth = 0
+    max_frontier = 1
+
+    while target is None or distances[target] < 0:
+        if budget is not None and budget.spend(frontier.size):
+            break  # Бюджет исчерпан
+
+        if trace is not None:
+            trace.extend(EXPAND, frontier)
+
+        # Сдвигаем весь фронт во всех четырёх направлениях
+        layer = (frontier[:, None] + offsets).ravel()
+        layer = np.unique(layer[unseen[layer]])
+
+        if not layer.size:
+            break  # Волна исчерпала компоненту связности
+
+        if trace is not None:
+            trace.extend(GENERATE, layer)
+
+        depth += 1
+        distances[layer] = depth
+        unseen[layer] = False
+        frontier = layer
+        max_frontier = max(max_frontier, layer.size)
+
+    return distances.reshape(h + 2, stride), max_frontier
+
+
+def distance_field(maze: np.ndarray, start: np.ndarray) -> np.ndarray:
+    """
+    Вычисляет расстояние от клетки start до каждой клетки лабиринта.
+
+    :param maze: матрица, представляющая лабиринт (0 - путь, 1 - стена)
+    :type maze: numpy 2D array
+    :param start: координаты стартовой клетки
+    :type start: numpy 1D array
+    :return: матрица расстояний той же формы, -1 - клетка недостижима
+    :rtype: numpy 2D array
+    """
+    distances, _ = _propagate(maze, (int(start[0]), int(start[1])))
+    return distances[1:-1, 1:-1].copy()
+
+
+def descend(distances: np.ndarray, cell: Tuple[int, int]) -> List[int]:
+    """
+    Восстанавливает путь спуском по градиенту поля расстояний.
+
+    :param distances: поле расстояний от стартовой клетки с рамкой толщиной
+                      в одну клетку, помеченной -1
+    :type distances: numpy 2D array
+    :param cell: координаты достигнутой клетки в поле с рамкой
+    :type cell: Tuple[int, int]
+    :return: список действий от стартовой клетки до клетки cell
+    :rtype: List[int]
+    """
+    row, col = cell
+    path = []
+
+    # Спускаемся от клетки cell к старту, каждый раз на уровень ниже
+    for level in range(int(distances[row, col]) - 1, -1, -1):
+        for action, (dr, dc) in action_map.items():
+            if distances[row - dr, col - dc] == level:
+                path.append(action)
+                row, col = row - dr, col - dc
+                break
+
+    path.reverse()
+    return path
+
+
+def nearest(distances: np.ndarray, cell: Tuple[int, int]) -> Tuple[int, int]:
+    """
+    Находит помеченную клетку поля расстояний, ближайшую к клетке cell по
+    манхэттенскому расстоянию.
+
+    :param distances: поле расстояний с рамкой, -1 - клетка не помечена
+    :type distances: numpy 2D array
+    :param cell: координаты клетки в поле с рамкой
+    :type cell: Tuple[int, int]
+    :return: координаты ближайшей помеченной клетки в поле с рамкой
+    :rtype: Tuple[int, int]
+    """
+    rows, cols = np.nonzero(distances >= 0)
+    index = np.argmin(abs(rows - cell[0]) + abs(cols - cell[1]))
+    return int(rows[index]), int(cols[index])
+
+
+# Функция волнового поиска в ширину
+def wavefront(
+    initial_situation: Situation,
+    trace: Optional[SearchTrace] = None,
+    budget: Optional[Budget] = None,
+) -> Optional[tuple[List[int], Statistic]]:
+    """
+    :param initial_situation: начальная ситуация лабиринта
+    :param trace: приёмник событий поиска; без него события не собираются
+    :param budget: ограничение раскрытий, времени или памяти; проверяется
+                   перед каждым слоем, исчерпав его, поиск возвращает путь к
+                   ближайшей к цели помеченной клетке
+    :return: список действий, ведущих к цели, или None, если решение не найдено
+
+    Функция волнового поиска в ширину (Wavefront BFS).
+
+    Вместо раскрытия вершин по одной весь фронт поиска растёт за один шаг
+    операциями над массивами NumPy; фронт хранится массивом плоских индексов
+    клеток окаймлённой стенами сетки.
+
+    Алгоритм работает следующим образом:
+    1. Помечаем стартовую клетку расстоянием 0, фронт состоит из неё одной.
+    2. Прибавляем к индексам фронта смещения четырёх направлений и оставляем
+       уникальные проходимые непомеченные клетки - это следующий слой,
+       помечаем его расстоянием и делаем новым фронтом.
+    3. Повторяем, пока цель не помечена и новый слой не пуст.
+    4. Если цель не помечена, решение не найдено.
+    5. Иначе спускаемся по полю расстояний от цели к старту и
+       восстанавливаем действия.
+    """
+    if budget is not None:
+        budget.start()
+
+    start = (int(initial_situation.position[0]), int(initial_situation.position[1]))
+    goal = (int(initial_situation.goal[0]), int(initial_situation.goal[1]))
+
+    distances, max_frontier = _propagate(
+        initial_situation.maze, start, goal, trace, budget
+    )
+
+    row, col = goal[0] + 1, goal[1] + 1
+    depth = int(distances[row, col])
+
+    if depth < 0 and budget is not None and budget.exhausted:
+        # Бюджет исчерпан: возвращаем путь к ближайшей к цели помеченной клетке
+        path = descend(distances, nearest(distances, (row, col)))
+        reached = int(np.count_nonzero(distances >= 0))
+
+        if trace is not None:
+            trace.finish(path)
+
+        return path, Statistic(
+            len(path),
+            int(distances.max()),
+            reached,
+            max_frontier,
+            reached,
+            truncated=True,
+        )
+
+    if depth < 0:
+        if trace is not None:
+            trace.finish(None)
+
+        return None  # Решение не найдено
+
+    path = descend(distances, (row, col))
+
+    reached = int(np.count_nonzero(distances >= 0))
+
+    if trace is not None:
+        trace.finish(path, (goal[0] + 1) * distances.shape[1] + goal[1] + 1)
+
+    return path, Statistic(len(path), depth, reached, max_frontier, reached)
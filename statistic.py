@@ -1,35 +1,90 @@
+from concurrent.futures import ProcessPoolExecutor
 from functools import partial
 import getopt
+import os
 import sys
-from analyzer.statistic import Statistic
+from analyzer.budget import Budget
+from analyzer.statistic import Statistic, measure
 from maze import load, Situation
+from maze.components import Components, load_components
+from maze.dataset import MazeDataset, is_dataset
+from maze.hierarchy import Hierarchy, hierarchy_filename
+from maze.landmarks import Landmarks, landmarks_filename
 import numpy as np
 
-from solvers import bfs, dfs, dfs_with_cmp, ucs, bnb, bidirectional_search
+from solvers import (
+    bfs,
+    dfs,
+    dfs_with_cmp,
+    ucs,
+    bnb,
+    bidirectional_search,
+    csgraph_search,
+    wavefront,
+    junction_search,
+    astar,
+    jps,
+    hpa,
+    dstar_lite,
+    bidirectional_astar,
+    bitboard_bfs,
+)
 
 from sys import setrecursionlimit
 
 setrecursionlimit(10000)
 
-def main(argv):
-    try:
-        opts = dict(getopt.getopt(argv, "f:")[0])
-    except getopt.GetoptError:
-        print("Invalid arguments. Exiting...")
-        exit()
+SOLVER_NAMES = [
+    "Breadth-first search",
+    "Depth-first search",
+    "DFS with comparison",
+    "Uniform Cost Search",
+    "Branch and Bound",
+    "Bidirectional search",
+    "Compiled shortest path (SciPy)",
+    "Wavefront BFS",
+    "Junction graph search",
+    "A* search",
+    "Jump Point Search",
+    "Hierarchical A* (HPA*)",
+    "D* Lite",
+    "Bidirectional A* (NBA*)",
+    "Bitboard BFS",
+]
 
-    if "-f" in opts:
-        file = opts["-f"]
-    else:
-        file = input("Enter maze file name: ")
 
-    if not file.endswith(".npy"):
-        print("Invalid file. Exiting...")
-        exit()
+def load_landmarks(file, maze):
+    """
+    Загружает ориентиры, сохранённые рядом с лабиринтом, если они есть и
+    вычислены для этого лабиринта.
+    """
+    if os.path.exists(landmarks_filename(file)):
+        try:
+            return Landmarks.load(landmarks_filename(file), maze)
+        except ValueError:
+            pass  # Файл от другого лабиринта: эвристика ALT была бы неверной
+    return None
 
-    print("Loading maze from " + file)
-    maze = load(file)
 
+def load_hierarchy(file, maze):
+    """Загружает абстракцию кластеров, сохранённую рядом с лабиринтом, если она есть."""
+    if os.path.exists(hierarchy_filename(file)):
+        try:
+            return Hierarchy.load(hierarchy_filename(file), maze)
+        except ValueError:
+            pass  # Файл от другого лабиринта
+    return None
+
+
+def make_solvers(maze, landmarks=None, hierarchy=None):
+    """
+    Создаёт начальную ситуацию и список решателей для лабиринта maze.
+
+    :param maze: матрица, представляющая лабиринт
+    :param landmarks: ориентиры для эвристики ALT или None
+    :param hierarchy: абстракция кластеров для HPA* или None
+    :return: начальная ситуация и список решателей в порядке SOLVER_NAMES
+    """
     situation = Situation(maze, np.array([0, 0]), maze.shape - np.asarray([1, 1]))
 
     goal_situation = Situation(
@@ -42,26 +97,192 @@ def main(argv):
         dfs_with_cmp,
         ucs,
         bnb,
-        partial(bidirectional_search, goal_situation),
+        partial(bidirectional_search, goal_state=goal_situation),
+        csgraph_search,
+        wavefront,
+        junction_search,
+        partial(astar, landmarks=landmarks),
+        partial(jps, landmarks=landmarks),
+        partial(hpa, hierarchy=hierarchy),
+        dstar_lite,
+        partial(bidirectional_astar, landmarks=landmarks),
+        bitboard_bfs,
     ]
 
-    solver_names = [
-        "Breadth-first search",
-        "Depth-first search",
-        "DFS with comparison",
-        "Uniform Cost Search",
-        "Branch and Bound",
-        "Bidirectional search",
-    ]
+    return situation, solvers
+
+
+def expand(files):
+    """
+    Раскрывает наборы лабиринтов в отдельные лабиринты.
+
+    :param files: имена файлов лабиринтов и наборов
+    :return: список пар (имя файла, номер лабиринта в наборе или None)
+    """
+    sources = []
+
+    for file in files:
+        if is_dataset(file):
+            sources += [(file, item) for item in range(len(MazeDataset(file)))]
+        else:
+            sources.append((file, None))
+
+    return sources
+
+
+def source_name(source):
+    """Имя лабиринта для таблицы: файл или файл[номер] для наборов."""
+    file, item = source
+    return file if item is None else f"{file}[{item}]"
+
+
+def load_source(source, mmap_mode=None):
+    """
+    Загружает лабиринт и сохранённые рядом с ним структуры.
+
+    Лабиринт набора читается из файла набора по одному, без загрузки
+    остальных; ориентиры и абстракция для наборов не используются.
+
+    :param source: пара (имя файла, номер лабиринта в наборе или None)
+    :param mmap_mode: режим отображения файла лабиринта в память
+    :return: лабиринт, ориентиры и абстракция кластеров (или None)
+    """
+    file, item = source
+
+    if item is not None:
+        return MazeDataset(file)[item], None, None
+
+    maze = load(file, mmap_mode=mmap_mode)
+    return maze, load_landmarks(file, maze), load_hierarchy(file, maze)
+
+
+def reachable(source):
+    """
+    Проверяет по индексу компонент связности, достижима ли цель лабиринта.
+
+    Индекс файла лабиринта сохраняется рядом с ним и переиспользуется;
+    для лабиринтов наборов он строится на месте.
+
+    :param source: пара (имя файла, номер лабиринта в наборе или None)
+    :return: True, если старт и цель лежат в одной компоненте
+    """
+    file, item = source
+
+    if item is not None:
+        components = Components.build(MazeDataset(file)[item])
+    else:
+        components = load_components(file, load(file, mmap_mode="r"))
+
+    goal = components.labels.shape - np.asarray([1, 1])
+    return components.connected(np.array([0, 0]), goal)
+
+
+def run_solver(source, index, trace_memory=False, budget=None):
+    """
+    Запускает один решатель в процессе пула.
+
+    Лабиринт отображается в память только для чтения, поэтому процессы
+    разделяют страницы файла, а не получают копию массива через pickle.
+
+    :param source: пара (имя файла, номер лабиринта в наборе или None)
+    :param index: номер решателя в SOLVER_NAMES
+    :param trace_memory: измерять ли пик выделенной памяти
+    :param budget: бюджет поиска или None
+    :return: статистика решателя
+    """
+    situation, solvers = make_solvers(*load_source(source, mmap_mode="r"))
+
+    _, statistic = measure(
+        solvers[index], situation, trace_memory=trace_memory, budget=budget
+    )
+    return statistic
+
+
+def main(argv):
+    try:
+        opts, args = getopt.getopt(argv, "f:p:o:mb:")
+        opts = dict(opts)
+    except getopt.GetoptError:
+        print("Invalid arguments. Exiting...")
+        exit()
+
+    files = ([opts["-f"]] if "-f" in opts else []) + args
+
+    if not files:
+        files = [input("Enter maze file name: ")]
+
+    if not all(file.endswith((".npy", ".bits")) for file in files):
+        print("Invalid file. Exiting...")
+        exit()
+
+    sources = expand(files)
+
+    # Лабиринты с недостижимой целью отбрасываются без запуска решателей
+    for source in [source for source in sources if not reachable(source)]:
+        print("Goal unreachable in " + source_name(source) + ", skipping")
+        sources.remove(source)
+
+    if not sources:
+        print("No solvable mazes. Exiting...")
+        exit()
+
+    # С -m пик памяти измеряется отдельным запуском каждого решателя
+    trace_memory = "-m" in opts
+
+    # С -b решатели ограничены бюджетом, например -b expansions=100000,time=0.5
+    budget = None
+    if "-b" in opts:
+        try:
+            budget = Budget.parse(opts["-b"])
+        except ValueError:
+            print("Invalid budget. Exiting...")
+            exit()
 
     statistics = []
+    solver_names = []
 
-    for solver in solvers:
-        _, statistic = solver(situation)
-        statistics.append(statistic)
+    for source in sources:
+        prefix = source_name(source) + ": " if len(sources) > 1 else ""
+        solver_names += [prefix + name for name in SOLVER_NAMES]
+
+    if "-p" in opts:
+        # Параллельный режим: каждая пара (лабиринт, решатель) - отдельная задача
+        workers = int(opts["-p"]) or None
+        print(f"Running {len(solver_names)} tasks in a process pool...")
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(run_solver, source, index, trace_memory, budget)
+                for source in sources
+                for index in range(len(SOLVER_NAMES))
+            ]
+            statistics = [future.result() for future in futures]
+    else:
+        for source in sources:
+            file, _ = source
+            print("Loading maze from " + source_name(source))
+            maze, landmarks, hierarchy = load_source(source)
+
+            if landmarks is not None:
+                print("Loading landmarks from " + landmarks_filename(file))
+
+            if hierarchy is not None:
+                print("Loading cluster abstraction from " + hierarchy_filename(file))
+
+            situation, solvers = make_solvers(maze, landmarks, hierarchy)
+
+            for solver in solvers:
+                _, statistic = measure(
+                    solver, situation, trace_memory=trace_memory, budget=budget
+                )
+                statistics.append(statistic)
 
     Statistic.print_statistics(statistics, solver_names)
 
+    if "-o" in opts:
+        print("Saving statistics to " + opts["-o"])
+        Statistic.save_statistics(statistics, solver_names, opts["-o"])
+
 
 if __name__ == "__main__":
     main(sys.argv[1:])
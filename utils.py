@@ -1,13 +1,15 @@
-import matplotlib.pyplot as plt
 import functools
-import keyboard
 
+# matplotlib и keyboard загружаются при первом использовании: keyboard на
+# Linux требует прав на устройства ввода, а matplotlib - дисплея
 
-def plotlive(func):
-    plt.ion()
 
+def plotlive(func):
     @functools.wraps(func)
     def new_func(*args, **kwargs):
+        import matplotlib.pyplot as plt
+
+        plt.ion()
         axes = plt.gcf().get_axes()
 
         for axis in axes:
@@ -24,6 +26,8 @@ def plotlive(func):
 
 
 def select_option(options):
+    import keyboard
+
     current_selection = 0
 
     def print_menu():